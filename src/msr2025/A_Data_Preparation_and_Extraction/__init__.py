@@ -12,10 +12,10 @@ from . import data_extraction, data_preparation
 def main() -> None:
     """Run both data preparation and extraction steps in order."""
     print("\n**** Data Preparation ****")
-    data_preparation.main()
+    data_preparation.main([])
 
     print("\n**** Data Extraction ****")
-    data_extraction.main()
+    data_extraction.main([])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""
+Server-side alternative to exporting release histories and extracting transitions.
+
+`data_preparation` ships every release of every dependent artifact over Bolt, and
+`data_extraction` then keeps only a handful of values per artifact. This script
+labels the graph the same way, but computes those values in Cypher and receives
+one compact row per artifact, which it writes directly to 'data_updates.json'.
+
+The result has the same fields as the output of `data_extraction`. Releases are
+ordered by timestamp (then by semantic version) on the server, so when several
+releases share a timestamp the tie may be resolved differently.
+"""
+
+from ..lib.files import save_json
+from ..lib.records import Update, decode_update
+from ..lib.sampling import SAMPLE_FILE_PATH
+from ..lib.tasks import run_task
+from .data_extraction import LOG4J_TIMESTAMP_2_17_0, SAVE_FILE_PATH
+from .data_preparation import label_graph
+from .lib.env import get_neo4j_envs
+from .lib.neo4jclient import Neo4jClient
+
+# Computes one release transition per artifact; `$cutoff` is the 2.17.0 timestamp
+AGGREGATION_QUERY = """
+MATCH (r:Release_depend_SemVer)
+WITH r, split(r.version, '.') AS parts
+ORDER BY
+  r.artifactId,
+  r.timestamp,
+  toInteger(parts[0]),
+  toInteger(parts[1]),
+  toInteger(parts[2])
+WITH r.artifactId AS artifactId, collect(r) AS releases
+WITH
+  artifactId,
+  releases,
+  [x IN releases WHERE x.targetTimestamp < $cutoff] AS old_releases,
+  [x IN releases WHERE x.targetTimestamp >= $cutoff] AS new_releases
+WHERE size(old_releases) > 0 AND size(new_releases) > 0
+WITH
+  artifactId,
+  size(releases) AS release_count,
+  releases[0] AS earliest,
+  releases[-1] AS latest,
+  old_releases[-1] AS previous,
+  new_releases[0] AS next
+RETURN
+  artifactId AS artifact_id,
+  previous.version AS old_version,
+  previous.timestamp AS old_time,
+  previous.targetVersion AS old_depend_version,
+  next.version AS new_version,
+  next.timestamp AS new_time,
+  next.targetVersion AS new_depend_version,
+  next.timestamp - $cutoff AS gap,
+  toFloat(latest.timestamp - earliest.timestamp) / (release_count - 1)
+    AS release_frequency
+ORDER BY artifact_id
+"""
+
+
+def extract_updates(client: Neo4jClient) -> None:
+    """
+    Compute the release transition of every artifact in the database.
+
+    The result covers all artifacts, so the design of an earlier sampled
+    extraction is removed.
+
+    Args:
+        client (Neo4jClient): Client connected to a labeled Goblin Neo4j database.
+
+    """
+    records = client.run_query(AGGREGATION_QUERY, {"cutoff": LOG4J_TIMESTAMP_2_17_0})
+    output_list: list[Update] = [decode_update(dict(record)) for record in records]
+    save_json(output_list, SAVE_FILE_PATH)
+    SAMPLE_FILE_PATH.unlink(missing_ok=True)
+
+
+def main() -> None:
+    """
+    Entry point of the script.
+
+    Labels the Neo4j database like `data_preparation` and saves the per-artifact
+    release transitions computed by the database.
+    """
+    # Setup Neo4j Client
+    uri, username, password = get_neo4j_envs()
+
+    with Neo4jClient(uri, username, password) as client:
+        label_graph(client)
+
+        # Aggregate Data & Save Result
+        run_task(
+            label="Aggregate Data & Save Result",
+            task=lambda: extract_updates(client),
+        )
+
+        # Output confirmation
+        print(f"Extracted data has been saved to: '{SAVE_FILE_PATH}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,112 +4,379 @@ Processes release timeline data for log4j-core dependencies from JSON input.
 This script identifies which versions of each artifact depend on log4j-core
 before and after the 2.17.0 patch (related to the Log4Shell vulnerability),
 and calculates the time gap and release frequency between them.
+
+The input is streamed one artifact at a time and the output is written as it is
+computed, so memory use does not grow with the number of dependent artifacts.
+The input may be the JSON array written by `data_preparation`, or a JSON Lines
+file ('.jsonl') with one `[artifactId, [release, ...]]` per line.
+
+With `--workers`, a pool of worker processes computes the transitions over shards
+of artifacts. Each worker reads its own shard, a byte range of a JSON Lines input
+or a slice of the release columns cached next to a JSON array input ('.npz'),
+and writes its transitions to its own fragment of the output, which is then
+appended to 'data_updates.json' in order. A JSON array cannot be split without
+parsing it, so its columns are cached once, when missing or older than the array.
+
+With `--sample`, only a deterministic stratified sample of the artifacts is
+extracted, for quick exploratory runs. The sample design (strata, population and
+sample sizes) is saved to 'data_updates_sample.json', from which the empirical
+study weights its estimates and derives their sampling errors.
 """
 
+import argparse
+import tempfile
+from collections.abc import Container, Iterable, Iterator
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import TypedDict, cast
 
-from ..lib.files import load_json, save_json
+import numpy as np
+
+from ..lib.columns import (
+    ReleaseColumns,
+    save_release_columns,
+    select_artifacts,
+    to_release_columns,
+)
+from ..lib.files import JSON_LINES_SUFFIX, JsonArrayWriter, save_json
+from ..lib.records import Release, Update, iter_release_histories
+from ..lib.sampling import (
+    DEFAULT_SEED,
+    SAMPLE_FILE_PATH,
+    STRATA_BY,
+    SampleDesign,
+    stratified_sample,
+)
+from .lib.transitions import (
+    InputShard,
+    input_shards,
+    map_shards,
+    read_shard,
+    transition_indices,
+)
+
+# Timestamp for log4j-core version 2.17.0 release (in milliseconds)
+LOG4J_TIMESTAMP_2_17_0 = 1639792690000
 
+# Input/output file paths
+SOURCE_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/data_releases.json")
+SAVE_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/data_updates.json")
 
-class Release(TypedDict):
+
+def extract_update(artifact_id: str, releases: list[Release]) -> Update | None:
     """
-    Information about a single release.
+    Compute the release transition of one artifact.
+
+    Args:
+        artifact_id (str): Unique identifier of the artifact.
+        releases (list[Release]): All releases of the artifact.
 
-    Attributes:
-        dependent_time (int): Timestamp when the dependent package was released.
-        dependent_version (str): Version of the dependent package.
-        log4j_time (int): Timestamp when the corresponding log4j version was released.
-        log4j_version (str): Version of log4j depended on.
+    Returns:
+        Update | None: The transition from the last release depending on log4j
+        before 2.17.0 to the first release depending on 2.17.0 or later, or None
+        if the artifact has no release on either side.
 
     """
+    # Split releases based on whether they depend on log4j before or after 2.17.0
+    old_releases = [r for r in releases if r.log4j_time < LOG4J_TIMESTAMP_2_17_0]
+    new_releases = [r for r in releases if r.log4j_time >= LOG4J_TIMESTAMP_2_17_0]
 
-    dependent_time: int
-    dependent_version: str
-    log4j_time: int
-    log4j_version: str
+    # Skip if both old and new versions are not found
+    if not old_releases or not new_releases:
+        return None
 
+    # Get the latest release before 2.17.0 and the earliest after 2.17.0
+    previous_release = max(old_releases, key=lambda d: d.dependent_time)
+    next_release = min(new_releases, key=lambda d: d.dependent_time)
 
-# Type Alias: Element of array in the input JSON file
-type Result = list[str | list[Release]]
+    # Get first and last release timestamps
+    earliest_release = min(releases, key=lambda d: d.dependent_time)
+    latest_release = max(releases, key=lambda d: d.dependent_time)
 
-# Type Alias: Structure of the input JSON file
-type Source = list[Result]
+    # Calculate Release Frequency
+    total_release_timestamp_diff = (
+        latest_release.dependent_time - earliest_release.dependent_time
+    )
+    release_frequency = total_release_timestamp_diff / (len(releases) - 1)
 
-# Timestamp for log4j-core version 2.17.0 release (in milliseconds)
-LOG4J_TIMESTAMP_2_17_0 = 1639792690000
+    # Build output entry
+    return Update(
+        artifact_id=artifact_id,
+        old_version=previous_release.dependent_version,
+        old_time=previous_release.dependent_time,
+        old_depend_version=previous_release.log4j_version,
+        new_version=next_release.dependent_version,
+        new_time=next_release.dependent_time,
+        new_depend_version=next_release.log4j_version,
+        gap=next_release.dependent_time - LOG4J_TIMESTAMP_2_17_0,
+        release_frequency=release_frequency,
+    )
 
-# Input/output file paths
-SOURCE_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/data_releases.json")
-SAVE_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/data_updates.json")
 
+def _write_updates(
+    path: Path,
+    writer: JsonArrayWriter,
+    members: Container[str] | None = None,
+) -> None:
+    """
+    Stream release histories and write the transition of each artifact.
+
+    Args:
+        path (Path): Path to the release histories.
+        writer (JsonArrayWriter): Writer of the output array.
+        members (Container[str] | None): Only extract these artifacts.
 
-def main() -> None:
+    """
+    for artifact_id, releases in iter_release_histories(path):
+        if members is not None and artifact_id not in members:
+            continue
+        output = extract_update(artifact_id, releases)
+        if output is not None:
+            writer.write(output)
+
+
+def _sharded_input(path: Path) -> Path:
+    """
+    Return the file that the workers read the release histories from.
+
+    Args:
+        path (Path): Path to the release histories.
+
+    Returns:
+        Path: The file itself for JSON Lines, or else the columns cached next to
+        it ('.npz'), which are rebuilt when missing or older than the file.
+
+    Raises:
+        FileNotFoundError: If neither the file nor its cached columns exist.
+
+    """
+    if path.suffix == JSON_LINES_SUFFIX:
+        return path
+
+    cache = path.with_suffix(".npz")
+    if cache.exists() and (
+        not path.exists() or cache.stat().st_mtime_ns >= path.stat().st_mtime_ns
+    ):
+        return cache
+
+    save_release_columns(to_release_columns(iter_release_histories(path)), cache)
+    return cache
+
+
+def _shard_sizes(shard: InputShard) -> list[tuple[str, int]]:
+    """Return the id and release count of every artifact in a shard."""
+    columns = read_shard(shard)
+    return list(
+        zip(
+            columns["artifact_ids"].tolist(),
+            np.diff(columns["offsets"]).tolist(),
+            strict=True,
+        ),
+    )
+
+
+def _column_updates(columns: ReleaseColumns) -> Iterator[Update]:
+    """
+    Compute the release transitions of all artifacts in columnar form.
+
+    Args:
+        columns (ReleaseColumns): Release histories of the artifacts.
+
+    Yields:
+        Update: The transition of each artifact with a release on both sides of
+        2.17.0, in order.
+
+    """
+    indices = transition_indices(
+        columns["offsets"],
+        columns["dependent_time"],
+        columns["log4j_time"],
+        LOG4J_TIMESTAMP_2_17_0,
+    )
+
+    # Keep artifacts with a release on both sides of 2.17.0
+    found = (indices["previous"] >= 0) & (indices["next"] >= 0)
+    previous = indices["previous"][found]
+    following = indices["next"][found]
+    earliest = indices["earliest"][found]
+    latest = indices["latest"][found]
+
+    dependent_time = columns["dependent_time"]
+    release_counts = np.diff(columns["offsets"])[found]
+    release_frequency = (dependent_time[latest] - dependent_time[earliest]) / (
+        release_counts - 1
+    )
+
+    for output in zip(
+        columns["artifact_ids"][found].tolist(),
+        columns["dependent_version"][previous].tolist(),
+        dependent_time[previous].tolist(),
+        columns["log4j_version"][previous].tolist(),
+        columns["dependent_version"][following].tolist(),
+        dependent_time[following].tolist(),
+        columns["log4j_version"][following].tolist(),
+        (dependent_time[following] - LOG4J_TIMESTAMP_2_17_0).tolist(),
+        release_frequency.tolist(),
+        strict=True,
+    ):
+        yield Update(*output)
+
+
+def _write_shard_updates(
+    directory: str,
+    indent: bool,  # noqa: FBT001
+    members: Container[str] | None,
+    shard: InputShard,
+) -> tuple[Path, int]:
+    """
+    Compute the transitions of one shard and write them to a fragment file.
+
+    Args:
+        directory (str): Directory of the fragment files.
+        indent (bool): Indentation of the output array.
+        members (Container[str] | None): Only extract these artifacts.
+        shard (InputShard): The shard to process.
+
+    Returns:
+        tuple[Path, int]: The fragment file and its number of transitions.
+
+    """
+    columns = read_shard(shard)
+    if members is not None:
+        columns = select_artifacts(
+            columns,
+            np.array([a in members for a in columns["artifact_ids"].tolist()]),
+        )
+
+    fragment = Path(directory) / f"{shard.start}.json"
+    with JsonArrayWriter(fragment, indent=indent, fragment=True) as writer:
+        for output in _column_updates(columns):
+            writer.write(output)
+    return fragment, writer.count
+
+
+def _write_updates_sharded(
+    path: Path,
+    writer: JsonArrayWriter,
+    workers: int | None,
+    members: Container[str] | None = None,
+) -> None:
+    """
+    Compute the transitions of all artifacts in parallel and write them in order.
+
+    Args:
+        path (Path): Path to the release histories.
+        writer (JsonArrayWriter): Writer of the output array.
+        workers (int | None): Number of worker processes (`None`: all CPUs).
+        members (Container[str] | None): Only extract these artifacts.
+
+    """
+    shards = input_shards(_sharded_input(path), workers)
+    with tempfile.TemporaryDirectory() as directory:
+        for fragment, count in map_shards(
+            partial(_write_shard_updates, directory, writer.indent, members),
+            shards,
+            workers,
+        ):
+            writer.write_fragment(fragment, count)
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Process the JSON data and extracting release transitions.
 
     For each artifact, finds the last version depending on log4j before 2.17.0
     and the first version after, computes the time gap and release frequency,
     and outputs the result to a new JSON file.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
     """
+    parser = argparse.ArgumentParser(
+        description="Extract release transitions around log4j 2.17.0.",
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=SOURCE_FILE_PATH,
+        help="release histories as a JSON array or JSON Lines ('.jsonl') file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        help="compute transitions in a pool of worker processes (default: all CPUs)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        default=None,
+        metavar="FRACTION",
+        help="only extract this share of the artifacts of each stratum",
+    )
+    parser.add_argument(
+        "--strata",
+        choices=STRATA_BY,
+        default=STRATA_BY[0],
+        help="stratify by groupId prefix or by number of releases",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help="seed of the sample",
+    )
+    args = parser.parse_args(argv)
+
+    workers: int | None = args.workers or None
     try:
-        results: Source = cast("Source", load_json(SOURCE_FILE_PATH))
+        design: SampleDesign | None = None
+        if args.sample is not None:
+            artifacts: Iterable[tuple[str, int]] = (
+                (
+                    (artifact_id, len(releases))
+                    for artifact_id, releases in iter_release_histories(args.input)
+                )
+                if args.workers is None
+                else chain.from_iterable(
+                    map_shards(
+                        _shard_sizes,
+                        input_shards(_sharded_input(args.input), workers),
+                        workers,
+                    ),
+                )
+            )
+            design = stratified_sample(artifacts, args.sample, args.strata, args.seed)
+        members = design["members"] if design is not None else None
+
+        with JsonArrayWriter(SAVE_FILE_PATH) as writer:
+            if args.workers is None:
+                _write_updates(args.input, writer, members)
+            else:
+                _write_updates_sharded(args.input, writer, workers, members)
     except FileNotFoundError as err:
         error_message = (
-            f"File '{SOURCE_FILE_PATH}' not found.\n"
+            f"File '{args.input}' not found.\n"
             f"You must run 'uv run data_preparation' first."
         )
         raise FileNotFoundError(error_message) from err
 
-    output_list: list[dict[str, int | str | float | object]] = []
-
-    for data in results:
-        artifact_id: str = cast("str", data[0])
-        releases: list[Release] = cast("list[Release]", data[1])
-
-        # Split releases based on whether they depend on log4j before or after 2.17.0
-        old_releases = [r for r in releases if r["log4j_time"] < LOG4J_TIMESTAMP_2_17_0]
-        new_releases = [
-            r for r in releases if r["log4j_time"] >= LOG4J_TIMESTAMP_2_17_0
-        ]
-
-        # Skip if both old and new versions are not found
-        if not old_releases or not new_releases:
-            continue
-
-        # Get the latest release before 2.17.0 and the earliest after 2.17.0
-        previous_release = max(old_releases, key=lambda d: d["dependent_time"])
-        next_release = min(new_releases, key=lambda d: d["dependent_time"])
-
-        # Get first and last release timestamps
-        earliest_release = min(releases, key=lambda d: d["dependent_time"])
-        latest_release = max(releases, key=lambda d: d["dependent_time"])
-
-        # Calculate Release Frequency
-        total_release_timestamp_diff = (
-            latest_release["dependent_time"] - earliest_release["dependent_time"]
-        )
-        release_frequency = total_release_timestamp_diff / (len(releases) - 1)
-
-        # Build output entry
-        output = {
-            "artifact_id": artifact_id,
-            "old_version": previous_release["dependent_version"],
-            "old_time": previous_release["dependent_time"],
-            "old_depend_version": previous_release["log4j_version"],
-            "new_version": next_release["dependent_version"],
-            "new_time": next_release["dependent_time"],
-            "new_depend_version": next_release["log4j_version"],
-            "gap": next_release["dependent_time"] - LOG4J_TIMESTAMP_2_17_0,
-            "release_frequency": release_frequency,
-        }
-
-        output_list.append(output)
-
-    # Save result to file
-    save_json(cast("dict", output_list), SAVE_FILE_PATH)  # type: ignore[type-arg]
     print(f"Extracted data has been saved to: '{SAVE_FILE_PATH}'")
 
+    # Record the sample design, or drop that of an earlier sampled run
+    if design is None:
+        SAMPLE_FILE_PATH.unlink(missing_ok=True)
+        return
+    save_json(design, SAMPLE_FILE_PATH)
+    print(
+        f"Sampled {len(design['members'])} artifacts in "
+        f"{len(design['strata'])} strata (by {design['strata_by']})",
+    )
+    print(f"Sample design has been saved to: '{SAMPLE_FILE_PATH}'")
+
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,54 @@ Data preparation and extraction.
 This script performs data preparation and extraction on a Neo4j graph database
 related to the 'log4j-core' artifact. It assigns various labels and properties
 to nodes and relationships based on semantic versioning and dependency structure,
-and finally exports structured data to a JSON file.
+and finally exports structured data to a JSON file, together with an indexed
+store of the same release histories for per-artifact lookups (see `history`).
+
+With `--explain`, the queries are only planned: the estimated rows and operators
+of each query are saved to 'query_plans.json' and label scans and Cartesian
+products are reported, without touching the database. With `--profile`, the
+queries run as usual while their database hits and page cache misses are saved.
+`--baseline` compares the plans with those of a previous run and reports the
+queries that got more expensive.
+
+With `--external-sort`, the database streams one unordered row per release and
+the histories are ordered and grouped by an external merge sort that keeps at
+most `--memory-limit` MiB in memory, instead of by `ORDER BY` and `collect` on
+the database heap.
+
+With `--columnar`, the release histories are read from the database into NumPy
+columns (nested release maps included, see `lib.columnar`) and written to
+'data_releases.json', then cached in 'data_releases.npz', which the empirical
+study and `data_extraction --workers` read instead of parsing the JSON.
+
+Every labeling step runs as a managed write transaction, which is retried with
+backoff on transient errors, and records a `PreparationCheckpoint` node in the
+graph when it commits. A rerun resumes from the first step without a checkpoint;
+`--restart` deletes the checkpoints and runs every step again.
 """
 
+import argparse
 from pathlib import Path
+from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
+
+from ..lib.columns import (
+    COLUMNS_FILE_PATH,
+    ReleaseColumns,
+    from_release_columns,
+    save_release_columns,
+)
+from ..lib.external_sort import MEMORY_LIMIT, group_release_rows, sort_release_rows
+from ..lib.files import JsonArrayWriter, load_json, save_json
+from ..lib.history import HISTORY_FILE_PATH, build_history_store
+from ..lib.records import Release, iter_release_histories
 from ..lib.tasks import run_task
+from .lib.columnar import DEFAULT_FETCH_SIZE
 from .lib.env import get_neo4j_envs
-from .lib.neo4jclient import Neo4jClient
+from .lib.neo4jclient import Neo4jClient, build_clause_query
+from .lib.plans import REGRESSION_TOLERANCE, QueryPlan, compare_plans
 
 # Regular expression to match semantic versioning (e.g., 1.2.3)
 SEMVER_REGEX = "'^\\\\d+\\\\.\\\\d+\\\\.\\\\d+$'"
@@ -19,170 +59,533 @@ SEMVER_REGEX = "'^\\\\d+\\\\.\\\\d+\\\\.\\\\d+$'"
 # Output path for extracted data
 SAVE_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/data_releases.json")
 
+# Query exporting the release history of every artifact, ordered by version
+RELEASE_HISTORIES_QUERY = """
+    MATCH (r:Release_depend_SemVer)
+    WITH
+      r,
+      split(r.version, '.') AS parts
+    WITH
+      r.artifactId AS artifactId,
+      r.version AS dependent_version,
+      r.timestamp AS dependent_time,
+      r.targetVersion AS log4j_version,
+      r.targetTimestamp AS log4j_time,
+      toInteger(parts[0]) AS major,
+      toInteger(parts[1]) AS minor,
+      toInteger(parts[2]) AS patch
+    ORDER BY artifactId, major, minor, patch
+    WITH artifactId, collect({
+        log4j_time:log4j_time,
+        log4j_version:log4j_version,
+        dependent_time:dependent_time,
+        dependent_version:dependent_version
+    }) as version
+    RETURN artifactId, version
+"""
+
+# Query exporting the same release histories as one list per release field, so
+# that the driver hydrates lists of scalars instead of a map per release
+RELEASE_COLUMNS_QUERY = """
+    MATCH (r:Release_depend_SemVer)
+    WITH
+      r,
+      split(r.version, '.') AS parts
+    WITH
+      r.artifactId AS artifactId,
+      r.version AS dependent_version,
+      r.timestamp AS dependent_time,
+      r.targetVersion AS log4j_version,
+      r.targetTimestamp AS log4j_time,
+      toInteger(parts[0]) AS major,
+      toInteger(parts[1]) AS minor,
+      toInteger(parts[2]) AS patch
+    ORDER BY artifactId, major, minor, patch
+    RETURN
+      artifactId,
+      collect(dependent_time) AS dependent_time,
+      collect(dependent_version) AS dependent_version,
+      collect(log4j_time) AS log4j_time,
+      collect(log4j_version) AS log4j_version
+"""
 
-def main() -> None:
+# Fields of a release, each returned as one list per artifact by
+# `RELEASE_COLUMNS_QUERY`
+RELEASE_FIELDS = ("dependent_time", "dependent_version", "log4j_time", "log4j_version")
+
+# Query streaming one row per release, for sorting outside the database
+RELEASE_ROWS_QUERY = """
+    MATCH (r:Release_depend_SemVer)
+    RETURN
+      r.artifactId AS artifactId,
+      r.timestamp AS dependent_time,
+      r.version AS dependent_version,
+      r.targetTimestamp AS log4j_time,
+      r.targetVersion AS log4j_version
+"""
+
+# Number of bytes in a mebibyte, the unit of `--memory-limit`
+MEBIBYTE = 1024 * 1024
+
+# Output path for the query plans of `--explain` and `--profile`
+PLANS_FILE_PATH = Path("./output/A_Data_Preparation_and_Extraction/query_plans.json")
+
+
+def run_step(
+    client: Neo4jClient,
+    completed: set[str],
+    step: str,
+    label: str,
+    **clauses: str,
+) -> None:
     """
-    Entry point of the script.
+    Run a labeling step and record its checkpoint, unless it is completed.
+
+    Args:
+        client (Neo4jClient): Client connected to the Goblin Neo4j database.
+        completed (set[str]): Steps completed by a previous run.
+        step (str): Name of the step.
+        label (str): A label to display while the step runs.
+        **clauses (str): Clauses of the step's query (see
+            `build_clause_query`).
 
-    Connects to the Neo4j database, processes and labels
-    release and artifact nodes related to 'log4j-core', and extracts structured data.
     """
-    # Setup Neo4j Client
-    uri, username, password = get_neo4j_envs()
+    if step in completed:
+        print(f"✔ Resumed : {label}")
+        return
+    run_task(
+        label=label,
+        task=lambda: client.execute_write(
+            build_clause_query(**clauses),
+            checkpoint=step,
+        ),
+    )
 
-    with Neo4jClient(uri, username, password) as client:
-        # Assign the 'Artifact_log4j' label to the Artifact of 'log4j-core'
-        run_task(
-            label="Assign the 'Artifact_log4j' label to the Artifact of 'log4j-core'",
-            task=lambda: client.run_query_with_clauses(
-                clause_match="(a:Artifact)",
-                clause_where='a.id="org.apache.logging.log4j:log4j-core"',
-                clause_set="a:Artifact_log4j",
-            ),
-        )
 
-        # Assign the 'Release_log4j' label to the Releases of 'log4j-core'
-        run_task(
-            label="Assign the 'Release_log4j' label to the Releases of 'log4j-core'",
-            task=lambda: client.run_query_with_clauses(
-                clause_match="(:Artifact_log4j) - [:relationship_AR] -> (r:Release)",
-                clause_set="r:Release_log4j",
-            ),
-        )
+def label_graph(client: Neo4jClient, *, restart: bool = False) -> None:
+    """
+    Assign the labels and properties used by the extraction queries.
 
-        # Assign the 'Release_depend' label to
-        # the Releases that depend on 'log4j-core'
-        run_task(
-            label=(
-                "Assign the 'Release_depend' label to "
-                "the Releases that depend on 'log4j-core'"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match="(r:Release) - [:dependency] -> (a:Artifact_log4j)",
-                clause_set="r:Release_depend",
-            ),
-        )
+    Steps that a previous run completed are skipped. In 'explain' and 'profile'
+    mode, checkpoints are neither read nor written and every step runs.
 
-        # Assign the 'Artifact_depend' label to
-        # the Artifacts that depend on 'log4j-core'
-        run_task(
-            label=(
-                "Assign the 'Artifact_depend' label to "
-                "the Artifacts that depend on 'log4j-core'"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match="(a:Artifact) - [:relationship_AR] -> (:Release_depend)",
-                clause_set="a:Artifact_depend",
-            ),
-        )
+    Args:
+        client (Neo4jClient): Client connected to the Goblin Neo4j database.
+        restart (bool): Delete the checkpoints and run every step.
 
-        # Assign the 'Release_log4j_SemVer' label to the Releases
-        # that have the 'Release_log4j' label and follow semantic versioning.
-        run_task(
-            label=(
-                "Assign the 'Release_log4j_SemVer' label to the Releases "
-                "that have the 'Release_log4j' label and follow semantic versioning"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match="(r:Release_log4j)",
-                clause_where=f"r.version =~ {SEMVER_REGEX}",
-                clause_set="r:Release_log4j_SemVer",
-            ),
-        )
+    """
+    completed: set[str] = set()
+    if client.mode == "run":
+        if restart:
+            client.clear_checkpoints()
+        completed = client.checkpoints()
 
-        # Assign the 'Release_depend_SemVer' label to the Releases
-        # that follow semantic versioning and
-        # whose dependent log4j package versions also follow semantic versioning.
-        run_task(
-            label=(
-                "Assign the 'Release_depend_SemVer' label to the Releases "
-                "that follow semantic versioning and "
-                "whose dependent log4j package versions also follow semantic versioning"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match=(
-                    "(r:Release_depend) - [d:dependency] -> (a:Artifact_log4j)"
-                ),
-                clause_where=(
-                    f"r.version =~ {SEMVER_REGEX} AND d.targetVersion =~ {SEMVER_REGEX}"
-                ),
-                clause_set="r:Release_depend_SemVer",
-            ),
-        )
+    # Assign the 'Artifact_log4j' label to the Artifact of 'log4j-core'
+    run_step(
+        client,
+        completed,
+        step="artifact_log4j",
+        label="Assign the 'Artifact_log4j' label to the Artifact of 'log4j-core'",
+        clause_match="(a:Artifact)",
+        clause_where='a.id="org.apache.logging.log4j:log4j-core"',
+        clause_set="a:Artifact_log4j",
+    )
 
-        # Assign the 'artifactId' property to 'Release_depend_SemVer' nodes
-        run_task(
-            label="Assign the 'artifactId' property to 'Release_depend_SemVer' nodes",
-            task=lambda: client.run_query_with_clauses(
-                clause_match=(
-                    "(a:Artifact_depend) - [d:relationship_AR] -> "
-                    "(r:Release_depend_SemVer)"
-                ),
-                clause_set="r.artifactId = a.id",
-            ),
+    # Assign the 'Release_log4j' label to the Releases of 'log4j-core'
+    run_step(
+        client,
+        completed,
+        step="release_log4j",
+        label="Assign the 'Release_log4j' label to the Releases of 'log4j-core'",
+        clause_match="(:Artifact_log4j) - [:relationship_AR] -> (r:Release)",
+        clause_set="r:Release_log4j",
+    )
+
+    # Assign the 'Release_depend' label to
+    # the Releases that depend on 'log4j-core'
+    run_step(
+        client,
+        completed,
+        step="release_depend",
+        label=(
+            "Assign the 'Release_depend' label to "
+            "the Releases that depend on 'log4j-core'"
+        ),
+        clause_match="(r:Release) - [:dependency] -> (a:Artifact_log4j)",
+        clause_set="r:Release_depend",
+    )
+
+    # Assign the 'Artifact_depend' label to
+    # the Artifacts that depend on 'log4j-core'
+    run_step(
+        client,
+        completed,
+        step="artifact_depend",
+        label=(
+            "Assign the 'Artifact_depend' label to "
+            "the Artifacts that depend on 'log4j-core'"
+        ),
+        clause_match="(a:Artifact) - [:relationship_AR] -> (:Release_depend)",
+        clause_set="a:Artifact_depend",
+    )
+
+    # Assign the 'Release_log4j_SemVer' label to the Releases
+    # that have the 'Release_log4j' label and follow semantic versioning.
+    run_step(
+        client,
+        completed,
+        step="release_log4j_semver",
+        label=(
+            "Assign the 'Release_log4j_SemVer' label to the Releases "
+            "that have the 'Release_log4j' label and follow semantic versioning"
+        ),
+        clause_match="(r:Release_log4j)",
+        clause_where=f"r.version =~ {SEMVER_REGEX}",
+        clause_set="r:Release_log4j_SemVer",
+    )
+
+    # Assign the 'Release_depend_SemVer' label to the Releases
+    # that follow semantic versioning and
+    # whose dependent log4j package versions also follow semantic versioning.
+    run_step(
+        client,
+        completed,
+        step="release_depend_semver",
+        label=(
+            "Assign the 'Release_depend_SemVer' label to the Releases "
+            "that follow semantic versioning and "
+            "whose dependent log4j package versions also follow semantic versioning"
+        ),
+        clause_match=("(r:Release_depend) - [d:dependency] -> (a:Artifact_log4j)"),
+        clause_where=(
+            f"r.version =~ {SEMVER_REGEX} AND d.targetVersion =~ {SEMVER_REGEX}"
+        ),
+        clause_set="r:Release_depend_SemVer",
+    )
+
+    # Assign the 'artifactId' property to 'Release_depend_SemVer' nodes
+    run_step(
+        client,
+        completed,
+        step="artifact_id",
+        label="Assign the 'artifactId' property to 'Release_depend_SemVer' nodes",
+        clause_match=(
+            "(a:Artifact_depend) - [d:relationship_AR] -> (r:Release_depend_SemVer)"
+        ),
+        clause_set="r.artifactId = a.id",
+    )
+
+    # Assign the 'targetVersion' property to 'Release_depend_SemVer' nodes
+    run_step(
+        client,
+        completed,
+        step="target_version",
+        label="Assign the 'targetVersion' property to 'Release_depend_SemVer' nodes",
+        clause_match=(
+            "(r:Release_depend_SemVer) - [d:dependency] -> (a:Artifact_log4j)"
+        ),
+        clause_set="r.targetVersion = d.targetVersion",
+    )
+
+    # Assign the 'targetTimestamp' property to 'Release_depend_SemVer' nodes
+    run_step(
+        client,
+        completed,
+        step="target_timestamp",
+        label=(
+            "Assign the 'targetTimestamp' property to 'Release_depend_SemVer' nodes"
+        ),
+        clause_match=(
+            "(rd:Release_depend_SemVer) - [:dependency] -> "
+            "(:Artifact_log4j) - [:relationship_AR] -> "
+            "(rl:Release_log4j_SemVer)"
+        ),
+        clause_where="rd.targetVersion = rl.version",
+        clause_set="rd.targetTimestamp = rl.timestamp",
+    )
+
+
+def export_sorted_releases(client: Neo4jClient, memory_limit: int) -> None:
+    """
+    Export the release histories, ordering and grouping them outside the database.
+
+    The database only streams one row per release, without `ORDER BY` and
+    `collect`, whose sort would otherwise have to fit in the database heap. In
+    'explain' mode the query is only planned and no file is written.
+
+    Args:
+        client (Neo4jClient): Client connected to a labeled Goblin Neo4j database.
+        memory_limit (int): Memory budget of the sort (in bytes).
+
+    """
+    if client.mode == "explain":
+        client.run_query(RELEASE_ROWS_QUERY)
+        return
+
+    rows = (
+        (artifact_id, Release(dependent_time, dependent_version, log4j_time, log4j))
+        for artifact_id, dependent_time, dependent_version, log4j_time, log4j in (
+            client.iter_query(RELEASE_ROWS_QUERY)
         )
+    )
+    with JsonArrayWriter(SAVE_FILE_PATH, indent=False) as writer:
+        for history in group_release_rows(sort_release_rows(rows, memory_limit)):
+            writer.write(history)
+
+
+def _column(
+    result: dict[str, NDArray[Any]],
+    path: str,
+    dtype: type[np.generic],
+) -> NDArray[Any]:
+    """Read a result column, which is missing if the result has no rows."""
+    return np.asarray(result.get(path, ()), dtype=dtype)
+
+
+def export_release_columns(client: Neo4jClient, fetch_size: int) -> None:
+    """
+    Export the release histories through columns instead of records.
+
+    The export query returns one list per release field instead of a map per
+    release, and the lists are read into columns, which are written to
+    'data_releases.json' and then cached in 'data_releases.npz'. The cache is
+    written last, so that it is not older than the JSON file and the empirical
+    study and `data_extraction --workers` read it instead of parsing the JSON.
+    In 'explain' mode the query is only planned and no file is written.
+
+    Args:
+        client (Neo4jClient): Client connected to a labeled Goblin Neo4j database.
+        fetch_size (int): Number of records fetched from the database at a time.
+
+    Raises:
+        ValueError: If a release field is null, so its list is shorter.
+
+    """
+    result = client.run_query_columnar(RELEASE_COLUMNS_QUERY, fetch_size=fetch_size)
+    if client.mode == "explain":
+        return
+
+    # `collect` skips nulls, which would misalign the lists of the fields
+    offsets = result.get("dependent_time.offsets", np.zeros(1, dtype=np.int64))
+    for field in RELEASE_FIELDS:
+        if not np.array_equal(result.get(f"{field}.offsets", offsets), offsets):
+            error_message = f"Some releases have no '{field}'."
+            raise ValueError(error_message)
+
+    columns: ReleaseColumns = {
+        "artifact_ids": _column(result, "artifactId", np.str_),
+        "offsets": offsets,
+        "dependent_time": _column(result, "dependent_time[]", np.int64),
+        "dependent_version": _column(result, "dependent_version[]", np.str_),
+        "log4j_time": _column(result, "log4j_time[]", np.int64),
+        "log4j_version": _column(result, "log4j_version[]", np.str_),
+    }
+    with JsonArrayWriter(SAVE_FILE_PATH, indent=False) as writer:
+        for history in from_release_columns(columns):
+            writer.write(history)
+    save_release_columns(columns, COLUMNS_FILE_PATH)
+
 
-        # Assign the 'targetVersion' property to 'Release_depend_SemVer' nodes
+def extract_releases(
+    client: Neo4jClient,
+    memory_limit: int | None = None,
+    fetch_size: int | None = None,
+) -> None:
+    """
+    Export the release history of every artifact that depends on 'log4j-core'.
+
+    Args:
+        client (Neo4jClient): Client connected to a labeled Goblin Neo4j database.
+        memory_limit (int | None): Sort the releases outside the database within
+            this memory budget (in bytes), instead of in the export query.
+        fetch_size (int | None): Read the releases into columns, fetching this
+            many records at a time, and also cache the columns.
+
+    """
+    if fetch_size is not None:
         run_task(
-            label=(
-                "Assign the 'targetVersion' property to 'Release_depend_SemVer' nodes"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match=(
-                    "(r:Release_depend_SemVer) - [d:dependency] -> (a:Artifact_log4j)"
-                ),
-                clause_set="r.targetVersion = d.targetVersion",
-            ),
+            label="Extract Data into Columns & Save Result",
+            task=lambda: export_release_columns(client, fetch_size),
         )
-
-        # Assign the 'targetTimestamp' property to 'Release_depend_SemVer' nodes
+    elif memory_limit is not None:
         run_task(
-            label=(
-                "Assign the 'targetTimestamp' property to 'Release_depend_SemVer' nodes"
-            ),
-            task=lambda: client.run_query_with_clauses(
-                clause_match=(
-                    "(rd:Release_depend_SemVer) - [:dependency] -> "
-                    "(:Artifact_log4j) - [:relationship_AR] -> "
-                    "(rl:Release_log4j_SemVer)"
-                ),
-                clause_where="rd.targetVersion = rl.version",
-                clause_set="rd.targetTimestamp = rl.timestamp",
-            ),
+            label="Extract Data & Sort it Outside the Database",
+            task=lambda: export_sorted_releases(client, memory_limit),
         )
-
+    else:
         # Extract Data & Save Result
         run_task(
             label="Extract Data & Save Result",
             task=lambda: client.extract_data(
-                query="\
-                    MATCH (r:Release_depend_SemVer) \
-                    WITH \
-                      r, \
-                      split(r.version, ').') AS parts \
-                    WITH \
-                      r.artifactId AS artifactId, \
-                      r.version AS dependent_version, \
-                      r.timestamp AS dependent_time, \
-                      r.targetVersion AS log4j_version, \
-                      r.targetTimestamp AS log4j_time, \
-                      toInteger(parts[0]) AS major, \
-                      toInteger(parts[1]) AS minor, \
-                      toInteger(parts[2]) AS patch \
-                    ORDER BY artifactId, major, minor, patch \
-                    WITH artifactId, collect({ \
-                        log4j_time:log4j_time, \
-                        log4j_version:log4j_version, \
-                        dependent_time:dependent_time, \
-                        dependent_version:dependent_version \
-                    }) as version \
-                    RETURN artifactId, version",
+                query=RELEASE_HISTORIES_QUERY,
                 path=SAVE_FILE_PATH,
+                indent=False,
             ),
         )
 
+    # Index the exported histories for per-artifact lookups
+    if client.mode == "explain":
+        return
+    run_task(
+        label="Index Release Histories",
+        task=lambda: build_history_store(
+            iter_release_histories(SAVE_FILE_PATH),
+            HISTORY_FILE_PATH,
+        ),
+    )
+
+
+def graph_fingerprint() -> str:
+    """
+    Fingerprint the Goblin Neo4j database configured in the environment.
+
+    Returns:
+        str: Hash of the node and relationship counts of the database.
+
+    """
+    uri, username, password = get_neo4j_envs()
+    with Neo4jClient(uri, username, password) as client:
+        return client.fingerprint()
+
+
+def report_plans(
+    plans: list[QueryPlan],
+    path: Path,
+    baseline: Path | None,
+    tolerance: float,
+) -> None:
+    """
+    Save the query plans and print their warnings and regressions.
+
+    Args:
+        plans (list[QueryPlan]): Plans of the queries, in execution order.
+        path (Path): Path to save the plans to.
+        baseline (Path | None): Plans of a previous run to compare with.
+        tolerance (float): Relative growth of a metric that is tolerated.
+
+    """
+    regressions = (
+        compare_plans(load_json(baseline)["plans"], plans, tolerance)
+        if baseline is not None
+        else []
+    )
+    save_json({"plans": plans, "regressions": regressions}, path)
+
+    for i, plan in enumerate(plans, start=1):
+        print(
+            f"Query {i}: {plan['estimated_rows']:.0f} estimated rows, "
+            f"{plan['db_hits']} db hits, "
+            f"{plan['page_cache_misses']} page cache misses",
+        )
+        for warning in plan["warnings"]:
+            print(f"  ⚠ {warning}")
+
+    if baseline is not None:
+        print(f"Regressions compared to '{baseline}': {len(regressions)}")
+        for regression in regressions:
+            print(
+                f"  {regression['metric']}: {regression['baseline']:.0f} -> "
+                f"{regression['current']:.0f} in '{regression['query'][:80]}'",
+            )
+
+    print(f"Query plans have been saved to: '{path}'")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Entry point of the script.
+
+    Connects to the Neo4j database, processes and labels
+    release and artifact nodes related to 'log4j-core', and extracts structured data.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(description="Prepare and export the data.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--explain",
+        action="store_const",
+        const="explain",
+        dest="mode",
+        help="only plan the queries and report their estimated cost",
+    )
+    mode.add_argument(
+        "--profile",
+        action="store_const",
+        const="profile",
+        dest="mode",
+        help="run the queries and report their db hits and page cache misses",
+    )
+    parser.add_argument(
+        "--plans",
+        type=Path,
+        default=PLANS_FILE_PATH,
+        help="path to save the query plans to",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="query plans of a previous run to compare with",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=REGRESSION_TOLERANCE,
+        help="relative growth of a metric that is not reported as a regression",
+    )
+    export = parser.add_mutually_exclusive_group()
+    export.add_argument(
+        "--external-sort",
+        action="store_true",
+        help="order and group the releases outside the database",
+    )
+    export.add_argument(
+        "--columnar",
+        action="store_true",
+        help="read the releases into columns and cache them in data_releases.npz",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=MEMORY_LIMIT // MEBIBYTE,
+        help="memory budget of --external-sort in MiB",
+    )
+    parser.add_argument(
+        "--fetch-size",
+        type=int,
+        default=DEFAULT_FETCH_SIZE,
+        help="number of records fetched at a time with --columnar",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="run every labeling step, ignoring the checkpoints of previous runs",
+    )
+    parser.set_defaults(mode="run")
+    args = parser.parse_args(argv)
+
+    # Setup Neo4j Client
+    uri, username, password = get_neo4j_envs()
+
+    with Neo4jClient(uri, username, password, mode=args.mode) as client:
+        label_graph(client, restart=args.restart)
+        extract_releases(
+            client,
+            args.memory_limit * MEBIBYTE if args.external_sort else None,
+            args.fetch_size if args.columnar else None,
+        )
+
+        if args.mode != "run":
+            report_plans(client.plans, args.plans, args.baseline, args.tolerance)
+        if args.mode == "explain":
+            return
+
         # Output confirmation
         print(f"Release datas has been saved to: '{SAVE_FILE_PATH}'")
+        print(f"Release history store has been saved to: '{HISTORY_FILE_PATH}'")
 
 
 if __name__ == "__main__":
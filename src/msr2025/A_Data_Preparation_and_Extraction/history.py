@@ -0,0 +1,113 @@
+"""
+Shows the release timeline of a single artifact.
+
+This script:
+- Looks up the releases of one artifact in the indexed release history store
+  written by `data_preparation`, without loading the other artifacts.
+- (Re)builds the store from 'data_releases.json' first when asked to, or when
+  the store is missing or older than 'data_releases.json' (e.g., after
+  `sort_releases` rewrote it).
+- Prints each release with its timestamp in milliseconds, the version of the
+  artifact and the log4j version it depends on.
+"""
+
+import argparse
+from datetime import UTC, datetime
+from pathlib import Path
+
+from ..lib.files import save_json
+from ..lib.history import HISTORY_FILE_PATH, HistoryStore, build_history_store
+from ..lib.records import iter_release_histories
+from ..lib.tasks import run_task
+from .data_preparation import SAVE_FILE_PATH as RELEASES_FILE_PATH
+
+# Number of similar artifact ids suggested when an artifact is not found
+SUGGESTIONS = 10
+
+
+def _format_time(timestamp: int) -> str:
+    """Format a timestamp in milliseconds as an ISO date and time (UTC)."""
+    return datetime.fromtimestamp(timestamp / 1000, tz=UTC).isoformat(
+        timespec="seconds",
+    )
+
+
+def _is_stale(store: Path) -> bool:
+    """Check whether a store is missing or older than the release histories."""
+    return not store.exists() or (
+        RELEASES_FILE_PATH.exists()
+        and RELEASES_FILE_PATH.stat().st_mtime_ns > store.stat().st_mtime_ns
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Print the release timeline of one artifact.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Show the release timeline of one artifact.",
+    )
+    parser.add_argument("artifact_id", help="e.g. 'org.example:library'")
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=HISTORY_FILE_PATH,
+        help="release history store to read",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help=f"rebuild the store from '{RELEASES_FILE_PATH}' first",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="also save the timeline to this JSON file",
+    )
+    args = parser.parse_args(argv)
+
+    if args.rebuild or _is_stale(args.store):
+        run_task(
+            label="Index Release Histories",
+            task=lambda: build_history_store(
+                iter_release_histories(RELEASES_FILE_PATH),
+                args.store,
+            ),
+        )
+
+    with HistoryStore(args.store) as store:
+        releases = store.releases(args.artifact_id)
+        if not releases:
+            # Artifacts of the same groupId, not of groupIds it is a prefix of
+            group_id = args.artifact_id.partition(":")[0]
+            suggestions = store.search(f"{group_id}:", SUGGESTIONS)
+            error_message = (
+                f"Artifact '{args.artifact_id}' not found in '{args.store}'."
+            )
+            if suggestions:
+                error_message += " Similar artifacts: " + ", ".join(suggestions)
+            raise SystemExit(error_message)
+
+    print(f"{args.artifact_id}: {len(releases)} releases")
+    print(f"{'time (ms)':>14}  {'date (UTC)':<25}  {'version':<20}  log4j")
+    for r in releases:
+        print(
+            f"{r.dependent_time:>14}  {_format_time(r.dependent_time):<25}  "
+            f"{r.dependent_version:<20}  {r.log4j_version}",
+        )
+
+    if args.json is not None:
+        save_json(
+            {"artifact_id": args.artifact_id, "releases": releases},
+            args.json,
+        )
+        print(f"Timeline has been saved to: '{args.json}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,40 @@
 """
 lib package for data preparation and extraction utilities.
 
-This package includes helpers for environment variable handling and
-Neo4j database interaction.
+This package includes helpers for environment variable handling,
+Neo4j database interaction, the comparison of query plans and the collection
+of query results into columns.
 """
 
+from .columnar import (
+    DEFAULT_FETCH_SIZE,
+    ColumnBuffer,
+    read_columns,
+    to_arrow_table,
+    to_numpy_columns,
+)
 from .env import get_neo4j_envs
-from .neo4jclient import Neo4jClient
+from .neo4jclient import Neo4jClient, build_clause_query
+from .plans import (
+    FLAGGED_OPERATORS,
+    PlanRegression,
+    QueryPlan,
+    compare_plans,
+    query_plan,
+)
 
 __all__ = [
+    "DEFAULT_FETCH_SIZE",
+    "FLAGGED_OPERATORS",
+    "ColumnBuffer",
     "Neo4jClient",
+    "PlanRegression",
+    "QueryPlan",
+    "build_clause_query",
+    "compare_plans",
     "get_neo4j_envs",
+    "query_plan",
+    "read_columns",
+    "to_arrow_table",
+    "to_numpy_columns",
 ]
@@ -0,0 +1,288 @@
+"""
+Collects Cypher query results into column buffers instead of records.
+
+Includes:
+- ColumnBuffer: Accumulates the values of one result column. Lists are flattened
+  into lengths and a buffer of their items, and maps into a buffer per key. Lists
+  of scalars are appended in bulk.
+- read_columns: Appends every record of a result to one buffer per column.
+- to_numpy_columns: Converts the buffers into NumPy arrays.
+- to_arrow_table: Converts the buffers into a nested Arrow table (requires
+  `pyarrow`, see `require_pyarrow`).
+
+NumPy columns are keyed by path: a list column 'x' becomes 'x.offsets' (the start
+of each row's items, followed by the number of items) and its items 'x[]', and a
+map column 'x' becomes one column 'x.<key>' per key. For example, the release
+histories of `data_preparation` become 'artifactId', 'version.offsets',
+'version[].log4j_time', and so on, like the `ReleaseColumns` layout.
+
+The driver hydrates every record into Python objects, and a map per list item
+(e.g., `collect({time: r.timestamp, ...})`) costs a dict per item both in the
+driver and in the buffer, which walks it key by key. Queries meant for columns
+should rather return one list per field (e.g., `collect(r.timestamp) AS time`):
+the driver then builds lists of scalars, and the buffer extends its values with
+each list at once.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from numpy.typing import NDArray
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+type ColumnKind = Literal["scalar", "list", "map"]
+
+# Number of records fetched from the database at a time
+DEFAULT_FETCH_SIZE = 10_000
+
+# Path suffix of the offsets of a list column
+OFFSETS_SUFFIX = ".offsets"
+
+# Path suffix of the items of a list column
+ITEMS_SUFFIX = "[]"
+
+
+def _kind_of(value: object) -> ColumnKind | None:
+    """Classify a value, or return None for null."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return "list"
+    if isinstance(value, dict):
+        return "map"
+    return "scalar"
+
+
+class ColumnBuffer:
+    """
+    Accumulates the values of one result column, or of values nested in one.
+
+    The kind of the column is set by its first non-null value. Nulls become empty
+    lists in a list column and null values of every key in a map column.
+
+    Attributes:
+        kind (ColumnKind | None): Kind of the values, or None while all are null.
+        size (int): Number of values appended.
+        values (list[Any]): Values of a scalar column.
+        lengths (list[int]): Number of items of each value of a list column.
+        items (ColumnBuffer | None): Items of a list column.
+        fields (dict[str, ColumnBuffer]): Values of each key of a map column.
+
+    """
+
+    __slots__ = ("fields", "items", "kind", "lengths", "size", "values")
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self.kind: ColumnKind | None = None
+        self.size = 0
+        self.values: list[Any] = []
+        self.lengths: list[int] = []
+        self.items: ColumnBuffer | None = None
+        self.fields: dict[str, ColumnBuffer] = {}
+
+    def _set_kind(self, kind: ColumnKind) -> None:
+        """Set the kind of the column, converting the leading nulls."""
+        self.kind = kind
+        if kind == "list":
+            self.lengths = [0] * len(self.values)
+            self.items = ColumnBuffer()
+            self.values = []
+        elif kind == "map":
+            self.values = []
+
+    def append(self, value: Any) -> None:  # noqa: ANN401
+        """
+        Append one value.
+
+        Args:
+            value (Any): A scalar, list or map value, or None.
+
+        Raises:
+            TypeError: If the value is of another kind than the column.
+
+        """
+        kind = _kind_of(value)
+        if kind is not None and self.kind is None:
+            self._set_kind(kind)
+        elif kind is not None and kind != self.kind:
+            error_message = f"Cannot append a {kind} value to a {self.kind} column."
+            raise TypeError(error_message)
+
+        if self.kind == "list":
+            items: list[Any] = value or []
+            self.lengths.append(len(items))
+            self.items.extend(items)  # type: ignore[union-attr]
+        elif self.kind == "map":
+            fields: dict[str, Any] = value or {}
+            for key in fields:
+                if key not in self.fields:
+                    # A key first seen now was null in the previous maps
+                    field = self.fields[key] = ColumnBuffer()
+                    for _ in range(self.size):
+                        field.append(None)
+            for key, field in self.fields.items():
+                field.append(fields.get(key))
+        else:
+            self.values.append(value)
+        self.size += 1
+
+    def extend(self, values: list[Any]) -> None:
+        """
+        Append several values.
+
+        A list whose first non-null value is a scalar is taken to hold only
+        scalars and nulls, like the lists of `collect`, and is added at once.
+
+        Args:
+            values (list[Any]): Scalar, list or map values, or None.
+
+        Raises:
+            TypeError: If a value is of another kind than the column.
+
+        """
+        first = next((value for value in values if value is not None), None)
+        if self.kind in {None, "scalar"} and _kind_of(first) == "scalar":
+            self.kind = "scalar"
+            self.values.extend(values)
+            self.size += len(values)
+            return
+        for value in values:
+            self.append(value)
+
+    def to_numpy(self, path: str) -> dict[str, NDArray[Any]]:
+        """
+        Convert the buffer into NumPy arrays.
+
+        Scalar values become arrays of their natural dtype (e.g., int64 or a
+        string dtype); columns with nulls become object arrays.
+
+        Args:
+            path (str): Path of the column.
+
+        Returns:
+            dict[str, NDArray[Any]]: The arrays of the column and of the values
+            nested in it, keyed by path.
+
+        """
+        if self.kind == "list":
+            offsets = np.zeros(self.size + 1, dtype=np.int64)
+            np.cumsum(self.lengths, out=offsets[1:])
+            return {
+                path + OFFSETS_SUFFIX: offsets,
+                **self.items.to_numpy(path + ITEMS_SUFFIX),  # type: ignore[union-attr]
+            }
+        if self.kind == "map":
+            columns: dict[str, NDArray[Any]] = {}
+            for key, field in self.fields.items():
+                columns.update(field.to_numpy(f"{path}.{key}"))
+            return columns
+        return {path: np.array(self.values)}
+
+    def to_arrow(self) -> pa.Array:
+        """
+        Convert the buffer into a nested Arrow array.
+
+        Returns:
+            pa.Array: A large list array for a list column, a struct array for a
+            map column, and an array of the inferred type otherwise.
+
+        """
+        if self.kind == "list":
+            offsets = np.zeros(self.size + 1, dtype=np.int64)
+            np.cumsum(self.lengths, out=offsets[1:])
+            return pa.LargeListArray.from_arrays(
+                offsets,
+                self.items.to_arrow(),  # type: ignore[union-attr]
+            )
+        if self.kind == "map" and self.fields:
+            return pa.StructArray.from_arrays(
+                [field.to_arrow() for field in self.fields.values()],
+                names=list(self.fields),
+            )
+        if self.kind == "map":
+            return pa.nulls(self.size)
+        return pa.array(self.values)
+
+
+def read_columns(
+    keys: Sequence[str],
+    records: Iterable[Sequence[Any]],
+) -> dict[str, ColumnBuffer]:
+    """
+    Buffer the values of every record, column by column.
+
+    Args:
+        keys (Sequence[str]): Names of the columns.
+        records (Iterable[Sequence[Any]]): Values of each record, in column order
+            (e.g., the records of a Neo4j result).
+
+    Returns:
+        dict[str, ColumnBuffer]: The buffer of each column.
+
+    """
+    buffers = [ColumnBuffer() for _ in keys]
+    for record in records:
+        for buffer, value in zip(buffers, record, strict=True):
+            buffer.append(value)
+    return dict(zip(keys, buffers, strict=True))
+
+
+def to_numpy_columns(buffers: dict[str, ColumnBuffer]) -> dict[str, NDArray[Any]]:
+    """
+    Convert column buffers into NumPy arrays.
+
+    Args:
+        buffers (dict[str, ColumnBuffer]): The buffer of each column.
+
+    Returns:
+        dict[str, NDArray[Any]]: The arrays of all columns, keyed by path.
+
+    """
+    columns: dict[str, NDArray[Any]] = {}
+    for key, buffer in buffers.items():
+        columns.update(buffer.to_numpy(key))
+    return columns
+
+
+def require_pyarrow() -> None:
+    """
+    Check that Arrow tables can be built.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+
+    """
+    if pa is None:
+        error_message = (
+            "Arrow tables require 'pyarrow'. Install it with 'uv sync --extra arrow'."
+        )
+        raise ImportError(error_message)
+
+
+def to_arrow_table(buffers: dict[str, ColumnBuffer]) -> pa.Table:
+    """
+    Convert column buffers into an Arrow table with nested columns.
+
+    Args:
+        buffers (dict[str, ColumnBuffer]): The buffer of each column.
+
+    Returns:
+        pa.Table: One column per result column.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+
+    """
+    require_pyarrow()
+    return pa.table({key: buffer.to_arrow() for key, buffer in buffers.items()})
@@ -3,20 +3,94 @@ Provides a Neo4jClient class for interacting with a Neo4j graph database.
 
 This module defines a context-manager-enabled client class for running Cypher queries,
 including support for building dynamic queries and exporting results to JSON.
+
+In 'explain' mode the client only plans the queries it is given (nothing is read
+or written), and in 'profile' mode it runs them while recording their database
+hits and page cache misses. Either way, the plan of every query is collected in
+`Neo4jClient.plans`.
+
+Writes can run as managed transactions, which the driver retries with exponential
+backoff on transient errors such as a lost connection or a leader switch. A write
+may record a checkpoint, a `PreparationCheckpoint` marker node created in the same
+transaction, so that a rerun can skip the steps that were committed.
+
+Results can also be read into column buffers (see `columnar`) and returned as
+NumPy arrays or an Arrow table, e.g., to be cached and reloaded without parsing.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import TYPE_CHECKING, Any, Self, cast
 
 from neo4j import GraphDatabase
 
-from ...lib.files import save_json
+from ...lib.files import JsonArrayWriter
+from .columnar import (
+    DEFAULT_FETCH_SIZE,
+    ColumnBuffer,
+    read_columns,
+    require_pyarrow,
+    to_arrow_table,
+    to_numpy_columns,
+)
+from .plans import query_plan
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
     from types import TracebackType
 
+    import pyarrow as pa
+    from neo4j import ManagedTransaction, ResultSummary
+    from numpy.typing import NDArray
+
+    from .plans import QueryMode, QueryPlan
+
+# Label of the marker nodes that record completed write steps
+CHECKPOINT_LABEL = "PreparationCheckpoint"
+
+# Records a completed step; `$step` is its name
+CHECKPOINT_QUERY = f"""
+MERGE (c:{CHECKPOINT_LABEL} {{step: $step}})
+SET c.completedAt = datetime()
+"""
+
+# Longest time a managed transaction is retried on transient errors (in seconds)
+MAX_TRANSACTION_RETRY_TIME = 300.0
+
+
+def build_clause_query(
+    clause_match: str | None = None,
+    clause_where: str | None = None,
+    clause_set: str | None = None,
+    clause_create: str | None = None,
+    clause_return: str | None = None,
+) -> str:
+    """
+    Construct a Cypher query from individual clauses.
+
+    Args:
+        clause_match (Optional[str]): MATCH clause.
+        clause_where (Optional[str]): WHERE clause.
+        clause_set (Optional[str]): SET clause.
+        clause_create (Optional[str]): CREATE clause.
+        clause_return (Optional[str]): RETURN clause.
+
+    Returns:
+        str: The given clauses, in this order.
+
+    """
+    queries: dict[str, str | None] = {
+        "MATCH": clause_match,
+        "WHERE": clause_where,
+        "SET": clause_set,
+        "CREATE": clause_create,
+        "RETURN": clause_return,
+    }
+    return " ".join(f"{k} {v}" for k, v in queries.items() if v is not None)
+
 
 class Neo4jClient:
     """
@@ -26,10 +100,22 @@ class Neo4jClient:
     - Execute raw Cypher queries
     - Dynamically build queries from individual clauses
     - Export query results to JSON files
+    - Stream query results record by record
+    - Collect query results into NumPy or Arrow columns
+    - Run writes as retried managed transactions that record checkpoints
+    - Fingerprint the contents of the database
+    - Explain or profile the queries instead of only running them
     Supports usage within a 'with' block to automatically manage connections.
     """
 
-    def __init__(self, uri: str, user: str, password: str) -> None:
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        mode: QueryMode = "run",
+        max_retry_time: float = MAX_TRANSACTION_RETRY_TIME,
+    ) -> None:
         """
         Initialize the Neo4j client with connection credentials.
 
@@ -37,9 +123,19 @@ class Neo4jClient:
            uri (str): The URI of the Neo4j database.
            user (str): Username for authentication.
            password (str): Password for authentication.
+           mode (QueryMode): 'run' the queries (default), only 'explain' them, or
+               'profile' them while running.
+           max_retry_time (float): Longest time a managed transaction is retried
+               on transient errors (in seconds).
 
         """
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.driver = GraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_transaction_retry_time=max_retry_time,
+        )
+        self.mode: QueryMode = mode
+        self.plans: list[QueryPlan] = []
 
     def __enter__(self) -> Self:
         """
@@ -64,20 +160,182 @@ class Neo4jClient:
         """Close the Neo4j database connection."""
         self.driver.close()
 
-    def run_query(self, query: str) -> list[dict[str, Any]]:
+    def _prefixed(self, query: str) -> str:
+        """Prefix a query with EXPLAIN or PROFILE, according to the mode."""
+        return query if self.mode == "run" else f"{self.mode.upper()} {query}"
+
+    def _record_plan(self, query: str, summary: ResultSummary) -> None:
+        """Collect the plan of a query run in 'explain' or 'profile' mode."""
+        if self.mode == "run":
+            return
+        plan = summary.profile if self.mode == "profile" else summary.plan
+        if plan is not None:
+            self.plans.append(query_plan(query, plan, self.mode))
+
+    def run_query(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
         """
         Run a raw Cypher query and return the results.
 
+        In 'explain' mode the query is only planned and no records are returned.
+
+        Args:
+            query (str): The Cypher query string.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+
+        Returns:
+            list[dict[str, Any]]: list of result records.
+
+        """
+        with self.driver.session() as session:
+            result = session.run(self._prefixed(query), parameters)
+            records = cast("list[dict[str, Any]]", list(result))
+            self._record_plan(query, result.consume())
+            return records
+
+    def execute_write(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+        checkpoint: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a Cypher query as a managed write transaction.
+
+        The driver retries the transaction with exponential backoff on transient
+        errors, so the query must be idempotent. The checkpoint, if any, is
+        recorded in the same transaction and thus exactly when the query is
+        committed. In 'explain' and 'profile' mode the query is run like
+        `run_query` and no checkpoint is recorded.
+
         Args:
             query (str): The Cypher query string.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+            checkpoint (Optional[str]): Name of the step to record as completed.
 
         Returns:
             list[dict[str, Any]]: list of result records.
 
         """
+        if self.mode != "run":
+            return self.run_query(query, parameters)
+
+        def work(tx: ManagedTransaction) -> list[dict[str, Any]]:
+            records = cast("list[dict[str, Any]]", list(tx.run(query, parameters)))
+            if checkpoint is not None:
+                tx.run(CHECKPOINT_QUERY, {"step": checkpoint}).consume()
+            return records
+
         with self.driver.session() as session:
-            result = session.run(query)
-            return cast("list[dict[str, Any]]", list(result))
+            return session.execute_write(work)
+
+    def checkpoints(self) -> set[str]:
+        """
+        Read the steps recorded as completed.
+
+        Returns:
+            set[str]: Names of the completed steps.
+
+        """
+        records = self.run_query(f"MATCH (c:{CHECKPOINT_LABEL}) RETURN c.step AS step")
+        return {record["step"] for record in records}
+
+    def clear_checkpoints(self) -> None:
+        """Delete the checkpoints, so that every step runs again."""
+        self.execute_write(f"MATCH (c:{CHECKPOINT_LABEL}) DELETE c")
+
+    def iter_query(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+    ) -> Iterator[list[Any]]:
+        """
+        Run a Cypher query and stream its records.
+
+        Records are yielded as they arrive from the database, so the result set is
+        never held in memory as a whole. In 'explain' mode nothing is yielded.
+
+        Args:
+            query (str): The Cypher query string.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+
+        Yields:
+            list[Any]: The values of each record, in column order.
+
+        """
+        with self.driver.session() as session:
+            result = session.run(self._prefixed(query), parameters)
+            for record in result:
+                yield list(record)
+            self._record_plan(query, result.consume())
+
+    def _read_columns(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None,
+        fetch_size: int,
+    ) -> dict[str, ColumnBuffer]:
+        """Run a Cypher query and buffer its records column by column."""
+        with self.driver.session(fetch_size=fetch_size) as session:
+            result = session.run(self._prefixed(query), parameters)
+            buffers = read_columns(result.keys(), result)
+            self._record_plan(query, result.consume())
+        return buffers
+
+    def run_query_columnar(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+    ) -> dict[str, NDArray[Any]]:
+        """
+        Run a Cypher query and return its results as NumPy columns.
+
+        Record values are appended to column buffers, and nested lists
+        and maps are flattened into offsets and one column per key (see
+        `columnar`). In 'explain' mode the columns are empty.
+
+        Args:
+            query (str): The Cypher query string.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+            fetch_size (int): Number of records fetched from the database at a time.
+
+        Returns:
+            dict[str, NDArray[Any]]: The arrays of all columns, keyed by path.
+
+        """
+        return to_numpy_columns(self._read_columns(query, parameters, fetch_size))
+
+    def run_query_arrow(
+        self,
+        query: str,
+        parameters: dict[str, Any] | None = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+    ) -> pa.Table:
+        """
+        Run a Cypher query and return its results as an Arrow table.
+
+        Lists become (large) list columns and maps become struct columns. In
+        'explain' mode the table is empty.
+
+        Args:
+            query (str): The Cypher query string.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+            fetch_size (int): Number of records fetched from the database at a time.
+
+        Returns:
+            pa.Table: One column per result column.
+
+        Raises:
+            ImportError: If `pyarrow` is not installed.
+
+        """
+        # Fail before the query runs rather than after
+        require_pyarrow()
+        return to_arrow_table(self._read_columns(query, parameters, fetch_size))
 
     def run_query_with_clauses(
         self,
@@ -91,7 +349,8 @@ class Neo4jClient:
         Construct and run a Cypher query from individual clauses.
 
         Any clause (MATCH, WHERE, SET, CREATE, RETURN) can be optionally provided.
-        The query will be dynamically built and executed.
+        The query will be dynamically built (see `build_clause_query`) and
+        executed.
 
         Args:
             clause_match (Optional[str]): MATCH clause.
@@ -104,25 +363,80 @@ class Neo4jClient:
             list[dict[str, Any]]: List of result records.
 
         """
-        queries: dict[str, str | None] = {
-            "MATCH": clause_match,
-            "WHERE": clause_where,
-            "SET": clause_set,
-            "CREATE": clause_create,
-            "RETURN": clause_return,
-        }
-
-        query: str = " ".join(f"{k} {v}" for k, v in queries.items() if v is not None)
+        query = build_clause_query(
+            clause_match,
+            clause_where,
+            clause_set,
+            clause_create,
+            clause_return,
+        )
         return self.run_query(query)
 
-    def extract_data(self, query: str, path: Path) -> None:
+    def extract_data(
+        self,
+        query: str,
+        path: Path,
+        parameters: dict[str, Any] | None = None,
+        *,
+        indent: bool = True,
+    ) -> None:
         """
         Run a query and export the results to a JSON file.
 
+        Records are written as they arrive from the database, so the result set is
+        never held in memory as a whole. In 'explain' mode the query is only
+        planned and no file is written.
+
         Args:
             query (str): The Cypher query to run.
             path (Path): Path to save the resulting JSON file.
+            parameters (Optional[dict[str, Any]]): Values for the query's parameters.
+            indent (bool): Indent the JSON file (default). Pass False for compact JSON.
+
+        """
+        if self.mode == "explain":
+            self.run_query(query, parameters)
+            return
+
+        with (
+            self.driver.session() as session,
+            JsonArrayWriter(path, indent=indent) as writer,
+        ):
+            result = session.run(self._prefixed(query), parameters)
+            for record in result:
+                writer.write(list(record))
+            self._record_plan(query, result.consume())
 
+    def fingerprint(self) -> str:
         """
-        result = self.run_query(query)
-        save_json(cast("dict", list(result)), path)  # type: ignore[type-arg]
+        Summarize the contents of the database as a hash.
+
+        The hash covers the number of nodes and the number of relationships of each
+        type, which Neo4j reads from its count store without scanning the graph.
+        Labels, properties and checkpoint nodes written by `data_preparation` do not
+        affect it.
+        The counts are read even in 'explain' and 'profile' mode.
+
+        Returns:
+            str: SHA-256 hash of the node and relationship counts.
+
+        """
+        mode, self.mode = self.mode, "run"
+        try:
+            nodes = self.run_query("MATCH (n) RETURN count(n) AS count")
+            markers = self.run_query(
+                f"MATCH (c:{CHECKPOINT_LABEL}) RETURN count(c) AS count",
+            )
+            counts: dict[str, int] = {
+                "nodes": nodes[0]["count"] - markers[0]["count"],
+            }
+            for record in self.run_query("CALL db.relationshipTypes()"):
+                relationship_type = record["relationshipType"]
+                counts[f"relationships:{relationship_type}"] = self.run_query(
+                    f"MATCH ()-[r:`{relationship_type}`]->() RETURN count(r) AS count",
+                )[0]["count"]
+        finally:
+            self.mode = mode
+
+        summary = json.dumps(counts, sort_keys=True).encode()
+        return hashlib.sha256(summary).hexdigest()
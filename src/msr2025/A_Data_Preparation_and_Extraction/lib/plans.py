@@ -0,0 +1,245 @@
+"""
+Summarizes and compares Neo4j query plans.
+
+Includes:
+- OperatorStats / QueryPlan: A query plan flattened into one record per operator,
+  with the estimated rows of every operator and, for profiled queries, the
+  database hits and page cache hits and misses.
+- normalize_query: Collapses the whitespace of a query, which identifies it.
+- query_plan: Builds a QueryPlan from the plan or profile of a query summary.
+- PlanRegression / compare_plans: Finds queries whose cost grew, or that use more
+  expensive operators, compared to the plans of a previous run.
+
+Operators that touch every node (AllNodesScan), every node of a label
+(NodeByLabelScan) or combine two unrelated matches (CartesianProduct) are flagged,
+as their cost grows with the size of the whole graph.
+"""
+
+import re
+from typing import Any, Literal, TypedDict
+
+type QueryMode = Literal["run", "explain", "profile"]
+
+type PlanMetric = Literal["estimated_rows", "db_hits", "page_cache_misses"]
+
+# Operators whose cost grows with the size of the whole graph
+FLAGGED_OPERATORS = {
+    "AllNodesScan": "scans every node",
+    "NodeByLabelScan": "scans every node of a label",
+    "CartesianProduct": "combines unrelated matches",
+}
+
+# Relative growth of a metric that counts as a regression
+REGRESSION_TOLERANCE = 0.2
+
+# Metrics of a QueryPlan compared between runs
+COMPARED_METRICS: tuple[PlanMetric, ...] = (
+    "estimated_rows",
+    "db_hits",
+    "page_cache_misses",
+)
+
+
+class OperatorStats(TypedDict):
+    """
+    Statistics of one operator of a query plan.
+
+    Attributes:
+        operator (str): Operator type (e.g., 'NodeByLabelScan').
+        depth (int): Depth of the operator in the plan tree (0 for the root).
+        details (str): Details of the operator (e.g., the scanned label).
+        estimated_rows (float): Number of rows the planner expects.
+        rows (int): Number of rows produced (0 unless profiled).
+        db_hits (int): Number of database hits (0 unless profiled).
+        page_cache_hits (int): Number of page cache hits (0 unless profiled).
+        page_cache_misses (int): Number of page cache misses (0 unless profiled).
+
+    """
+
+    operator: str
+    depth: int
+    details: str
+    estimated_rows: float
+    rows: int
+    db_hits: int
+    page_cache_hits: int
+    page_cache_misses: int
+
+
+class QueryPlan(TypedDict):
+    """
+    Plan of one query.
+
+    Attributes:
+        query (str): The query, with whitespace normalized.
+        mode (QueryMode): 'explain' (estimates only) or 'profile'.
+        estimated_rows (float): Number of rows the planner expects in total.
+        db_hits (int): Database hits of all operators (0 unless profiled).
+        page_cache_hits (int): Page cache hits of all operators.
+        page_cache_misses (int): Page cache misses of all operators.
+        warnings (list[str]): One message per flagged operator.
+        operators (list[OperatorStats]): Operators in depth-first order.
+
+    """
+
+    query: str
+    mode: QueryMode
+    estimated_rows: float
+    db_hits: int
+    page_cache_hits: int
+    page_cache_misses: int
+    warnings: list[str]
+    operators: list[OperatorStats]
+
+
+class PlanRegression(TypedDict):
+    """
+    A metric of a query that grew compared to a previous run.
+
+    Attributes:
+        query (str): The query.
+        metric (str): Name of the metric, or 'operator:<type>' for a flagged
+            operator that the query uses more often.
+        baseline (float): Value in the previous run.
+        current (float): Value in this run.
+
+    """
+
+    query: str
+    metric: str
+    baseline: float
+    current: float
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapse the whitespace of a query, so that it identifies the query across runs.
+
+    Args:
+        query (str): The Cypher query.
+
+    Returns:
+        str: The query on one line.
+
+    """
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def _operators(
+    plan: dict[str, Any],
+    depth: int = 0,
+) -> list[OperatorStats]:
+    """Flatten a plan tree into its operators, in depth-first order."""
+    arguments: dict[str, Any] = plan.get("args", {})
+    operators: list[OperatorStats] = [
+        {
+            # Neo4j 5 suffixes operators with the runtime (e.g., 'Filter@neo4j')
+            "operator": str(plan.get("operatorType", "")).split("@")[0],
+            "depth": depth,
+            "details": str(arguments.get("Details", "")),
+            "estimated_rows": float(arguments.get("EstimatedRows", 0.0)),
+            "rows": int(plan.get("rows", 0)),
+            "db_hits": int(plan.get("dbHits", 0)),
+            "page_cache_hits": int(plan.get("pageCacheHits", 0)),
+            "page_cache_misses": int(plan.get("pageCacheMisses", 0)),
+        },
+    ]
+    for child in plan.get("children", []):
+        operators.extend(_operators(child, depth + 1))
+    return operators
+
+
+def query_plan(query: str, plan: dict[str, Any], mode: QueryMode) -> QueryPlan:
+    """
+    Summarize the plan of a query.
+
+    Args:
+        query (str): The Cypher query, without EXPLAIN or PROFILE.
+        plan (dict[str, Any]): `ResultSummary.plan` of an EXPLAIN query, or
+            `ResultSummary.profile` of a PROFILE query.
+        mode (QueryMode): 'explain' or 'profile'.
+
+    Returns:
+        QueryPlan: The operators of the plan, their totals and warnings.
+
+    """
+    operators = _operators(plan)
+    return {
+        "query": normalize_query(query),
+        "mode": mode,
+        "estimated_rows": operators[0]["estimated_rows"],
+        "db_hits": sum(o["db_hits"] for o in operators),
+        "page_cache_hits": sum(o["page_cache_hits"] for o in operators),
+        "page_cache_misses": sum(o["page_cache_misses"] for o in operators),
+        "warnings": [
+            f"{o['operator']} {FLAGGED_OPERATORS[o['operator']]}"
+            + (f" ({o['details']})" if o["details"] else "")
+            for o in operators
+            if o["operator"] in FLAGGED_OPERATORS
+        ],
+        "operators": operators,
+    }
+
+
+def _flagged_counts(plan: QueryPlan) -> dict[str, int]:
+    """Count the flagged operators of a plan by type."""
+    counts = dict.fromkeys(FLAGGED_OPERATORS, 0)
+    for operator in plan["operators"]:
+        if operator["operator"] in counts:
+            counts[operator["operator"]] += 1
+    return counts
+
+
+def compare_plans(
+    baseline: list[QueryPlan],
+    current: list[QueryPlan],
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> list[PlanRegression]:
+    """
+    Find the queries whose plans got more expensive.
+
+    Queries are matched by their text; queries missing from either run are
+    ignored. A metric regresses when it grows by more than `tolerance` (relative
+    to the baseline), and a flagged operator when a query uses it more often.
+
+    Args:
+        baseline (list[QueryPlan]): Plans of a previous run.
+        current (list[QueryPlan]): Plans of this run.
+        tolerance (float): Relative growth that is tolerated.
+
+    Returns:
+        list[PlanRegression]: The regressions, in the order of `current`.
+
+    """
+    previous = {plan["query"]: plan for plan in baseline}
+    regressions: list[PlanRegression] = []
+    for plan in current:
+        old = previous.get(plan["query"])
+        if old is None:
+            continue
+
+        for metric in COMPARED_METRICS:
+            before = float(old[metric])
+            after = float(plan[metric])
+            if after > before * (1 + tolerance):
+                regressions.append(
+                    {
+                        "query": plan["query"],
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                    },
+                )
+
+        old_counts = _flagged_counts(old)
+        for operator, count in _flagged_counts(plan).items():
+            if count > old_counts[operator]:
+                regressions.append(
+                    {
+                        "query": plan["query"],
+                        "metric": f"operator:{operator}",
+                        "baseline": old_counts[operator],
+                        "current": count,
+                    },
+                )
+    return regressions
@@ -0,0 +1,235 @@
+"""
+Computes release transitions around a log4j release over columnar release histories.
+
+Includes:
+- TransitionIndices: Positions of the releases that make up each transition.
+- transition_indices: Finds the transitions of all artifacts with segment
+  reductions over the numeric release columns.
+- InputShard / input_shards: Splits release histories into shards that worker
+  processes read on their own: byte ranges of a JSON Lines file, or artifact
+  ranges of cached release columns ('.npz') balanced by release count.
+- read_shard: Decodes the release histories of one shard into columns, or
+  slices them from the memory-mapped release columns.
+- map_shards: Applies a function to every shard in a process pool, in order.
+
+The parent process only splits the input: each worker parses or loads its own
+shard, so no release histories are parsed by the parent or pickled to workers.
+Cached release columns are memory-mapped rather than loaded, so every worker
+only reads the pages of its own shard and all of them share the file's pages
+instead of holding a private copy of the dataset.
+"""
+
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import pairwise
+from pathlib import Path
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...lib.columns import (
+    ReleaseColumns,
+    map_release_columns,
+    segment_arg_extreme,
+    to_release_columns,
+)
+from ...lib.files import JSON_LINES_SUFFIX
+from ...lib.records import iter_release_histories
+
+# Shards per worker; smaller shards even out artifacts with very long histories
+SHARDS_PER_WORKER = 4
+
+
+class TransitionIndices(TypedDict):
+    """
+    Release positions of the transition of every artifact.
+
+    Positions index the release columns; -1 means the artifact has no such release.
+
+    Attributes:
+        previous (NDArray[np.int64]): Latest release depending on log4j before the
+            cutoff.
+        next (NDArray[np.int64]): Earliest release depending on log4j at or after
+            the cutoff.
+        earliest (NDArray[np.int64]): Earliest release.
+        latest (NDArray[np.int64]): Latest release.
+
+    """
+
+    previous: NDArray[np.int64]
+    next: NDArray[np.int64]
+    earliest: NDArray[np.int64]
+    latest: NDArray[np.int64]
+
+
+def transition_indices(
+    offsets: NDArray[np.int64],
+    dependent_time: NDArray[np.int64],
+    log4j_time: NDArray[np.int64],
+    cutoff: int,
+) -> TransitionIndices:
+    """
+    Find the releases that make up the transition of every artifact.
+
+    Ties are resolved in favor of the earliest release in the history, like the
+    per-artifact computation in `data_extraction`.
+
+    Args:
+        offsets (NDArray[np.int64]): Offsets array of a `ReleaseColumns`.
+        dependent_time (NDArray[np.int64]): Timestamp of each dependent release.
+        log4j_time (NDArray[np.int64]): Timestamp of the log4j version depended on.
+        cutoff (int): Timestamp of the log4j release that splits the histories.
+
+    Returns:
+        TransitionIndices: Release positions per artifact.
+
+    """
+    old = log4j_time < cutoff
+    return {
+        "previous": segment_arg_extreme(dependent_time, offsets, old, largest=True),
+        "next": segment_arg_extreme(dependent_time, offsets, ~old),
+        "earliest": segment_arg_extreme(dependent_time, offsets),
+        "latest": segment_arg_extreme(dependent_time, offsets, largest=True),
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class InputShard:
+    """
+    A part of the release histories that a worker reads on its own.
+
+    Attributes:
+        path (Path): A JSON Lines file, or release columns saved as '.npz'.
+        start (int): First byte of a JSON Lines file, or first artifact.
+        stop (int): End (exclusive) of the bytes or artifacts.
+
+    """
+
+    path: Path
+    start: int
+    stop: int
+
+
+def _shard_bounds(offsets: NDArray[np.int64], shards: int) -> list[tuple[int, int]]:
+    """
+    Split the artifacts into contiguous ranges with similar numbers of releases.
+
+    Args:
+        offsets (NDArray[np.int64]): Offsets array of a `ReleaseColumns`.
+        shards (int): Maximum number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: Non-empty (start, stop) artifact ranges, in order.
+
+    """
+    artifacts = offsets.size - 1
+    targets = np.linspace(0, offsets[-1], shards + 1)
+    cuts = np.unique(
+        np.concatenate(
+            [[0], np.searchsorted(offsets, targets).clip(max=artifacts), [artifacts]],
+        ),
+    )
+    return [(int(start), int(stop)) for start, stop in pairwise(cuts)]
+
+
+def input_shards(path: Path, workers: int | None = None) -> list[InputShard]:
+    """
+    Split release histories into shards for a number of workers.
+
+    A JSON Lines file is split into byte ranges of equal size, and each line
+    belongs to the range it starts in. Release columns are split into artifact
+    ranges with similar numbers of releases.
+
+    Args:
+        path (Path): A JSON Lines file ('.jsonl'), or release columns saved by
+            `save_release_columns` ('.npz').
+        workers (int | None): Number of worker processes. `None` uses every
+            available CPU.
+
+    Returns:
+        list[InputShard]: The shards, in input order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    """
+    shards = 1 if workers == 1 else (workers or os.cpu_count() or 1) * SHARDS_PER_WORKER
+
+    if path.suffix == JSON_LINES_SUFFIX:
+        cuts = np.unique(np.linspace(0, path.stat().st_size, shards + 1).astype(int))
+        bounds = [(int(start), int(stop)) for start, stop in pairwise(cuts)]
+    else:
+        with np.load(path, allow_pickle=False) as data:
+            bounds = _shard_bounds(data["offsets"], shards)
+
+    return [InputShard(path, start, stop) for start, stop in bounds]
+
+
+@lru_cache(maxsize=1)
+def _load_columns(path: Path, modified: int) -> ReleaseColumns:
+    """Map release columns once per process and version of the file."""
+    del modified
+    return map_release_columns(path)
+
+
+def read_shard(shard: InputShard) -> ReleaseColumns:
+    """
+    Read the release histories of one shard.
+
+    Args:
+        shard (InputShard): The shard to read.
+
+    Returns:
+        ReleaseColumns: The release histories of the artifacts in the shard
+        (views of the mapped file for release columns).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    """
+    if shard.path.suffix == JSON_LINES_SUFFIX:
+        return to_release_columns(
+            iter_release_histories(shard.path, (shard.start, shard.stop)),
+        )
+
+    columns = _load_columns(shard.path, shard.path.stat().st_mtime_ns)
+    offsets = columns["offsets"][shard.start : shard.stop + 1]
+    first, last = int(offsets[0]), int(offsets[-1])
+    return {
+        "artifact_ids": columns["artifact_ids"][shard.start : shard.stop],
+        "offsets": offsets - first,
+        "dependent_time": columns["dependent_time"][first:last],
+        "dependent_version": columns["dependent_version"][first:last],
+        "log4j_time": columns["log4j_time"][first:last],
+        "log4j_version": columns["log4j_version"][first:last],
+    }
+
+
+def map_shards[T](
+    function: Callable[[InputShard], T],
+    shards: list[InputShard],
+    workers: int | None = None,
+) -> Iterator[T]:
+    """
+    Apply a function to every shard in a pool of worker processes.
+
+    Args:
+        function (Callable[[InputShard], T]): A picklable function of a shard.
+        shards (list[InputShard]): The shards.
+        workers (int | None): Number of worker processes. `1` runs in-process;
+            `None` uses every available CPU.
+
+    Yields:
+        T: The result of each shard, in shard order.
+
+    """
+    if workers == 1 or len(shards) <= 1:
+        yield from map(function, shards)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        yield from executor.map(function, shards)
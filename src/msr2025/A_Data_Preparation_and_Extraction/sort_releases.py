@@ -0,0 +1,85 @@
+"""
+Groups a flat release export into release histories, outside the database.
+
+This script:
+- Streams release rows (one `[artifactId, release]` per element, as a JSON array
+  or a JSON Lines file) in any order, e.g., exported without `ORDER BY`.
+- Orders them by artifact id and version with an external merge sort that keeps
+  at most `--memory-limit` MiB of rows in memory and spills sorted runs to disk.
+- Writes the grouped release histories in the format of 'data_releases.json'.
+"""
+
+import argparse
+from pathlib import Path
+
+from ..lib.external_sort import (
+    MAX_FAN_IN,
+    MEMORY_LIMIT,
+    group_release_rows,
+    sort_release_rows,
+)
+from ..lib.files import JsonArrayWriter
+from ..lib.records import iter_release_rows
+from .data_preparation import MEBIBYTE, SAVE_FILE_PATH
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Sort and group a flat release export.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Group a flat release export into release histories.",
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="release rows as a JSON array or JSON Lines ('.jsonl') file",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=SAVE_FILE_PATH,
+        help="path to save the release histories to",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=MEMORY_LIMIT // MEBIBYTE,
+        help="memory budget of the sort in MiB",
+    )
+    parser.add_argument(
+        "--fan-in",
+        type=int,
+        default=MAX_FAN_IN,
+        help="maximum number of sorted runs merged at once",
+    )
+    parser.add_argument(
+        "--spill-dir",
+        type=Path,
+        default=None,
+        help="directory for the sorted runs (default: the temporary directory)",
+    )
+    args = parser.parse_args(argv)
+
+    rows = sort_release_rows(
+        iter_release_rows(args.input),
+        args.memory_limit * MEBIBYTE,
+        args.fan_in,
+        args.spill_dir,
+    )
+    artifacts = 0
+    with JsonArrayWriter(args.output, indent=False) as writer:
+        for history in group_release_rows(rows):
+            writer.write(history)
+            artifacts += 1
+
+    print(f"Artifacts grouped: {artifacts}")
+    print(f"Release histories have been saved to: '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,33 @@ This module runs:
 - RQ1: Update delays after log4j 2.17.0.
 - RQ2.1: Correlation between update delay and release frequency.
 - RQ2.2: Comparison of update delays by version change type (major, minor, patch).
+- Survival: Time to update including packages that have not updated yet.
+- Exposure: Daily number of packages still depending on a vulnerable log4j.
+- Adoption: Paths packages took through log4j versions, and how long each hop took.
 """
 
-from . import rq1, rq2_1, rq2_2
+from . import adoption, exposure, rq1, rq2_1, rq2_2, survival
 
 
 def main() -> None:
     """Run all empirical study scripts sequentially."""
     print("\n**** RQ 1 ****")
-    rq1.main()
+    rq1.main([])
 
     print("\n**** RQ 2.1 ****")
-    rq2_1.main()
+    rq2_1.main([])
 
     print("\n**** RQ 2.2 ****")
-    rq2_2.main()
+    rq2_2.main([])
+
+    print("\n**** Survival ****")
+    survival.main()
+
+    print("\n**** Exposure ****")
+    exposure.main()
+
+    print("\n**** Adoption ****")
+    adoption.main()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+Run log4j version adoption path analysis.
+
+Which paths did packages take through log4j versions (e.g., 2.14 -> 2.15 -> 2.16
+-> 2.17), and how long did each hop take?
+
+This script:
+- Loads the release histories of all packages depending on log4j-core.
+- Builds the transition matrix between log4j lines (major.minor, with patch
+  versions kept for the 2.3.x and 2.12.x backports) over consecutive releases of
+  each package.
+- Computes the latency distribution of every hop: the time from the release of
+  the adopted log4j version, and the time spent on the previous line.
+- Finds the most common adoption paths.
+- Plots the transition matrix and saves all results as JSON.
+"""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+from numpy.typing import NDArray
+
+from ..lib.files import save_json
+from .lib.adoption import HOP_QUANTILES, adoption_analysis
+from .lib.constants import ONE_DAY
+from .lib.files import load_release_columns, save_plot
+
+SAVE_FILE_NAME = "adoption.pdf"
+SAVE_FILE_PATH = Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
+
+SAVE_RESULTS_FILE_PATH = Path("output/B_Empirical_Study/adoption.json")
+
+# Probability of the median among HOP_QUANTILES
+MEDIAN = 0.5
+
+# Number of hops and paths printed
+PRINTED_HOPS = 10
+PRINTED_PATHS = 10
+
+
+def _path_label(
+    states: list[str],
+    row: NDArray[np.int64],
+    *,
+    truncated: bool,
+) -> str:
+    """Format an adoption path (e.g., '2.14 -> 2.16 -> 2.17')."""
+    lines = [states[s] for s in row if s >= 0]
+    if truncated:
+        lines.append("...")
+    return " -> ".join(lines)
+
+
+def main() -> None:
+    """Run log4j version adoption path analysis."""
+    # Clear any existing plot
+    plt.clf()
+
+    # Load release histories in columnar form and mine the adoption paths
+    adoption = adoption_analysis(load_release_columns())
+    states = adoption["states"]
+    transitions = adoption["transitions"]
+    hops = adoption["hops"]
+    paths = adoption["paths"]
+
+    # Plot the transition matrix (log scale, as a few hops dominate)
+    plt.imshow(np.log10(transitions + 1), cmap="Blues")
+    plt.colorbar(label="log10(number of hops + 1)")
+    plt.xticks(range(len(states)), states, rotation=90)
+    plt.yticks(range(len(states)), states)
+    plt.xlabel("Log4j version adopted")
+    plt.ylabel("Log4j version used before")
+    save_plot(SAVE_FILE_NAME)
+
+    # Hop latencies in days
+    lag_days = hops["lag"] / ONE_DAY
+    dwell_days = hops["dwell"] / ONE_DAY
+    path_labels = [
+        _path_label(states, row, truncated=bool(truncated))
+        for row, truncated in zip(paths["states"], paths["truncated"], strict=True)
+    ]
+
+    save_json(
+        {
+            "states": states,
+            "transitions": transitions.tolist(),
+            "quantiles": list(HOP_QUANTILES),
+            "hops": [
+                {
+                    "from": states[source],
+                    "to": states[target],
+                    "count": int(count),
+                    "lag_days": lag.tolist(),
+                    "dwell_days": dwell.tolist(),
+                }
+                for source, target, count, lag, dwell in zip(
+                    hops["source"],
+                    hops["target"],
+                    hops["count"],
+                    lag_days,
+                    dwell_days,
+                    strict=True,
+                )
+            ],
+            "paths": [
+                {"path": label, "count": int(count)}
+                for label, count in zip(path_labels, paths["count"], strict=True)
+            ],
+        },
+        SAVE_RESULTS_FILE_PATH,
+    )
+
+    # Output statistics
+    median_column = HOP_QUANTILES.index(MEDIAN)
+    print(f"Log4j lines       : {len(states)}")
+    print(f"Hops              : {int(transitions.sum())}")
+    print("Most common hops (median days since log4j release / on previous line):")
+    for i in np.argsort(-hops["count"], kind="stable")[:PRINTED_HOPS]:
+        print(
+            f"  {states[hops['source'][i]]:>6} -> {states[hops['target'][i]]:<6}"
+            f" {hops['count'][i]:>8}"
+            f"  {lag_days[i, median_column]:8.1f}"
+            f"  {dwell_days[i, median_column]:8.1f}",
+        )
+    print("Most common adoption paths:")
+    for label, count in zip(
+        path_labels[:PRINTED_PATHS],
+        paths["count"][:PRINTED_PATHS],
+        strict=True,
+    ):
+        print(f"  {count:>8}  {label}")
+
+    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
+    print(f"Results have been saved to: '{SAVE_RESULTS_FILE_PATH}'")
+
+
+if __name__ == "__main__":
+    main()
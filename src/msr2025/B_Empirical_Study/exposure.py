@@ -0,0 +1,86 @@
+"""
+Run ecosystem exposure timeline analysis.
+
+How many packages still shipped a vulnerable log4j-core dependency on each day
+after Log4Shell was disclosed?
+
+This script:
+- Loads the release histories of all packages depending on log4j-core.
+- Counts, for every day since December 2021, the packages whose latest release
+  depends on a log4j version released before 2.17.0 (sweep line over releases).
+- Plots the daily count and saves it as a compact time series.
+"""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ..lib.files import save_json
+from .lib.constants import LOG4J_TIMESTAMP_2_17_0, ONE_DAY
+from .lib.exposure import exposure_timeline
+from .lib.files import load_release_columns, save_plot
+
+SAVE_FILE_NAME = "exposure.pdf"
+SAVE_FILE_PATH = Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
+
+SAVE_TIMELINE_FILE_PATH = Path("output/B_Empirical_Study/exposure.json")
+
+# First day of the timeline (2021-12-01 00:00 UTC, in milliseconds)
+TIMELINE_START_TIMESTAMP = 1638316800000
+
+
+def _format_day(timestamp: int) -> str:
+    """Format a timestamp in milliseconds as an ISO date (UTC)."""
+    return datetime.fromtimestamp(timestamp / 1000, tz=UTC).date().isoformat()
+
+
+def main() -> None:
+    """Run ecosystem exposure timeline analysis."""
+    # Clear any existing plot
+    plt.clf()
+
+    # Load release histories in columnar form
+    columns = load_release_columns()
+    vulnerable = columns["log4j_time"] < LOG4J_TIMESTAMP_2_17_0
+
+    # Count exposed packages per day up to the latest release in the dataset
+    timeline = exposure_timeline(
+        columns,
+        vulnerable,
+        start=TIMELINE_START_TIMESTAMP,
+        end=int(columns["dependent_time"].max()),
+        step=ONE_DAY,
+    )
+    counts = timeline["counts"]
+    days = np.datetime64(_format_day(timeline["start"])) + np.arange(counts.size)
+
+    # Plot the daily count
+    plt.plot(days, counts)
+    plt.xlabel("Date")
+    plt.ylabel("Number of packages whose latest release\ndepends on log4j < 2.17.0")
+    plt.gcf().autofmt_xdate()
+    save_plot(SAVE_FILE_NAME)
+
+    save_json(
+        {
+            "start": _format_day(timeline["start"]),
+            "step_days": timeline["step"] // ONE_DAY,
+            "counts": counts.tolist(),
+        },
+        SAVE_TIMELINE_FILE_PATH,
+    )
+
+    # Output statistics
+    peak = int(np.argmax(counts))
+    print(f"Days in timeline  : {counts.size}")
+    print(f"Peak exposure     : {counts[peak]} packages on {days[peak]}")
+    print(f"Latest exposure   : {counts[-1]} packages on {days[-1]}")
+
+    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
+    print(f"Timeline has been saved to: '{SAVE_TIMELINE_FILE_PATH}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,188 @@ This package provides:
 - Constants used across the empirical study phase.
 - File-related utility functions for loading data and saving plots.
 - Type definitions for structured data representation.
+- Vectorized summary statistics and a mergeable quantile sketch.
+- Bootstrap confidence intervals and permutation tests.
+- Classification of release transitions by version change type.
+- Kaplan-Meier survival and competing-risks cumulative incidence estimation.
+- A sweep-line engine for exposure timelines.
+- Columnar, filterable release transitions.
+- The RQ statistics and plots, shared by the RQ scripts and the analysis server.
+- Vectorized release cadence features.
+- Log4j version adoption paths and hop latencies.
+- Estimates with sampling errors for a stratified sample of packages.
+- Side-by-side statistics and per-artifact deltas of graph snapshots.
+- Organization-level rollups of the release transitions.
 """
 
-from .constants import ONE_DAY, SOURCE_FILE_PATH
-from .files import load_source_file, save_plot
+from .adoption import Adoption, adoption_analysis, log4j_states
+from .analyses import (
+    RQ1Result,
+    RQ21Result,
+    RQ22Result,
+    plot_rq1,
+    plot_rq2_1,
+    plot_rq2_2,
+    rq1_statistics,
+    rq2_1_statistics,
+    rq2_2_statistics,
+)
+from .cadence import (
+    CADENCE_FEATURES,
+    CadenceFeatures,
+    align_features,
+    cadence_features,
+)
+from .constants import (
+    COLUMNS_FILE_PATH,
+    LOG4J_TIMESTAMP_2_17_0,
+    LOG4SHELL_TIMESTAMP,
+    ONE_DAY,
+    RELEASES_FILE_PATH,
+    SAMPLE_FILE_PATH,
+    SOURCE_FILE_PATH,
+)
+from .dataset import UpdateColumns, select_updates, to_update_columns, update_mask
+from .exposure import Timeline, exposure_timeline
+from .files import (
+    load_release_columns,
+    load_sample_design,
+    load_source_file,
+    save_plot,
+)
+from .resampling import (
+    Interval,
+    PermutationResult,
+    bootstrap_correlation,
+    bootstrap_median,
+    permutation_test_correlation,
+    permutation_test_median_difference,
+)
+from .rollup import (
+    GRANULARITIES,
+    ROLLUP_POSITIONS,
+    OrganizationRollup,
+    group_ids,
+    intern,
+    rollup_organizations,
+    select_granularity,
+)
+from .sampling import (
+    SampleEstimate,
+    SampleStrata,
+    sample_strata,
+    stratified_proportion,
+    stratified_quantile,
+)
+from .sketch import QuantileSketch
+from .snapshots import (
+    DeltaSummary,
+    SnapshotDelta,
+    SnapshotStatistics,
+    snapshot_delta,
+    snapshot_statistics,
+    summarize_delta,
+)
+from .stats import (
+    Summary,
+    fractions_below,
+    grouped_quantiles,
+    median,
+    quantiles,
+    summarize,
+)
+from .survival import (
+    CumulativeIncidence,
+    SurvivalCurve,
+    cumulative_incidence,
+    incidence_at,
+    kaplan_meier,
+    median_incidence,
+    median_survival,
+    survival_at,
+)
 from .type import Data
+from .versions import (
+    VERSION_CHANGE_TYPES,
+    group_by_version_change,
+    version_change_codes,
+)
 
 __all__ = [
+    "CADENCE_FEATURES",
+    "COLUMNS_FILE_PATH",
+    "GRANULARITIES",
+    "LOG4J_TIMESTAMP_2_17_0",
+    "LOG4SHELL_TIMESTAMP",
     "ONE_DAY",
+    "RELEASES_FILE_PATH",
+    "ROLLUP_POSITIONS",
+    "SAMPLE_FILE_PATH",
     "SOURCE_FILE_PATH",
+    "VERSION_CHANGE_TYPES",
+    "Adoption",
+    "CadenceFeatures",
+    "CumulativeIncidence",
     "Data",
+    "DeltaSummary",
+    "Interval",
+    "OrganizationRollup",
+    "PermutationResult",
+    "QuantileSketch",
+    "RQ1Result",
+    "RQ21Result",
+    "RQ22Result",
+    "SampleEstimate",
+    "SampleStrata",
+    "SnapshotDelta",
+    "SnapshotStatistics",
+    "Summary",
+    "SurvivalCurve",
+    "Timeline",
+    "UpdateColumns",
+    "adoption_analysis",
+    "align_features",
+    "bootstrap_correlation",
+    "bootstrap_median",
+    "cadence_features",
+    "cumulative_incidence",
+    "exposure_timeline",
+    "fractions_below",
+    "group_by_version_change",
+    "group_ids",
+    "grouped_quantiles",
+    "incidence_at",
+    "intern",
+    "kaplan_meier",
+    "load_release_columns",
+    "load_sample_design",
     "load_source_file",
+    "log4j_states",
+    "median",
+    "median_incidence",
+    "median_survival",
+    "permutation_test_correlation",
+    "permutation_test_median_difference",
+    "plot_rq1",
+    "plot_rq2_1",
+    "plot_rq2_2",
+    "quantiles",
+    "rollup_organizations",
+    "rq1_statistics",
+    "rq2_1_statistics",
+    "rq2_2_statistics",
+    "sample_strata",
     "save_plot",
+    "select_granularity",
+    "select_updates",
+    "snapshot_delta",
+    "snapshot_statistics",
+    "stratified_proportion",
+    "stratified_quantile",
+    "summarize",
+    "summarize_delta",
+    "survival_at",
+    "to_update_columns",
+    "update_mask",
+    "version_change_codes",
 ]
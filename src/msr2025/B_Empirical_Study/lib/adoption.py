@@ -0,0 +1,235 @@
+"""
+Mines the paths along which artifacts moved through log4j versions.
+
+Includes:
+- log4j_states: Maps log4j versions to their major.minor line (e.g., '2.17' for
+  2.17.0 and 2.17.1), ordered by version. Releases of the backport lines keep
+  their patch version, since it decides which vulnerabilities they fix.
+- adoption_analysis: Builds the log4j transition matrix, the latency distribution
+  of every hop and the most common adoption paths.
+
+Each artifact's releases are ordered by time and collapsed into runs of releases
+that depend on the same log4j line; a hop is the first release of a new run. All
+of it is computed with one sort over all releases and grouped reductions, without
+per-artifact Python loops.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...lib.columns import ReleaseColumns, segment_ids
+from .stats import grouped_quantiles
+
+# Quantiles reported for the latency of every hop
+HOP_QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+# Lines whose patch releases backport the Log4Shell fixes (2.3.1 and 2.3.2 for
+# Java 6, 2.12.2 to 2.12.4 for Java 7); their versions stay separate states
+BACKPORT_LINES = ("2.3", "2.12")
+
+# Paths are compared on at most this many log4j lines
+MAX_PATH_LENGTH = 8
+
+# Number of most common paths reported
+TOP_PATHS = 20
+
+
+class Hops(TypedDict):
+    """
+    Latency distribution of every observed hop between two log4j lines.
+
+    Attributes:
+        source (NDArray[np.int64]): State the artifacts moved from.
+        target (NDArray[np.int64]): State the artifacts moved to.
+        count (NDArray[np.int64]): Number of times the hop was taken.
+        lag (NDArray[np.float64]): `HOP_QUANTILES` of the time from the release of
+            the adopted log4j version to the release that adopted it, one row per
+            hop (in milliseconds).
+        dwell (NDArray[np.float64]): `HOP_QUANTILES` of the time the artifacts
+            stayed on the source line before the hop, one row per hop.
+
+    """
+
+    source: NDArray[np.int64]
+    target: NDArray[np.int64]
+    count: NDArray[np.int64]
+    lag: NDArray[np.float64]
+    dwell: NDArray[np.float64]
+
+
+class Paths(TypedDict):
+    """
+    Most common sequences of log4j lines, most common first.
+
+    Attributes:
+        states (NDArray[np.int64]): One row per path; -1 pads shorter paths.
+        truncated (NDArray[np.bool_]): Whether the paths continue beyond
+            `MAX_PATH_LENGTH` lines.
+        count (NDArray[np.int64]): Number of artifacts that took each path.
+
+    """
+
+    states: NDArray[np.int64]
+    truncated: NDArray[np.bool_]
+    count: NDArray[np.int64]
+
+
+class Adoption(TypedDict):
+    """
+    Result of the adoption path analysis.
+
+    Attributes:
+        states (list[str]): Log4j lines, in version order.
+        transitions (NDArray[np.int64]): Number of hops from each state (row) to
+            each state (column).
+        hops (Hops): Latency distribution of every observed hop.
+        paths (Paths): Most common adoption paths.
+
+    """
+
+    states: list[str]
+    transitions: NDArray[np.int64]
+    hops: Hops
+    paths: Paths
+
+
+def _version_key(line: str) -> list[tuple[int, int, str]]:
+    """Sort key comparing numeric parts of a version numerically."""
+    return [(0, int(p), "") if p.isdigit() else (1, 0, p) for p in line.split(".")]
+
+
+def log4j_states(versions: NDArray[np.str_]) -> tuple[list[str], NDArray[np.int64]]:
+    """
+    Map log4j versions to their major.minor line.
+
+    Versions of the `BACKPORT_LINES` keep their patch version (e.g., '2.12.1' and
+    '2.12.2' are separate states), all others are collapsed (e.g., '2.17').
+
+    Args:
+        versions (NDArray[np.str_]): Log4j version of every release.
+
+    Returns:
+        tuple[list[str], NDArray[np.int64]]: The lines in version order, and the
+        index of the line of every release.
+
+    """
+    # np.char.partition fails on empty arrays
+    if versions.size == 0:
+        return [], np.zeros(0, dtype=np.int64)
+
+    major, _, rest = np.moveaxis(np.char.partition(versions, "."), -1, 0)
+    minor, _, rest = np.moveaxis(np.char.partition(rest, "."), -1, 0)
+    patch = np.char.partition(rest, ".")[..., 0]
+    line = np.char.add(np.char.add(major, "."), minor)
+    backport = np.isin(line, BACKPORT_LINES) & (patch != "")
+    lines, inverse = np.unique(
+        np.where(backport, np.char.add(np.char.add(line, "."), patch), line),
+        return_inverse=True,
+    )
+
+    # np.unique orders '2.10' before '2.2'; reorder the few distinct lines
+    order = sorted(range(lines.size), key=lambda i: _version_key(str(lines[i])))
+    rank = np.empty(lines.size, dtype=np.int64)
+    rank[order] = np.arange(lines.size)
+    return [str(lines[i]) for i in order], rank[inverse.ravel()]
+
+
+def adoption_analysis(
+    columns: ReleaseColumns,
+    max_path_length: int = MAX_PATH_LENGTH,
+    top: int = TOP_PATHS,
+) -> Adoption:
+    """
+    Analyze how artifacts moved through log4j versions.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+        max_path_length (int): Paths are compared on at most this many lines.
+        top (int): Number of most common paths to report.
+
+    Returns:
+        Adoption: The transition matrix, hop latencies and most common paths.
+
+    """
+    states, codes = log4j_states(columns["log4j_version"])
+    state_count = len(states)
+    artifact_count = columns["artifact_ids"].size
+    segments = segment_ids(columns["offsets"])
+    times = columns["dependent_time"]
+
+    # Order each artifact's releases by time, keeping the export order for ties
+    order = np.lexsort((np.arange(times.size), times, segments))
+    ordered_codes = codes[order]
+    ordered_segments = segments[order]
+    ordered_times = times[order]
+    ordered_lags = ordered_times - columns["log4j_time"][order]
+
+    # Runs of releases on the same log4j line; every run but the first is a hop
+    same_artifact = ordered_segments[1:] == ordered_segments[:-1]
+    run_start = np.ones(order.size, dtype=bool)
+    run_start[1:] = ~same_artifact | (ordered_codes[1:] != ordered_codes[:-1])
+    is_hop = np.zeros(order.size, dtype=bool)
+    is_hop[1:] = same_artifact & run_start[1:]
+
+    # Transition matrix
+    hop_positions = np.flatnonzero(is_hop)
+    sources = ordered_codes[hop_positions - 1]
+    pairs = sources * state_count + ordered_codes[hop_positions]
+    transitions = np.bincount(pairs, minlength=state_count**2).reshape(
+        state_count,
+        state_count,
+    )
+
+    # Latency distribution of every observed hop
+    starts = np.flatnonzero(run_start)
+    run_durations = ordered_times[starts[1:]] - ordered_times[starts[:-1]]
+    dwell = run_durations[is_hop[starts[1:]]]
+    observed, hop_groups = np.unique(pairs, return_inverse=True)
+    lag_quantiles = grouped_quantiles(
+        ordered_lags[hop_positions].astype(np.float64),
+        hop_groups,
+        observed.size,
+        HOP_QUANTILES,
+    )
+    dwell_quantiles = grouped_quantiles(
+        dwell.astype(np.float64),
+        hop_groups,
+        observed.size,
+        HOP_QUANTILES,
+    )
+
+    # Paths: the line of every run, padded to a fixed width per artifact
+    path_segments = ordered_segments[starts]
+    path_lengths = np.bincount(path_segments, minlength=artifact_count)
+    path_offsets = np.cumsum(path_lengths) - path_lengths
+    ranks = np.arange(starts.size) - path_offsets[path_segments]
+    kept = ranks < max_path_length
+    rows = np.full((artifact_count, max_path_length + 1), -1, dtype=np.int64)
+    rows[path_segments[kept], ranks[kept]] = ordered_codes[starts][kept]
+    rows[:, -1] = path_lengths > max_path_length
+
+    unique_rows, path_counts = np.unique(
+        rows[path_lengths > 0],
+        axis=0,
+        return_counts=True,
+    )
+    most_common = np.argsort(-path_counts, kind="stable")[:top]
+
+    return {
+        "states": states,
+        "transitions": transitions,
+        "hops": {
+            "source": observed // max(state_count, 1),
+            "target": observed % max(state_count, 1),
+            "count": np.bincount(hop_groups, minlength=observed.size),
+            "lag": np.column_stack(lag_quantiles),
+            "dwell": np.column_stack(dwell_quantiles),
+        },
+        "paths": {
+            "states": unique_rows[most_common, :-1],
+            "truncated": unique_rows[most_common, -1].astype(bool),
+            "count": path_counts[most_common],
+        },
+    }
@@ -0,0 +1,240 @@
+"""
+Computes and draws the RQ1, RQ2-1 and RQ2-2 analyses.
+
+Includes:
+- rq1_statistics / plot_rq1: Share of packages updated within 3 months and 1 year,
+  and the histogram of update delays.
+- rq2_1_statistics / plot_rq2_1: Correlation between update delay and release
+  frequency, and its scatter plot.
+- rq2_2_statistics / plot_rq2_2: Median update delay per version change type, and
+  its box plot.
+
+The functions take delays in days and draw on a given matplotlib Axes, so that the
+RQ scripts and the analysis server share them.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TypedDict
+
+import numpy as np
+
+from .stats import median, summarize
+from .versions import VERSION_CHANGE_TYPES, VersionChange
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from numpy.typing import NDArray
+
+# Thresholds of RQ1 (in days)
+DAYS_THREE_MONTHS = 90
+DAYS_ONE_YEAR = 365
+
+# Axis label shared by the plots of update delays
+DELAY_LABEL = (
+    "Number of days from publication until packages using log4j 2.17.0 "
+    "have been updated"
+)
+
+# Minimum number of observations for a correlation coefficient
+MIN_CORRELATION_SIZE = 2
+
+
+class RQ1Result(TypedDict):
+    """
+    Statistics of RQ1.
+
+    Attributes:
+        count (int): Number of packages.
+        within_three_months (float): Fraction of packages updated in 3 months.
+        within_one_year (float): Fraction of packages updated in a year.
+
+    """
+
+    count: int
+    within_three_months: float
+    within_one_year: float
+
+
+class RQ21Result(TypedDict):
+    """
+    Statistics of RQ2-1.
+
+    Attributes:
+        count (int): Number of packages with both values.
+        correlation (float): Pearson correlation coefficient between update delay
+            and release frequency (NaN for fewer than two packages).
+
+    """
+
+    count: int
+    correlation: float
+
+
+class RQ22Group(TypedDict):
+    """
+    Statistics of one version change type in RQ2-2.
+
+    Attributes:
+        count (int): Number of packages.
+        median (float): Median update delay in days (NaN if there are none).
+
+    """
+
+    count: int
+    median: float
+
+
+class RQ22Result(TypedDict):
+    """
+    Statistics of RQ2-2.
+
+    Attributes:
+        count (int): Number of packages.
+        groups (dict[VersionChange, RQ22Group]): Statistics per version change type.
+
+    """
+
+    count: int
+    groups: dict[VersionChange, RQ22Group]
+
+
+def rq1_statistics(gaps: NDArray[np.float64]) -> RQ1Result:
+    """
+    Compute the statistics of RQ1.
+
+    Args:
+        gaps (NDArray[np.float64]): Update delay of each package, in days.
+
+    Returns:
+        RQ1Result: The share of packages updated within 3 months and 1 year.
+
+    """
+    summary = summarize(gaps, thresholds=(DAYS_THREE_MONTHS, DAYS_ONE_YEAR))
+    return {
+        "count": summary["count"],
+        "within_three_months": summary["fractions_below"][DAYS_THREE_MONTHS],
+        "within_one_year": summary["fractions_below"][DAYS_ONE_YEAR],
+    }
+
+
+def plot_rq1(ax: Axes, gaps: NDArray[np.float64]) -> None:
+    """
+    Draw the histogram of update delays.
+
+    Args:
+        ax (Axes): The axes to draw on.
+        gaps (NDArray[np.float64]): Update delay of each package, in days.
+
+    """
+    ax.hist(gaps, bins=100)
+    ax.set_xlabel(DELAY_LABEL)
+    ax.set_ylabel("Number of packages")
+
+
+def rq2_1_statistics(
+    gaps: NDArray[np.float64],
+    release_frequencies: NDArray[np.float64],
+) -> RQ21Result:
+    """
+    Compute the statistics of RQ2-1.
+
+    Packages for which either value is NaN (e.g., a cadence feature that is
+    undefined for the package) are left out.
+
+    Args:
+        gaps (NDArray[np.float64]): Update delay of each package, in days.
+        release_frequencies (NDArray[np.float64]): Mean time between releases of
+            each package in days, or another release cadence feature.
+
+    Returns:
+        RQ21Result: The Pearson correlation between the two.
+
+    """
+    valid = ~(np.isnan(gaps) | np.isnan(release_frequencies))
+    count = int(np.count_nonzero(valid))
+    correlation = (
+        float(np.corrcoef(gaps[valid], release_frequencies[valid])[0, 1])
+        if count >= MIN_CORRELATION_SIZE
+        else float("nan")
+    )
+    return {"count": count, "correlation": correlation}
+
+
+def plot_rq2_1(
+    ax: Axes,
+    gaps: NDArray[np.float64],
+    release_frequencies: NDArray[np.float64],
+    *,
+    ylabel: str = "Release frequency (days)",
+    ylim: tuple[float, float] = (0, 100),
+) -> None:
+    """
+    Draw the scatter plot of update delay against release frequency.
+
+    Args:
+        ax (Axes): The axes to draw on.
+        gaps (NDArray[np.float64]): Update delay of each package, in days.
+        release_frequencies (NDArray[np.float64]): Mean time between releases of
+            each package in days, or another release cadence feature.
+        ylabel (str): Label of the y axis.
+        ylim (tuple[float, float]): Range of the y axis.
+
+    """
+    ax.scatter(gaps, release_frequencies)
+    ax.set_xlabel(DELAY_LABEL)
+    ax.set_ylabel(ylabel)
+    ax.set_xlim(0, 50)
+    ax.set_ylim(*ylim)
+
+
+def rq2_2_statistics(groups: dict[VersionChange, NDArray[np.float64]]) -> RQ22Result:
+    """
+    Compute the statistics of RQ2-2.
+
+    Args:
+        groups (dict[VersionChange, NDArray[np.float64]]): Update delays in days,
+            per version change type.
+
+    Returns:
+        RQ22Result: The number of packages and median delay per type.
+
+    """
+    return {
+        "count": sum(int(groups[t].size) for t in VERSION_CHANGE_TYPES),
+        "groups": {
+            t: {"count": int(groups[t].size), "median": median(groups[t])}
+            for t in VERSION_CHANGE_TYPES
+        },
+    }
+
+
+def plot_rq2_2(
+    ax: Axes,
+    groups: dict[VersionChange, NDArray[np.float64]],
+    *,
+    outliers: bool = True,
+) -> None:
+    """
+    Draw the box plot of update delays per version change type.
+
+    Args:
+        ax (Axes): The axes to draw on.
+        groups (dict[VersionChange, NDArray[np.float64]]): Update delays in days,
+            per version change type.
+        outliers (bool): Draw outliers (default).
+
+    """
+    ax.boxplot(
+        [groups[t] for t in VERSION_CHANGE_TYPES],
+        showmeans=True,
+        sym=None if outliers else "",
+    )
+    ax.set_xticks(
+        range(1, len(VERSION_CHANGE_TYPES) + 1),
+        [t.capitalize() for t in VERSION_CHANGE_TYPES],
+    )
+    ax.set_ylabel(
+        "Number of days from publication until packages\n"
+        "using log4j 2.17.0 have been updated",
+    )
@@ -0,0 +1,195 @@
+"""
+Provides a vectorized engine for release cadence features.
+
+Includes:
+- CadenceFeatures: Per-artifact statistics of the intervals between consecutive
+  releases.
+- cadence_features: Computes every feature for all artifacts in one pass.
+- align_features: Looks up a feature for a list of artifact ids.
+
+The single `release_frequency` of 'data_updates.json' is the mean interval, which
+a long dormant period can inflate arbitrarily. The median and percentiles are
+robust to such periods, the pre-/post-split medians show whether an artifact
+changed pace around Log4Shell, and burstiness tells regular release schedules
+(-1) from random ones (0) and bursts of releases separated by long pauses (1).
+
+All intervals are in milliseconds. Features that are undefined for an artifact
+(e.g., any interval statistic for an artifact with a single release) are NaN.
+"""
+
+from typing import Literal, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...lib.columns import ReleaseColumns, segment_ids
+from .stats import grouped_quantiles
+
+type CadenceFeature = Literal[
+    "mean_interval",
+    "median_interval",
+    "p25_interval",
+    "p75_interval",
+    "p90_interval",
+    "pre_median_interval",
+    "post_median_interval",
+    "burstiness",
+]
+
+# Features in the order they are reported
+CADENCE_FEATURES: tuple[CadenceFeature, ...] = (
+    "mean_interval",
+    "median_interval",
+    "p25_interval",
+    "p75_interval",
+    "p90_interval",
+    "pre_median_interval",
+    "post_median_interval",
+    "burstiness",
+)
+
+# Probabilities of the reported interval percentiles
+P25 = 0.25
+P50 = 0.5
+P75 = 0.75
+P90 = 0.9
+
+# Minimum number of intervals for a meaningful burstiness
+MIN_BURSTINESS_INTERVALS = 2
+
+
+class CadenceFeatures(TypedDict):
+    """
+    Release cadence of every artifact.
+
+    Attributes:
+        artifact_ids (NDArray[np.str_]): Unique identifier of each artifact.
+        release_count (NDArray[np.int64]): Number of releases.
+        mean_interval (NDArray[np.float64]): Mean interval between releases.
+        median_interval (NDArray[np.float64]): Median interval.
+        p25_interval (NDArray[np.float64]): 25th percentile of the intervals.
+        p75_interval (NDArray[np.float64]): 75th percentile of the intervals.
+        p90_interval (NDArray[np.float64]): 90th percentile of the intervals.
+        pre_median_interval (NDArray[np.float64]): Median of the intervals that
+            end before the split timestamp.
+        post_median_interval (NDArray[np.float64]): Median of the intervals that
+            end at or after the split timestamp.
+        burstiness (NDArray[np.float64]): (sigma - mu) / (sigma + mu) of the intervals,
+            where mu is their mean and sigma their standard deviation.
+
+    """
+
+    artifact_ids: NDArray[np.str_]
+    release_count: NDArray[np.int64]
+    mean_interval: NDArray[np.float64]
+    median_interval: NDArray[np.float64]
+    p25_interval: NDArray[np.float64]
+    p75_interval: NDArray[np.float64]
+    p90_interval: NDArray[np.float64]
+    pre_median_interval: NDArray[np.float64]
+    post_median_interval: NDArray[np.float64]
+    burstiness: NDArray[np.float64]
+
+
+def cadence_features(columns: ReleaseColumns, split: int) -> CadenceFeatures:
+    """
+    Compute the release cadence of every artifact.
+
+    Releases are ordered by time within each artifact; an interval belongs to the
+    pre-split period if the release that ends it is earlier than `split`.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+        split (int): Timestamp separating the pre- and post-split periods.
+
+    Returns:
+        CadenceFeatures: The features of every artifact, in artifact order.
+
+    """
+    artifact_count = columns["artifact_ids"].size
+    times = columns["dependent_time"]
+    segments = segment_ids(columns["offsets"])
+
+    # Intervals between consecutive releases of the same artifact
+    order = np.lexsort((times, segments))
+    ordered_times = times[order]
+    ordered_segments = segments[order]
+    same_artifact = ordered_segments[1:] == ordered_segments[:-1]
+    intervals = np.diff(ordered_times)[same_artifact].astype(np.float64)
+    groups = ordered_segments[1:][same_artifact]
+    ends = ordered_times[1:][same_artifact]
+
+    # Mean and population standard deviation of the intervals
+    counts = np.bincount(groups, minlength=artifact_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(groups, intervals, artifact_count) / counts
+        deviations = (intervals - mean[groups]) ** 2
+        std = np.sqrt(np.bincount(groups, deviations, artifact_count) / counts)
+        burstiness = np.where(
+            counts >= MIN_BURSTINESS_INTERVALS,
+            (std - mean) / (std + mean),
+            np.nan,
+        )
+
+    p25, p50, p75, p90 = grouped_quantiles(
+        intervals,
+        groups,
+        artifact_count,
+        (P25, P50, P75, P90),
+    )
+    pre = ends < split
+    (pre_median,) = grouped_quantiles(
+        intervals[pre],
+        groups[pre],
+        artifact_count,
+        (P50,),
+    )
+    (post_median,) = grouped_quantiles(
+        intervals[~pre],
+        groups[~pre],
+        artifact_count,
+        (P50,),
+    )
+
+    return {
+        "artifact_ids": columns["artifact_ids"],
+        "release_count": np.diff(columns["offsets"]),
+        "mean_interval": mean,
+        "median_interval": p50,
+        "p25_interval": p25,
+        "p75_interval": p75,
+        "p90_interval": p90,
+        "pre_median_interval": pre_median,
+        "post_median_interval": post_median,
+        "burstiness": burstiness,
+    }
+
+
+def align_features(
+    features: CadenceFeatures,
+    feature: CadenceFeature,
+    artifact_ids: NDArray[np.str_],
+) -> NDArray[np.float64]:
+    """
+    Look up one feature for a list of artifacts.
+
+    Args:
+        features (CadenceFeatures): Features of all artifacts.
+        feature (CadenceFeature): The feature to look up.
+        artifact_ids (NDArray[np.str_]): Artifacts to look up, in any order.
+
+    Returns:
+        NDArray[np.float64]: The feature of each artifact (NaN if unknown).
+
+    """
+    known = features["artifact_ids"]
+    values = features[feature]
+    if known.size == 0:
+        return np.full(artifact_ids.size, np.nan)
+
+    order = np.argsort(known, kind="stable")
+    positions = np.searchsorted(known, artifact_ids, sorter=order).clip(
+        max=known.size - 1,
+    )
+    matches = order[positions]
+    return np.where(known[matches] == artifact_ids, values[matches], np.nan)
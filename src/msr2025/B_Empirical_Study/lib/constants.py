@@ -2,7 +2,7 @@
 Defines shared constants for the empirical study phase.
 
 Includes:
-- Time constants (e.g., one day in milliseconds)
+- Time constants (e.g., one day in milliseconds, the disclosure of Log4Shell)
 - File paths to preprocessed data for analysis
 """
 
@@ -11,5 +11,23 @@ from pathlib import Path
 # Number of milliseconds in one day
 ONE_DAY = 24 * 60 * 60 * 1000
 
+# Timestamp of the public disclosure of Log4Shell, CVE-2021-44228
+# (2021-12-10 00:00 UTC, in milliseconds)
+LOG4SHELL_TIMESTAMP = 1639094400000
+
+# Timestamp for log4j-core version 2.17.0 release (in milliseconds)
+LOG4J_TIMESTAMP_2_17_0 = 1639792690000
+
 # Path to the data file generated by the data preparation and extraction step
 SOURCE_FILE_PATH = Path("output/A_Data_Preparation_and_Extraction/data_updates.json")
+
+# Path to the sample design, present if 'data_updates.json' holds a sample
+SAMPLE_FILE_PATH = Path(
+    "output/A_Data_Preparation_and_Extraction/data_updates_sample.json",
+)
+
+# Path to the release histories exported by the data preparation step
+RELEASES_FILE_PATH = Path("output/A_Data_Preparation_and_Extraction/data_releases.json")
+
+# Path to the columnar cache of the release histories
+COLUMNS_FILE_PATH = Path("output/A_Data_Preparation_and_Extraction/data_releases.npz")
@@ -0,0 +1,135 @@
+"""
+Provides a columnar, filterable representation of the release transitions.
+
+Includes:
+- UpdateColumns: The release transitions of 'data_updates.json' as NumPy arrays,
+  with the version change type of every transition precomputed.
+- to_update_columns: Builds the columns from the loaded release transitions.
+- update_mask: Selects transitions by artifact id prefix, update date range and
+  version change type.
+- select_updates: Keeps the selected transitions.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .type import Data
+from .versions import VERSION_CHANGE_TYPES, VersionChange, version_change_codes
+
+
+class UpdateColumns(TypedDict):
+    """
+    Release transitions of all artifacts in columnar form.
+
+    Attributes:
+        artifact_ids (NDArray[np.str_]): Unique identifier of each artifact.
+        old_version (NDArray[np.str_]): Previous dependent version.
+        new_version (NDArray[np.str_]): Updated dependent version.
+        old_time (NDArray[np.int64]): Timestamp of the previous release.
+        new_time (NDArray[np.int64]): Timestamp of the new release.
+        gap (NDArray[np.int64]): Time from log4j 2.17.0 to the new release
+            (in milliseconds).
+        release_frequency (NDArray[np.float64]): Mean time between releases
+            (in milliseconds).
+        change (NDArray[np.int64]): Index into `VERSION_CHANGE_TYPES`.
+
+    """
+
+    artifact_ids: NDArray[np.str_]
+    old_version: NDArray[np.str_]
+    new_version: NDArray[np.str_]
+    old_time: NDArray[np.int64]
+    new_time: NDArray[np.int64]
+    gap: NDArray[np.int64]
+    release_frequency: NDArray[np.float64]
+    change: NDArray[np.int64]
+
+
+def to_update_columns(results: list[Data]) -> UpdateColumns:
+    """
+    Flatten release transitions into columns.
+
+    Args:
+        results (list[Data]): Release transitions of all artifacts.
+
+    Returns:
+        UpdateColumns: The release transitions in columnar form.
+
+    """
+    old_version = np.array([r.old_version for r in results], dtype=np.str_)
+    new_version = np.array([r.new_version for r in results], dtype=np.str_)
+
+    return {
+        "artifact_ids": np.array([r.artifact_id for r in results], dtype=np.str_),
+        "old_version": old_version,
+        "new_version": new_version,
+        "old_time": np.array([r.old_time for r in results], dtype=np.int64),
+        "new_time": np.array([r.new_time for r in results], dtype=np.int64),
+        "gap": np.array([r.gap for r in results], dtype=np.int64),
+        "release_frequency": np.array(
+            [r.release_frequency for r in results],
+            dtype=np.float64,
+        ),
+        "change": version_change_codes(old_version, new_version).astype(np.int64),
+    }
+
+
+def update_mask(
+    columns: UpdateColumns,
+    *,
+    prefix: str | None = None,
+    since: int | None = None,
+    until: int | None = None,
+    change: VersionChange | None = None,
+) -> NDArray[np.bool_]:
+    """
+    Select release transitions.
+
+    Args:
+        columns (UpdateColumns): Release transitions of all artifacts.
+        prefix (str | None): Keep artifacts whose id starts with this prefix
+            (e.g., a groupId).
+        since (int | None): Keep updates released at or after this timestamp.
+        until (int | None): Keep updates released before this timestamp.
+        change (VersionChange | None): Keep updates of this version change type.
+
+    Returns:
+        NDArray[np.bool_]: Whether each transition is selected.
+
+    """
+    mask = np.ones(columns["artifact_ids"].size, dtype=bool)
+    if prefix:
+        mask &= np.char.startswith(columns["artifact_ids"], prefix)
+    if since is not None:
+        mask &= columns["new_time"] >= since
+    if until is not None:
+        mask &= columns["new_time"] < until
+    if change is not None:
+        mask &= columns["change"] == VERSION_CHANGE_TYPES.index(change)
+    return mask
+
+
+def select_updates(columns: UpdateColumns, mask: NDArray[np.bool_]) -> UpdateColumns:
+    """
+    Keep a subset of the release transitions.
+
+    Args:
+        columns (UpdateColumns): Release transitions of all artifacts.
+        mask (NDArray[np.bool_]): Whether to keep each transition.
+
+    Returns:
+        UpdateColumns: The kept transitions, in order.
+
+    """
+    return {
+        "artifact_ids": columns["artifact_ids"][mask],
+        "old_version": columns["old_version"][mask],
+        "new_version": columns["new_version"][mask],
+        "old_time": columns["old_time"][mask],
+        "new_time": columns["new_time"][mask],
+        "gap": columns["gap"][mask],
+        "release_frequency": columns["release_frequency"][mask],
+        "change": columns["change"][mask],
+    }
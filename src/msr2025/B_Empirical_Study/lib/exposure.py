@@ -0,0 +1,88 @@
+"""
+Provides a sweep-line engine for ecosystem exposure timelines.
+
+Includes:
+- Timeline: A regularly sampled count of exposed artifacts.
+- exposure_timeline: Counts, for every sampling point, the artifacts whose latest
+  release so far depends on a vulnerable log4j version.
+
+Every release is turned into an event that changes its artifact's exposure state
+(+1 when the artifact becomes exposed, -1 when it stops being exposed). Sorting
+the events once and taking a cumulative sum yields the count at any time, so the
+cost is O(n log n) in the number of releases instead of days times artifacts.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...lib.columns import ReleaseColumns, segment_ids
+
+
+class Timeline(TypedDict):
+    """
+    A regularly sampled time series.
+
+    Attributes:
+        start (int): Timestamp of the first sampling point (in milliseconds).
+        step (int): Distance between sampling points (in milliseconds).
+        counts (NDArray[np.int64]): Value at the end of each sampling interval.
+
+    """
+
+    start: int
+    step: int
+    counts: NDArray[np.int64]
+
+
+def exposure_timeline(
+    columns: ReleaseColumns,
+    vulnerable: NDArray[np.bool_],
+    start: int,
+    end: int,
+    step: int,
+) -> Timeline:
+    """
+    Count exposed artifacts at regular intervals.
+
+    An artifact is exposed from a vulnerable release until its next release that
+    is not vulnerable. Artifacts count as not exposed before their first release.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+        vulnerable (NDArray[np.bool_]): Whether each release depends on a
+            vulnerable log4j version.
+        start (int): Timestamp of the first interval (in milliseconds).
+        end (int): Timestamp up to which intervals are generated (in milliseconds).
+        step (int): Length of each interval (in milliseconds).
+
+    Returns:
+        Timeline: For every interval, the number of artifacts exposed at its end.
+
+    """
+    times = columns["dependent_time"]
+    segments = segment_ids(columns["offsets"])
+
+    # Order each artifact's releases by time, keeping the export order for ties
+    order = np.lexsort((np.arange(times.size), times, segments))
+    ordered_times = times[order]
+    ordered_segments = segments[order]
+    state = vulnerable[order].astype(np.int64)
+
+    # A release changes its artifact's state relative to the previous release
+    previous_state = np.zeros_like(state)
+    same_artifact = ordered_segments[1:] == ordered_segments[:-1]
+    previous_state[1:] = np.where(same_artifact, state[:-1], 0)
+    deltas = state - previous_state
+
+    # Sweep over all events in time order
+    sweep = np.argsort(ordered_times, kind="stable")
+    event_times = ordered_times[sweep]
+    running = np.concatenate([[0], np.cumsum(deltas[sweep])])
+
+    # Count at the end of each interval = events strictly before its end
+    interval_ends = np.arange(start, end + step, step, dtype=np.int64) + step
+    counts = running[np.searchsorted(event_times, interval_ends, side="left")]
+
+    return {"start": start, "step": step, "counts": counts}
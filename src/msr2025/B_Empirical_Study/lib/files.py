@@ -3,6 +3,9 @@ Provides file-related utilities for the empirical study phase.
 
 Includes:
 - Loading preprocessed JSON data from the preparation step.
+- Loading the release histories from the preparation step in columnar form,
+  through a '.npz' cache that is rebuilt whenever the histories are newer.
+- Loading the design of a sampled extraction, if any.
 - Saving matplotlib plots with consistent formatting.
 """
 
@@ -11,8 +14,21 @@ from typing import cast
 
 from matplotlib import pyplot as plt
 
-from ...lib import load_json
-from .constants import SOURCE_FILE_PATH
+from ...lib.columns import (
+    ReleaseColumns,
+    read_release_columns,
+    save_release_columns,
+    to_release_columns,
+)
+from ...lib.files import load_json
+from ...lib.records import load_release_histories, load_updates
+from ...lib.sampling import SampleDesign
+from .constants import (
+    COLUMNS_FILE_PATH,
+    RELEASES_FILE_PATH,
+    SAMPLE_FILE_PATH,
+    SOURCE_FILE_PATH,
+)
 from .type import Data
 
 
@@ -31,7 +47,7 @@ def load_source_file() -> list[Data]:
 
     """
     try:
-        return cast("list[Data]", load_json(SOURCE_FILE_PATH))
+        return load_updates(SOURCE_FILE_PATH)
     except FileNotFoundError as err:
         error_message = (
             f"File '{SOURCE_FILE_PATH}' not found.\n"
@@ -40,6 +56,53 @@ def load_source_file() -> list[Data]:
         raise FileNotFoundError(error_message) from err
 
 
+def load_release_columns() -> ReleaseColumns:
+    """
+    Load the release histories exported by the data preparation step.
+
+    The columns are read from 'data_releases.npz' unless 'data_releases.json' is
+    newer, in which case they are rebuilt from it and cached again.
+
+    Returns:
+        ReleaseColumns: The release histories of all artifacts in columnar form.
+
+    Raises:
+        FileNotFoundError: If the expected file is not found.
+
+    """
+    if COLUMNS_FILE_PATH.exists() and (
+        not RELEASES_FILE_PATH.exists()
+        or COLUMNS_FILE_PATH.stat().st_mtime_ns >= RELEASES_FILE_PATH.stat().st_mtime_ns
+    ):
+        return read_release_columns(COLUMNS_FILE_PATH)
+
+    try:
+        columns = to_release_columns(load_release_histories(RELEASES_FILE_PATH))
+    except FileNotFoundError as err:
+        error_message = (
+            f"File '{RELEASES_FILE_PATH}' not found.\n"
+            "You must run 'uv run data_preparation' first."
+        )
+        raise FileNotFoundError(error_message) from err
+
+    save_release_columns(columns, COLUMNS_FILE_PATH)
+    return columns
+
+
+def load_sample_design() -> SampleDesign | None:
+    """
+    Load the design of the sample extracted by `data_extraction --sample`.
+
+    Returns:
+        SampleDesign | None: The design, or None if 'data_updates.json' holds all
+        packages.
+
+    """
+    if not SAMPLE_FILE_PATH.exists():
+        return None
+    return cast("SampleDesign", load_json(SAMPLE_FILE_PATH))
+
+
 def save_plot(
     filename: str,
     output_dir: Path = Path("output/B_Empirical_Study"),
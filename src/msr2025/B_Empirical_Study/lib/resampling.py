@@ -0,0 +1,602 @@
+"""
+Provides bootstrap confidence intervals and permutation tests for the empirical study.
+
+Includes:
+- Batched Pearson, Spearman and Kendall (tau-b) correlations over the rows of a
+  2-D array, so that a whole batch of resamples is evaluated in one NumPy call.
+- Bootstrap confidence intervals and permutation p-values for correlations and
+  for medians.
+
+Resamples are drawn in batches. Each batch gets its own child of one
+`numpy.random.SeedSequence`, so results are reproducible for a given seed no matter
+how many worker processes the batches are spread across.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Literal, TypedDict
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+type CorrelationMethod = Literal["pearson", "spearman", "kendall"]
+
+# Correlation methods in the order they are reported
+CORRELATION_METHODS: tuple[CorrelationMethod, ...] = ("pearson", "spearman", "kendall")
+
+# Upper bound on the number of values held by one batch of resamples
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+class Interval(TypedDict):
+    """
+    A point estimate with a bootstrap percentile confidence interval.
+
+    Attributes:
+        estimate (float): The statistic on the original sample.
+        low (float): Lower bound of the confidence interval.
+        high (float): Upper bound of the confidence interval.
+        confidence (float): Confidence level of the interval (e.g., 0.95).
+        resamples (int): Number of bootstrap resamples.
+
+    """
+
+    estimate: float
+    low: float
+    high: float
+    confidence: float
+    resamples: int
+
+
+class PermutationResult(TypedDict):
+    """
+    The outcome of a two-sided permutation test.
+
+    Attributes:
+        statistic (float): The test statistic on the original sample.
+        p_value (float): Two-sided permutation p-value (NaN if the statistic is
+            undefined).
+        permutations (int): Number of random permutations.
+
+    """
+
+    statistic: float
+    p_value: float
+    permutations: int
+
+
+def _dense_ranks(values: NDArray[np.float64]) -> NDArray[np.int64]:
+    """
+    Rank each row of a 2-D array, giving tied values the same rank.
+
+    Args:
+        values (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.int64]: Ranks starting at 0, without gaps after ties.
+
+    """
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+    starts = np.ones(ordered.shape, dtype=np.int64)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ranks = np.empty(values.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.cumsum(starts, axis=1) - 1, axis=1)
+    return ranks
+
+
+def _average_ranks(values: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Rank each row of a 2-D array, giving tied values their average rank.
+
+    Args:
+        values (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.float64]: Ranks starting at 1, as used by Spearman's rho.
+
+    """
+    batch, n = values.shape
+    dense = _dense_ranks(values)
+    # Number the tie groups of all rows consecutively to aggregate them at once
+    groups = (dense + np.arange(batch)[:, None] * n).ravel()
+    positions = np.argsort(np.argsort(values, axis=1, kind="stable"), axis=1) + 1
+    sums = np.bincount(groups, weights=positions.ravel(), minlength=batch * n)
+    counts = np.bincount(groups, minlength=batch * n)
+    ranks: NDArray[np.float64] = (sums[groups] / counts[groups]).reshape(batch, n)
+    return ranks
+
+
+def _tied_pairs(keys: NDArray[np.int64]) -> NDArray[np.int64]:
+    """
+    Count the pairs of equal values in each row of a 2-D array.
+
+    Args:
+        keys (NDArray[np.int64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.int64]: Number of tied pairs in each row.
+
+    """
+    ordered = np.sort(keys, axis=1)
+    positions = np.broadcast_to(np.arange(ordered.shape[1]), ordered.shape)
+    starts = np.zeros(ordered.shape, dtype=bool)
+    starts[:, 0] = True
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    # Each element is tied with every earlier element of its run
+    run_starts = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    return (positions - run_starts).sum(axis=1)  # type: ignore[no-any-return]
+
+
+def _count_inversions(values: NDArray[np.int64]) -> NDArray[np.int64]:
+    """
+    Count the pairs i < j with values[i] > values[j] in each row of a 2-D array.
+
+    A bottom-up merge sort over all rows at once: at every level, each element of
+    an odd block is located in the sorted even block before it by a single
+    `searchsorted` over globally ordered keys.
+
+    Args:
+        values (NDArray[np.int64]): Non-negative integers smaller than n,
+            in an array of shape (batch, n).
+
+    Returns:
+        NDArray[np.int64]: Number of inversions in each row.
+
+    """
+    batch, n = values.shape
+    rows = np.arange(batch, dtype=np.int64)[:, None]
+    positions = np.arange(n, dtype=np.int64)[None, :]
+    row_ids = np.broadcast_to(rows, (batch, n)).ravel()
+    inversions = np.zeros(batch, dtype=np.int64)
+
+    width = 1
+    while width < n:
+        blocks = positions // width
+        block_count = -(-n // width)
+        # Keys are globally sorted because every block is sorted within itself
+        keys = ((rows * block_count + blocks) * n + values).ravel()
+
+        right = np.broadcast_to(blocks % 2 == 1, (batch, n)).ravel()
+        left_starts = np.broadcast_to(rows * n + (blocks - 1) * width, (batch, n))
+        found = np.searchsorted(keys, keys[right] - n, side="right")
+        greater = width - (found - left_starts.ravel()[right])
+        inversions += np.bincount(
+            row_ids[right],
+            weights=greater,
+            minlength=batch,
+        ).astype(np.int64)
+
+        # Merge pairs of blocks by sorting on the keys of the next level
+        next_block_count = -(-n // (2 * width))
+        merged = (rows * next_block_count + positions // (2 * width)) * n + values
+        values = (np.sort(merged.ravel()) % n).reshape(batch, n)
+        width *= 2
+
+    return inversions
+
+
+def pearson(x: NDArray[np.float64], y: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Compute the Pearson correlation of each pair of rows.
+
+    Args:
+        x (NDArray[np.float64]): Array of shape (batch, n).
+        y (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.float64]: Correlation per row; NaN for constant rows.
+
+    """
+    dx = x - x.mean(axis=1, keepdims=True)
+    dy = y - y.mean(axis=1, keepdims=True)
+    numerator = (dx * dy).sum(axis=1)
+    denominator = np.sqrt((dx * dx).sum(axis=1) * (dy * dy).sum(axis=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return numerator / denominator  # type: ignore[no-any-return]
+
+
+def spearman(x: NDArray[np.float64], y: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Compute the Spearman rank correlation of each pair of rows.
+
+    Args:
+        x (NDArray[np.float64]): Array of shape (batch, n).
+        y (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.float64]: Correlation per row; NaN for constant rows.
+
+    """
+    return pearson(_average_ranks(x), _average_ranks(y))
+
+
+def kendall(x: NDArray[np.float64], y: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Compute Kendall's tau-b of each pair of rows in O(n log n) per row.
+
+    Args:
+        x (NDArray[np.float64]): Array of shape (batch, n).
+        y (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.float64]: Correlation per row; NaN for constant rows.
+
+    """
+    n = x.shape[1]
+    x_ranks = _dense_ranks(x)
+    y_ranks = _dense_ranks(y)
+    joint = x_ranks * n + y_ranks
+
+    # Discordant pairs are the inversions of y once pairs are ordered by (x, y)
+    order = np.argsort(joint, axis=1, kind="stable")
+    discordant = _count_inversions(np.take_along_axis(y_ranks, order, axis=1))
+
+    total = n * (n - 1) // 2
+    x_ties = _tied_pairs(x_ranks)
+    y_ties = _tied_pairs(y_ranks)
+    joint_ties = _tied_pairs(joint)
+    numerator = total - x_ties - y_ties + joint_ties - 2 * discordant
+    denominator = np.sqrt((total - x_ties).astype(np.float64) * (total - y_ties))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return numerator / denominator  # type: ignore[no-any-return]
+
+
+CORRELATIONS: dict[
+    CorrelationMethod,
+    Callable[[NDArray[np.float64], NDArray[np.float64]], NDArray[np.float64]],
+] = {
+    "pearson": pearson,
+    "spearman": spearman,
+    "kendall": kendall,
+}
+
+
+def _upper_medians(samples: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Compute the median of each row, taking the upper middle element for even sizes.
+
+    Args:
+        samples (NDArray[np.float64]): Array of shape (batch, n).
+
+    Returns:
+        NDArray[np.float64]: Median per row, consistent with `stats.median`
+        (NaN if the rows are empty).
+
+    """
+    if samples.shape[1] == 0:
+        return np.full(samples.shape[0], np.nan)
+    middle = samples.shape[1] // 2
+    return np.partition(samples, middle, axis=1)[:, middle]
+
+
+def _bootstrap_correlation_batch(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    method: CorrelationMethod,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> NDArray[np.float64]:
+    """Evaluate one batch of bootstrap resamples of a correlation."""
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, x.size, size=(size, x.size))
+    return CORRELATIONS[method](x[indices], y[indices])
+
+
+def _permutation_correlation_batch(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    method: CorrelationMethod,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> NDArray[np.float64]:
+    """Evaluate one batch of random permutations of a correlation."""
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.broadcast_to(y, (size, y.size)), axis=1)
+    return CORRELATIONS[method](np.broadcast_to(x, (size, x.size)), shuffled)
+
+
+def _bootstrap_median_batch(
+    values: NDArray[np.float64],
+    size: int,
+    seed: np.random.SeedSequence,
+) -> NDArray[np.float64]:
+    """Evaluate one batch of bootstrap resamples of a median."""
+    if values.size == 0:
+        return np.full(size, np.nan)
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, values.size, size=(size, values.size))
+    return _upper_medians(values[indices])
+
+
+def _permutation_median_batch(
+    a: NDArray[np.float64],
+    b: NDArray[np.float64],
+    size: int,
+    seed: np.random.SeedSequence,
+) -> NDArray[np.float64]:
+    """Evaluate one batch of random relabelings of a difference in medians."""
+    rng = np.random.default_rng(seed)
+    pooled = np.concatenate([a, b])
+    shuffled = rng.permuted(np.broadcast_to(pooled, (size, pooled.size)), axis=1)
+    return _upper_medians(shuffled[:, : a.size]) - _upper_medians(shuffled[:, a.size :])
+
+
+def _resample(
+    batch_function: Callable[[int, np.random.SeedSequence], NDArray[np.float64]],
+    total: int,
+    sample_size: int,
+    seed: int,
+    workers: int | None,
+) -> NDArray[np.float64]:
+    """
+    Evaluate a batch function until `total` resamples have been drawn.
+
+    Args:
+        batch_function (Callable): Picklable function of (batch size, seed sequence)
+            returning one statistic per resample.
+        total (int): Number of resamples to draw.
+        sample_size (int): Number of observations per resample.
+        seed (int): Root seed; each batch gets its own spawned child.
+        workers (int | None): Number of worker processes. `1` runs in-process;
+            `None` uses every available CPU.
+
+    Returns:
+        NDArray[np.float64]: The statistic of every resample, in batch order.
+
+    """
+    batch_size = max(1, min(total, MAX_BATCH_ELEMENTS // max(1, sample_size)))
+    sizes = [batch_size] * (total // batch_size)
+    if total % batch_size:
+        sizes.append(total % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers == 1:
+        results = [batch_function(s, q) for s, q in zip(sizes, seeds, strict=True)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(batch_function, sizes, seeds))
+
+    return np.concatenate(results)
+
+
+def _interval(
+    estimate: float,
+    statistics: NDArray[np.float64],
+    confidence: float,
+) -> Interval:
+    """
+    Build a percentile confidence interval from bootstrap statistics.
+
+    Args:
+        estimate (float): The statistic on the original sample.
+        statistics (NDArray[np.float64]): The statistic on every resample.
+        confidence (float): Confidence level in the range (0, 1).
+
+    Returns:
+        Interval: The estimate with its confidence interval.
+
+    Raises:
+        ValueError: If the confidence level is not in the range (0, 1).
+
+    """
+    if not 0 < confidence < 1:
+        error_message = "Confidence level must be in the range (0, 1)."
+        raise ValueError(error_message)
+
+    alpha = 1 - confidence
+    # Degenerate resamples (e.g., constant ones) have no correlation
+    low, high = np.nanquantile(statistics, [alpha / 2, 1 - alpha / 2])
+    return {
+        "estimate": estimate,
+        "low": float(low),
+        "high": float(high),
+        "confidence": confidence,
+        "resamples": int(statistics.size),
+    }
+
+
+def _p_value(statistic: float, statistics: NDArray[np.float64]) -> float:
+    """
+    Compute a two-sided permutation p-value.
+
+    Permutations with an undefined (NaN) statistic are left out.
+
+    Args:
+        statistic (float): The statistic on the original sample.
+        statistics (NDArray[np.float64]): The statistic on every permutation.
+
+    Returns:
+        float: The p-value, including the original sample as one permutation,
+        or NaN if the statistic is undefined (e.g., for a constant sample).
+
+    """
+    if np.isnan(statistic):
+        return np.nan
+    defined = statistics[~np.isnan(statistics)]
+    extreme = np.count_nonzero(np.abs(defined) >= abs(statistic))
+    return float((extreme + 1) / (defined.size + 1))
+
+
+def correlation(x: ArrayLike, y: ArrayLike, method: CorrelationMethod) -> float:
+    """
+    Compute a correlation coefficient of two samples.
+
+    Args:
+        x (ArrayLike): First sample.
+        y (ArrayLike): Second sample of the same length.
+        method (CorrelationMethod): 'pearson', 'spearman' or 'kendall'.
+
+    Returns:
+        float: The correlation coefficient.
+
+    """
+    xs = np.asarray(x, dtype=np.float64)[None, :]
+    ys = np.asarray(y, dtype=np.float64)[None, :]
+    return float(CORRELATIONS[method](xs, ys)[0])
+
+
+def bootstrap_correlation(  # noqa: PLR0913
+    x: ArrayLike,
+    y: ArrayLike,
+    method: CorrelationMethod = "pearson",
+    resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    workers: int | None = None,
+) -> Interval:
+    """
+    Compute a bootstrap confidence interval of a correlation coefficient.
+
+    Args:
+        x (ArrayLike): First sample.
+        y (ArrayLike): Second sample of the same length.
+        method (CorrelationMethod): 'pearson', 'spearman' or 'kendall'.
+        resamples (int): Number of bootstrap resamples (default: 10,000).
+        confidence (float): Confidence level (default: 0.95).
+        seed (int): Root seed of the resampling (default: 0).
+        workers (int | None): Number of worker processes (default: all CPUs).
+
+    Returns:
+        Interval: The correlation with its confidence interval.
+
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    statistics = _resample(
+        partial(_bootstrap_correlation_batch, xs, ys, method),
+        resamples,
+        xs.size,
+        seed,
+        workers,
+    )
+    return _interval(correlation(xs, ys, method), statistics, confidence)
+
+
+def permutation_test_correlation(  # noqa: PLR0913
+    x: ArrayLike,
+    y: ArrayLike,
+    method: CorrelationMethod = "pearson",
+    permutations: int = 10_000,
+    seed: int = 0,
+    workers: int | None = None,
+) -> PermutationResult:
+    """
+    Test whether two samples are correlated by randomly permuting one of them.
+
+    Args:
+        x (ArrayLike): First sample.
+        y (ArrayLike): Second sample of the same length.
+        method (CorrelationMethod): 'pearson', 'spearman' or 'kendall'.
+        permutations (int): Number of random permutations (default: 10,000).
+        seed (int): Root seed of the permutations (default: 0).
+        workers (int | None): Number of worker processes (default: all CPUs).
+
+    Returns:
+        PermutationResult: The correlation with its two-sided p-value.
+
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    statistics = _resample(
+        partial(_permutation_correlation_batch, xs, ys, method),
+        permutations,
+        xs.size,
+        seed,
+        workers,
+    )
+    statistic = correlation(xs, ys, method)
+    return {
+        "statistic": statistic,
+        "p_value": _p_value(statistic, statistics),
+        "permutations": permutations,
+    }
+
+
+def bootstrap_median(
+    values: ArrayLike,
+    resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    workers: int | None = None,
+) -> Interval:
+    """
+    Compute a bootstrap confidence interval of a median.
+
+    Args:
+        values (ArrayLike): The sample.
+        resamples (int): Number of bootstrap resamples (default: 10,000).
+        confidence (float): Confidence level (default: 0.95).
+        seed (int): Root seed of the resampling (default: 0).
+        workers (int | None): Number of worker processes (default: all CPUs).
+
+    Returns:
+        Interval: The median with its confidence interval (NaN if the sample is
+        empty).
+
+    """
+    data = np.asarray(values, dtype=np.float64)
+    if data.size == 0:
+        nan = float("nan")
+        return {
+            "estimate": nan,
+            "low": nan,
+            "high": nan,
+            "confidence": confidence,
+            "resamples": resamples,
+        }
+
+    statistics = _resample(
+        partial(_bootstrap_median_batch, data),
+        resamples,
+        data.size,
+        seed,
+        workers,
+    )
+    return _interval(float(_upper_medians(data[None, :])[0]), statistics, confidence)
+
+
+def permutation_test_median_difference(
+    a: ArrayLike,
+    b: ArrayLike,
+    permutations: int = 10_000,
+    seed: int = 0,
+    workers: int | None = None,
+) -> PermutationResult:
+    """
+    Test whether two samples have different medians by randomly relabeling them.
+
+    Args:
+        a (ArrayLike): First sample.
+        b (ArrayLike): Second sample.
+        permutations (int): Number of random relabelings (default: 10,000).
+        seed (int): Root seed of the permutations (default: 0).
+        workers (int | None): Number of worker processes (default: all CPUs).
+
+    Returns:
+        PermutationResult: The difference in medians (a - b) with its two-sided p-value
+        (NaN if either sample is empty).
+
+    """
+    first = np.asarray(a, dtype=np.float64)
+    second = np.asarray(b, dtype=np.float64)
+    if first.size == 0 or second.size == 0:
+        nan = float("nan")
+        return {"statistic": nan, "p_value": nan, "permutations": permutations}
+
+    statistics = _resample(
+        partial(_permutation_median_batch, first, second),
+        permutations,
+        first.size + second.size,
+        seed,
+        workers,
+    )
+    statistic = float(
+        _upper_medians(first[None, :])[0] - _upper_medians(second[None, :])[0],
+    )
+    return {
+        "statistic": statistic,
+        "p_value": _p_value(statistic, statistics),
+        "permutations": permutations,
+    }
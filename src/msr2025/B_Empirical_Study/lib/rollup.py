@@ -0,0 +1,158 @@
+"""
+Rolls release transitions up from artifacts to organizations.
+
+Includes:
+- group_ids: The Maven groupId of every artifact id, which identifies its
+  organization.
+- intern: Replaces strings with dense integer codes.
+- OrganizationRollup / rollup_organizations: Per-organization update latency: the
+  transitions of the first, the median and the last module that updated.
+- select_granularity: Keeps all transitions (artifact granularity) or one
+  representative transition per organization.
+
+Organizations often release dozens of modules in lockstep, and each module counts
+as a package at artifact granularity. At organization granularity every
+organization counts once, represented by one of its modules. The rollup interns
+the groupIds and sorts the transitions once by (organization, delay), so that the
+first, median and last module of every organization are read at fixed offsets of
+its run in the sorted order.
+"""
+
+from typing import Literal, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .type import Data
+
+type Granularity = Literal["artifact", "organization"]
+
+type RollupPosition = Literal["first", "median", "last"]
+
+# Units the RQ statistics count, the first being the default
+GRANULARITIES: tuple[Granularity, ...] = ("artifact", "organization")
+
+# Modules that can represent an organization, by the rank of their delay
+ROLLUP_POSITIONS: tuple[RollupPosition, ...] = ("first", "median", "last")
+
+# Module representing an organization by default
+DEFAULT_ROLLUP_POSITION: RollupPosition = "median"
+
+
+class OrganizationRollup(TypedDict):
+    """
+    Update latency of every organization.
+
+    Attributes:
+        group_ids (NDArray[np.str_]): groupId of each organization, sorted.
+        modules (NDArray[np.int64]): Number of updated modules of each
+            organization.
+        first (NDArray[np.intp]): Index of the transition of the module that
+            updated first.
+        median (NDArray[np.intp]): Index of the transition with the median delay
+            (upper middle element for an even number of modules).
+        last (NDArray[np.intp]): Index of the transition of the module that
+            updated last.
+
+    """
+
+    group_ids: NDArray[np.str_]
+    modules: NDArray[np.int64]
+    first: NDArray[np.intp]
+    median: NDArray[np.intp]
+    last: NDArray[np.intp]
+
+
+def group_ids(artifact_ids: NDArray[np.str_]) -> NDArray[np.str_]:
+    """
+    Derive the groupId of every artifact.
+
+    Args:
+        artifact_ids (NDArray[np.str_]): Artifact ids ('groupId:artifactId').
+
+    Returns:
+        NDArray[np.str_]: The groupId of each artifact.
+
+    """
+    # np.char.partition fails on empty arrays
+    if artifact_ids.size == 0:
+        return np.zeros(0, dtype=np.str_)
+    return np.char.partition(artifact_ids, ":")[:, 0]
+
+
+def intern(values: NDArray[np.str_]) -> tuple[NDArray[np.str_], NDArray[np.int64]]:
+    """
+    Replace strings with dense integer codes.
+
+    Args:
+        values (NDArray[np.str_]): The strings.
+
+    Returns:
+        tuple[NDArray[np.str_], NDArray[np.int64]]: The distinct strings, sorted,
+        and the index of each string among them.
+
+    """
+    uniques, codes = np.unique(values, return_inverse=True)
+    return uniques, codes.astype(np.int64)
+
+
+def rollup_organizations(
+    artifact_ids: NDArray[np.str_],
+    gaps: NDArray[np.float64],
+) -> OrganizationRollup:
+    """
+    Find the first, median and last module of every organization to update.
+
+    Modules with the same delay keep their input order.
+
+    Args:
+        artifact_ids (NDArray[np.str_]): Artifact id of each transition.
+        gaps (NDArray[np.float64]): Update delay of each transition.
+
+    Returns:
+        OrganizationRollup: The organizations and their representative
+        transitions.
+
+    """
+    organizations, codes = intern(group_ids(artifact_ids))
+    modules = np.bincount(codes, minlength=organizations.size).astype(np.int64)
+    starts = np.cumsum(modules) - modules
+
+    # Transitions ordered by organization, then by delay
+    order = np.lexsort((gaps, codes))
+    return {
+        "group_ids": organizations,
+        "modules": modules,
+        "first": order[starts],
+        "median": order[starts + modules // 2],
+        "last": order[starts + modules - 1],
+    }
+
+
+def select_granularity(
+    results: list[Data],
+    granularity: Granularity,
+    position: RollupPosition = DEFAULT_ROLLUP_POSITION,
+) -> list[Data]:
+    """
+    Keep the release transitions counted at a granularity.
+
+    Args:
+        results (list[Data]): Release transitions of all artifacts.
+        granularity (Granularity): 'artifact' to keep every transition, or
+            'organization' to keep one per organization.
+        position (RollupPosition): Module representing each organization.
+
+    Returns:
+        list[Data]: The kept transitions (ordered by groupId at organization
+        granularity).
+
+    """
+    if granularity == "artifact":
+        return results
+
+    rollup = rollup_organizations(
+        np.array([r.artifact_id for r in results], dtype=np.str_),
+        np.array([r.gap for r in results], dtype=np.float64),
+    )
+    return [results[i] for i in rollup[position].tolist()]
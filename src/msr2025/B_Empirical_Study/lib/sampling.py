@@ -0,0 +1,255 @@
+"""
+Estimates population statistics from a stratified sample of artifacts.
+
+Includes:
+- SampleStrata: The stratum of each sampled package, with the population and
+  sample size of every stratum, as NumPy arrays.
+- sample_strata: Builds them from the sample design saved by `data_extraction`.
+- SampleEstimate: A weighted estimate with its standard error and confidence
+  interval.
+- stratified_proportion: Share of packages with a property (e.g., updated within
+  3 months), with the standard error of a stratified ratio estimator.
+- stratified_quantile: A quantile (e.g., the median delay) with a Woodruff
+  confidence interval.
+
+Packages are the sampled artifacts that have a release transition, a subset of
+unknown size of each stratum's sample. Every package is weighted by N_h / n_h,
+the inverse of its stratum's sampling fraction, and variances are linearized
+(Taylor) and include the finite population correction 1 - n_h / N_h.
+"""
+
+from statistics import NormalDist
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ...lib.sampling import SampleDesign
+
+# Confidence level of the reported intervals
+CONFIDENCE = 0.95
+
+
+class SampleStrata(TypedDict):
+    """
+    Strata of the sampled packages.
+
+    Attributes:
+        codes (NDArray[np.int64]): Stratum of each package.
+        population (NDArray[np.int64]): Number of artifacts of each stratum.
+        sample (NDArray[np.int64]): Number of sampled artifacts of each stratum.
+
+    """
+
+    codes: NDArray[np.int64]
+    population: NDArray[np.int64]
+    sample: NDArray[np.int64]
+
+
+class SampleEstimate(TypedDict):
+    """
+    An estimate of a population statistic from a stratified sample.
+
+    Attributes:
+        estimate (float): The weighted estimate.
+        standard_error (float): Its estimated standard error.
+        low (float): Lower bound of the confidence interval.
+        high (float): Upper bound of the confidence interval.
+        confidence (float): Confidence level of the interval (e.g., 0.95).
+
+    """
+
+    estimate: float
+    standard_error: float
+    low: float
+    high: float
+    confidence: float
+
+
+def sample_strata(design: SampleDesign, artifact_ids: list[str]) -> SampleStrata:
+    """
+    Look up the strata of the sampled packages.
+
+    Args:
+        design (SampleDesign): Design of the sample.
+        artifact_ids (list[str]): Artifact id of each package.
+
+    Returns:
+        SampleStrata: The stratum of each package and the size of every stratum.
+
+    Raises:
+        ValueError: If a package is not part of the sample.
+
+    """
+    names = list(design["strata"])
+    index = {name: i for i, name in enumerate(names)}
+    members = design["members"]
+
+    missing = [a for a in artifact_ids if a not in members]
+    if missing:
+        error_message = (
+            f"{len(missing)} packages are not part of the sample "
+            f"(e.g., '{missing[0]}'). Rerun 'uv run data_extraction'."
+        )
+        raise ValueError(error_message)
+
+    return {
+        "codes": np.array([index[members[a]] for a in artifact_ids], dtype=np.int64),
+        "population": np.array(
+            [design["strata"][name]["population"] for name in names],
+            dtype=np.int64,
+        ),
+        "sample": np.array(
+            [design["strata"][name]["sample"] for name in names],
+            dtype=np.int64,
+        ),
+    }
+
+
+def _weights(strata: SampleStrata) -> NDArray[np.float64]:
+    """Weight each package by the inverse sampling fraction of its stratum."""
+    return (strata["population"] / strata["sample"])[strata["codes"]]
+
+
+def _total_variance(values: NDArray[np.float64], strata: SampleStrata) -> float:
+    """
+    Estimate the variance of an estimated population total.
+
+    Args:
+        values (NDArray[np.float64]): Value of each package; the other sampled
+            artifacts of its stratum count as 0.
+        strata (SampleStrata): Strata of the packages.
+
+    Returns:
+        float: Sum over strata of N_h^2 (1 - n_h / N_h) s_h^2 / n_h.
+
+    """
+    population = strata["population"].astype(np.float64)
+    sample = strata["sample"].astype(np.float64)
+    count = population.size
+    sums = np.bincount(strata["codes"], values, count)
+    squares = np.bincount(strata["codes"], values**2, count)
+
+    # Strata with a single sampled artifact have no estimable variance
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variances = (squares - sums**2 / sample) / (sample - 1)
+        terms = population**2 * (1 - sample / population) * variances / sample
+    return float(np.nansum(np.where(sample > 1, terms, 0.0)))
+
+
+def _z(confidence: float) -> float:
+    """Two-sided critical value of the standard normal distribution."""
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def stratified_proportion(
+    values: NDArray[np.bool_],
+    strata: SampleStrata,
+    confidence: float = CONFIDENCE,
+) -> SampleEstimate:
+    """
+    Estimate the share of all packages that have a property.
+
+    Args:
+        values (NDArray[np.bool_]): Whether each sampled package has the property.
+        strata (SampleStrata): Strata of the packages.
+        confidence (float): Confidence level of the interval.
+
+    Returns:
+        SampleEstimate: The ratio estimate and a normal confidence interval,
+        clipped to [0, 1] (NaN if there are no packages).
+
+    """
+    weights = _weights(strata)
+    total = float(weights.sum())
+    if total == 0:
+        nan = float("nan")
+        return {
+            "estimate": nan,
+            "standard_error": nan,
+            "low": nan,
+            "high": nan,
+            "confidence": confidence,
+        }
+
+    estimate = float(weights @ values) / total
+    residuals = values.astype(np.float64) - estimate
+    standard_error = float(np.sqrt(_total_variance(residuals, strata))) / total
+    margin = _z(confidence) * standard_error
+    return {
+        "estimate": estimate,
+        "standard_error": standard_error,
+        "low": max(estimate - margin, 0.0),
+        "high": min(estimate + margin, 1.0),
+        "confidence": confidence,
+    }
+
+
+def _weighted_quantile(
+    ordered: NDArray[np.float64],
+    cumulative: NDArray[np.float64],
+    probability: float,
+) -> float:
+    """
+    Find the smallest value whose cumulative weight share exceeds a probability.
+
+    For equal weights and a probability of 0.5, this is the upper middle element
+    for even-sized samples, like `median`.
+    """
+    position = np.searchsorted(cumulative, probability, side="right")
+    return float(ordered[min(int(position), ordered.size - 1)])
+
+
+def stratified_quantile(
+    values: NDArray[np.float64],
+    strata: SampleStrata,
+    probability: float,
+    confidence: float = CONFIDENCE,
+) -> SampleEstimate:
+    """
+    Estimate a quantile of a value over all packages.
+
+    The interval is Woodruff's: the confidence interval of the estimated share of
+    packages at or below the quantile, mapped back through the weighted
+    distribution function. The standard error is derived from its width.
+
+    Args:
+        values (NDArray[np.float64]): Value of each sampled package.
+        strata (SampleStrata): Strata of the packages.
+        probability (float): Probability of the quantile (0.5 for the median).
+        confidence (float): Confidence level of the interval.
+
+    Returns:
+        SampleEstimate: The weighted quantile and its Woodruff interval (NaN if
+        there are no packages).
+
+    """
+    if values.size == 0:
+        nan = float("nan")
+        return {
+            "estimate": nan,
+            "standard_error": nan,
+            "low": nan,
+            "high": nan,
+            "confidence": confidence,
+        }
+
+    weights = _weights(strata)
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    cumulative = np.cumsum(weights[order]) / weights.sum()
+    estimate = _weighted_quantile(ordered, cumulative, probability)
+
+    # Standard error of the estimated share of packages at or below the quantile
+    share = stratified_proportion(values <= estimate, strata, confidence)
+    z = _z(confidence)
+    margin = z * share["standard_error"]
+    low = _weighted_quantile(ordered, cumulative, max(probability - margin, 0.0))
+    high = _weighted_quantile(ordered, cumulative, min(probability + margin, 1.0))
+    return {
+        "estimate": estimate,
+        "standard_error": (high - low) / (2 * z),
+        "low": low,
+        "high": high,
+        "confidence": confidence,
+    }
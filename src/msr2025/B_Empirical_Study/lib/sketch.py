@@ -0,0 +1,286 @@
+"""
+Provides a mergeable quantile sketch for samples that do not fit in memory.
+
+Includes:
+- QuantileSketch: A KLL sketch (Karnin, Lang and Liberty, 2016) that summarizes a
+  stream of observations in bounded memory and can be merged with sketches built
+  over other partitions of the same data.
+
+The sketch keeps the exact count, sum, minimum and maximum, so means are exact;
+quantiles and threshold fractions carry a rank error of roughly `1.7 / k`.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from .stats import Summary
+
+# Ratio between the capacities of two adjacent levels
+CAPACITY_DECAY = 2 / 3
+
+# Smallest capacity of any level
+MIN_CAPACITY = 2
+
+
+class QuantileSketch:
+    """
+    A mergeable KLL quantile sketch.
+
+    Observations are added to level 0. When a level exceeds its capacity it is
+    sorted and every other item is promoted to the next level with twice the weight,
+    so the memory use grows only logarithmically with the number of observations.
+    Sketches built independently over partitions can be combined with `merge`.
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        """
+        Initialize an empty sketch.
+
+        Args:
+            k (int): Accuracy parameter; the size of the top level (default: 200).
+            seed (int | None): Seed for the compaction offsets, for reproducibility.
+
+        Raises:
+            ValueError: If `k` is smaller than the minimum level capacity.
+
+        """
+        if k < MIN_CAPACITY:
+            error_message = f"'k' must be at least {MIN_CAPACITY}."
+            raise ValueError(error_message)
+
+        self.k = k
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.levels: list[NDArray[np.float64]] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        """
+        Return the capacity of the given level.
+
+        Args:
+            level (int): Index of the level (0 is the bottom level).
+
+        Returns:
+            int: Maximum number of items the level holds before it is compacted.
+
+        """
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, math.ceil(self.k * CAPACITY_DECAY**depth))
+
+    def _compress(self) -> None:
+        """Compact levels from the bottom up until every level is within capacity."""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size <= self._capacity(level):
+                level += 1
+                continue
+
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+
+            items = np.sort(items)
+            # An odd item out stays on this level so that the total weight is kept
+            kept, items = items[: items.size % 2], items[items.size % 2 :]
+            offset = int(self._rng.integers(2))
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate(
+                [self.levels[level + 1], items[offset::2]],
+            )
+            level += 1
+
+    def update(self, values: ArrayLike) -> None:
+        """
+        Add observations to the sketch.
+
+        Args:
+            values (ArrayLike): One or more observations.
+
+        """
+        data = np.ravel(np.asarray(values, dtype=np.float64))
+        if data.size == 0:
+            return
+
+        self.count += int(data.size)
+        self.total += float(data.sum())
+        self.minimum = min(self.minimum, float(data.min()))
+        self.maximum = max(self.maximum, float(data.max()))
+        self.levels[0] = np.concatenate([self.levels[0], data])
+        self._compress()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other (QuantileSketch): A sketch built over another partition.
+
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+
+    def _weighted_items(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Return all retained items sorted, with their cumulative weights.
+
+        Returns:
+            tuple[NDArray[np.float64], NDArray[np.float64]]: The sorted items and
+            the cumulative weight up to and including each item.
+
+        """
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(level.size, 2.0**i) for i, level in enumerate(self.levels)],
+        )
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantiles(self, probabilities: Iterable[float]) -> list[float]:
+        """
+        Estimate quantiles of the observations.
+
+        Args:
+            probabilities (Iterable[float]): Probabilities in the range [0, 1].
+
+        Returns:
+            list[float]: The estimated quantile for each probability.
+            All values are NaN if the sketch is empty.
+
+        Raises:
+            ValueError: If any probability lies outside the range [0, 1].
+
+        """
+        probs = np.asarray(list(probabilities), dtype=np.float64)
+        if np.any((probs < 0) | (probs > 1)):
+            error_message = "Quantile probabilities must be in the range [0, 1]."
+            raise ValueError(error_message)
+        if self.count == 0:
+            return [float("nan")] * probs.size
+
+        items, cumulative = self._weighted_items()
+        # Same order-statistic convention as the exact `stats.quantiles`
+        ranks = np.minimum(np.floor(probs * cumulative[-1]), cumulative[-1] - 1)
+        indices = np.searchsorted(cumulative, ranks, side="right")
+        return items[indices].tolist()  # type: ignore[no-any-return]
+
+    def median(self) -> float:
+        """
+        Estimate the median of the observations.
+
+        Returns:
+            float: The estimated median, or NaN if the sketch is empty.
+
+        """
+        return self.quantiles([0.5])[0]
+
+    def fractions_below(self, thresholds: Iterable[float]) -> list[float]:
+        """
+        Estimate the fraction of observations strictly below each threshold.
+
+        Args:
+            thresholds (Iterable[float]): Thresholds to compare against.
+
+        Returns:
+            list[float]: The estimated fraction for each threshold.
+            All values are NaN if the sketch is empty.
+
+        """
+        limits = np.asarray(list(thresholds), dtype=np.float64)
+        if self.count == 0:
+            return [float("nan")] * limits.size
+
+        items, cumulative = self._weighted_items()
+        positions = np.searchsorted(items, limits, side="left")
+        below = np.concatenate([[0.0], cumulative])[positions]
+        return (below / cumulative[-1]).tolist()  # type: ignore[no-any-return]
+
+    def summary(
+        self,
+        probabilities: Iterable[float] = (),
+        thresholds: Iterable[float] = (),
+    ) -> Summary:
+        """
+        Summarize the observations in the same shape as `stats.summarize`.
+
+        Args:
+            probabilities (Iterable[float]): Additional quantile probabilities.
+            thresholds (Iterable[float]): Thresholds for the `fractions_below` field.
+
+        Returns:
+            Summary: The (approximate) summary statistics.
+
+        """
+        probs = list(probabilities)
+        limits = list(thresholds)
+        quantile_values = self.quantiles([*probs, 0.5])
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else float("nan"),
+            "median": quantile_values[-1],
+            "quantiles": dict(zip(probs, quantile_values[:-1], strict=True)),
+            "fractions_below": dict(
+                zip(limits, self.fractions_below(limits), strict=True),
+            ),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serialize the sketch to a JSON-compatible dictionary.
+
+        Returns:
+            dict[str, Any]: The serialized sketch.
+
+        """
+        return {
+            "k": self.k,
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum if self.count else None,
+            "maximum": self.maximum if self.count else None,
+            "levels": [level.tolist() for level in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], seed: int | None = None) -> QuantileSketch:
+        """
+        Restore a sketch serialized with `to_dict`.
+
+        Args:
+            data (dict[str, Any]): The serialized sketch.
+            seed (int | None): Seed for subsequent compactions.
+
+        Returns:
+            QuantileSketch: The restored sketch.
+
+        """
+        sketch = cls(k=data["k"], seed=seed)
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        if sketch.count:
+            sketch.minimum = data["minimum"]
+            sketch.maximum = data["maximum"]
+        sketch.levels = [
+            np.asarray(level, dtype=np.float64) for level in data["levels"]
+        ]
+        return sketch
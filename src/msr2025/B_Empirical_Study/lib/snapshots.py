@@ -0,0 +1,174 @@
+"""
+Compares the release transitions extracted from two snapshots of the graph.
+
+Includes:
+- SnapshotStatistics / snapshot_statistics: The RQ1, RQ2-1 and RQ2-2 statistics
+  of one snapshot.
+- SnapshotDelta / snapshot_delta: Per-artifact differences between an earlier and
+  a later snapshot, from one join on artifact id.
+- DeltaSummary / summarize_delta: How many packages newly updated, disappeared
+  or changed their update delay.
+
+Each snapshot holds at most one transition per artifact, so the join is a single
+`np.unique` over the artifact ids of both snapshots.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .analyses import (
+    RQ1Result,
+    RQ21Result,
+    RQ22Result,
+    rq1_statistics,
+    rq2_1_statistics,
+    rq2_2_statistics,
+)
+from .constants import ONE_DAY
+from .dataset import UpdateColumns
+from .stats import median
+from .versions import VERSION_CHANGE_TYPES
+
+
+class SnapshotStatistics(TypedDict):
+    """
+    Statistics of the RQs for one snapshot.
+
+    Attributes:
+        rq1 (RQ1Result): Share of packages updated within 3 months and 1 year.
+        rq2_1 (RQ21Result): Correlation of update delay and release frequency.
+        rq2_2 (RQ22Result): Median update delay per version change type.
+
+    """
+
+    rq1: RQ1Result
+    rq2_1: RQ21Result
+    rq2_2: RQ22Result
+
+
+class SnapshotDelta(TypedDict):
+    """
+    Per-artifact differences between two snapshots.
+
+    Attributes:
+        artifact_ids (NDArray[np.str_]): Artifacts with a transition in either
+            snapshot, sorted.
+        before (NDArray[np.int64]): Index of each artifact in the earlier
+            snapshot, or -1.
+        after (NDArray[np.int64]): Index of each artifact in the later snapshot,
+            or -1.
+        gap_change (NDArray[np.float64]): Change of the update delay in days
+            (NaN unless the artifact is in both snapshots).
+
+    """
+
+    artifact_ids: NDArray[np.str_]
+    before: NDArray[np.int64]
+    after: NDArray[np.int64]
+    gap_change: NDArray[np.float64]
+
+
+class DeltaSummary(TypedDict):
+    """
+    Summary of the differences between two snapshots.
+
+    Attributes:
+        newly_updated (int): Packages updated only in the later snapshot.
+        disappeared (int): Packages updated only in the earlier snapshot.
+        unchanged (int): Packages with the same update delay in both.
+        gap_changed (int): Packages whose update delay changed.
+        median_gap_change (float): Median change of the update delay in days
+            among them (NaN if there are none).
+
+    """
+
+    newly_updated: int
+    disappeared: int
+    unchanged: int
+    gap_changed: int
+    median_gap_change: float
+
+
+def snapshot_statistics(columns: UpdateColumns) -> SnapshotStatistics:
+    """
+    Compute the RQ statistics of one snapshot.
+
+    Args:
+        columns (UpdateColumns): Release transitions of the snapshot.
+
+    Returns:
+        SnapshotStatistics: The statistics of RQ1, RQ2-1 and RQ2-2.
+
+    """
+    gaps = columns["gap"] / ONE_DAY
+    return {
+        "rq1": rq1_statistics(gaps),
+        "rq2_1": rq2_1_statistics(gaps, columns["release_frequency"] / ONE_DAY),
+        "rq2_2": rq2_2_statistics(
+            {
+                t: gaps[columns["change"] == i]
+                for i, t in enumerate(VERSION_CHANGE_TYPES)
+            },
+        ),
+    }
+
+
+def snapshot_delta(before: UpdateColumns, after: UpdateColumns) -> SnapshotDelta:
+    """
+    Join two snapshots on artifact id.
+
+    Args:
+        before (UpdateColumns): Release transitions of the earlier snapshot.
+        after (UpdateColumns): Release transitions of the later snapshot.
+
+    Returns:
+        SnapshotDelta: Where each artifact is in either snapshot, and how its
+        update delay changed.
+
+    """
+    count = before["artifact_ids"].size
+    artifact_ids, inverse = np.unique(
+        np.concatenate([before["artifact_ids"], after["artifact_ids"]]),
+        return_inverse=True,
+    )
+
+    before_index = np.full(artifact_ids.size, -1, dtype=np.int64)
+    before_index[inverse[:count]] = np.arange(count)
+    after_index = np.full(artifact_ids.size, -1, dtype=np.int64)
+    after_index[inverse[count:]] = np.arange(inverse.size - count)
+
+    both = (before_index >= 0) & (after_index >= 0)
+    gap_change = np.full(artifact_ids.size, np.nan)
+    gap_change[both] = (
+        after["gap"][after_index[both]] - before["gap"][before_index[both]]
+    ) / ONE_DAY
+
+    return {
+        "artifact_ids": artifact_ids,
+        "before": before_index,
+        "after": after_index,
+        "gap_change": gap_change,
+    }
+
+
+def summarize_delta(delta: SnapshotDelta) -> DeltaSummary:
+    """
+    Count the kinds of differences between two snapshots.
+
+    Args:
+        delta (SnapshotDelta): Per-artifact differences.
+
+    Returns:
+        DeltaSummary: The number of packages per kind of difference.
+
+    """
+    changed = ~np.isnan(delta["gap_change"]) & (delta["gap_change"] != 0)
+    return {
+        "newly_updated": int(np.count_nonzero(delta["before"] < 0)),
+        "disappeared": int(np.count_nonzero(delta["after"] < 0)),
+        "unchanged": int(np.count_nonzero(delta["gap_change"] == 0)),
+        "gap_changed": int(np.count_nonzero(changed)),
+        "median_gap_change": median(delta["gap_change"][changed]),
+    }
@@ -0,0 +1,214 @@
+"""
+Provides vectorized summary statistics for the empirical study phase.
+
+Includes:
+- Exact medians, quantiles, threshold fractions and means computed with NumPy.
+- A single-pass summary that sorts a sample once and derives every statistic from it.
+- Quantiles of many groups at once, with a single sort over all observations.
+
+Exact quantiles are order statistics: the quantile `q` of `n` sorted values is the
+element at index `floor(q * n)`. For `q = 0.5` this is the element that the RQ
+scripts have always reported as the median (`sorted_values[n // 2]`).
+"""
+
+from collections.abc import Iterable
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class Summary(TypedDict):
+    """
+    Summary statistics of a single sample.
+
+    Attributes:
+        count (int): Number of observations.
+        mean (float): Arithmetic mean of the observations.
+        median (float): Median of the observations (upper middle element).
+        quantiles (dict[float, float]): Requested quantiles keyed by probability.
+        fractions_below (dict[float, float]): Fraction of observations strictly
+            below each requested threshold, keyed by threshold.
+
+    """
+
+    count: int
+    mean: float
+    median: float
+    quantiles: dict[float, float]
+    fractions_below: dict[float, float]
+
+
+def _quantile_indices(
+    count: int,
+    probabilities: NDArray[np.float64],
+) -> NDArray[np.intp]:
+    """
+    Compute the order-statistic indices of the given probabilities.
+
+    Args:
+        count (int): Number of observations in the sorted sample.
+        probabilities (NDArray[np.float64]): Probabilities in the range [0, 1].
+
+    Returns:
+        NDArray[np.intp]: Indices into the sorted sample.
+
+    Raises:
+        ValueError: If any probability lies outside the range [0, 1].
+
+    """
+    if np.any((probabilities < 0) | (probabilities > 1)):
+        error_message = "Quantile probabilities must be in the range [0, 1]."
+        raise ValueError(error_message)
+
+    indices: NDArray[np.intp] = np.floor(probabilities * count).astype(np.intp)
+    return indices.clip(max=count - 1)
+
+
+def quantiles(values: ArrayLike, probabilities: Iterable[float]) -> list[float]:
+    """
+    Compute exact quantiles of a sample.
+
+    Args:
+        values (ArrayLike): The observations.
+        probabilities (Iterable[float]): Probabilities in the range [0, 1].
+
+    Returns:
+        list[float]: The quantile for each probability, in the given order.
+        All values are NaN if the sample is empty.
+
+    """
+    data = np.asarray(values, dtype=np.float64)
+    probs = np.asarray(list(probabilities), dtype=np.float64)
+    if data.size == 0:
+        return [float("nan")] * probs.size
+
+    indices = _quantile_indices(data.size, probs)
+    # Partial sorting is enough to place every requested order statistic
+    partitioned = np.partition(data, np.unique(indices))
+    return partitioned[indices].tolist()  # type: ignore[no-any-return]
+
+
+def median(values: ArrayLike) -> float:
+    """
+    Compute the exact median of a sample.
+
+    For even-sized samples the upper of the two middle elements is returned.
+
+    Args:
+        values (ArrayLike): The observations.
+
+    Returns:
+        float: The median, or NaN if the sample is empty.
+
+    """
+    return quantiles(values, [0.5])[0]
+
+
+def fractions_below(values: ArrayLike, thresholds: Iterable[float]) -> list[float]:
+    """
+    Compute the fraction of observations strictly below each threshold.
+
+    Args:
+        values (ArrayLike): The observations.
+        thresholds (Iterable[float]): Thresholds to compare against.
+
+    Returns:
+        list[float]: The fraction for each threshold, in the given order.
+        All values are NaN if the sample is empty.
+
+    """
+    data = np.sort(np.asarray(values, dtype=np.float64))
+    limits = np.asarray(list(thresholds), dtype=np.float64)
+    if data.size == 0:
+        return [float("nan")] * limits.size
+
+    counts = np.searchsorted(data, limits, side="left")
+    return (counts / data.size).tolist()  # type: ignore[no-any-return]
+
+
+def summarize(
+    values: ArrayLike,
+    probabilities: Iterable[float] = (),
+    thresholds: Iterable[float] = (),
+) -> Summary:
+    """
+    Compute the count, mean, median, quantiles and threshold fractions of a sample.
+
+    The sample is sorted once; every statistic is then read from the sorted array.
+
+    Args:
+        values (ArrayLike): The observations.
+        probabilities (Iterable[float]): Additional quantile probabilities to report.
+        thresholds (Iterable[float]): Thresholds for the `fractions_below` field.
+
+    Returns:
+        Summary: The summary statistics of the sample.
+
+    """
+    data = np.sort(np.asarray(values, dtype=np.float64))
+    probs = np.asarray(list(probabilities), dtype=np.float64)
+    limits = np.asarray(list(thresholds), dtype=np.float64)
+
+    if data.size == 0:
+        nan = float("nan")
+        return {
+            "count": 0,
+            "mean": nan,
+            "median": nan,
+            "quantiles": dict.fromkeys(probs.tolist(), nan),
+            "fractions_below": dict.fromkeys(limits.tolist(), nan),
+        }
+
+    quantile_values = data[_quantile_indices(data.size, np.append(probs, 0.5))]
+    fractions = np.searchsorted(data, limits, side="left") / data.size
+
+    return {
+        "count": int(data.size),
+        "mean": float(data.mean()),
+        "median": float(quantile_values[-1]),
+        "quantiles": dict(
+            zip(probs.tolist(), quantile_values[:-1].tolist(), strict=True),
+        ),
+        "fractions_below": dict(
+            zip(limits.tolist(), fractions.tolist(), strict=True),
+        ),
+    }
+
+
+def grouped_quantiles(
+    values: NDArray[np.float64],
+    groups: NDArray[np.int64],
+    group_count: int,
+    probabilities: tuple[float, ...],
+) -> list[NDArray[np.float64]]:
+    """
+    Compute quantiles of every group with a single sort.
+
+    Each group's quantiles are the same order statistics as `quantiles` would
+    return for that group alone.
+
+    Args:
+        values (NDArray[np.float64]): One value per observation.
+        groups (NDArray[np.int64]): Group index of each observation.
+        group_count (int): Number of groups.
+        probabilities (tuple[float, ...]): Probabilities in the range [0, 1].
+
+    Returns:
+        list[NDArray[np.float64]]: For each probability, the quantile of every
+        group (NaN for empty groups).
+
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    empty = counts == 0
+
+    results: list[NDArray[np.float64]] = []
+    for q in probabilities:
+        ranks = np.minimum(np.floor(q * counts).astype(np.int64), counts - 1)
+        positions = np.where(empty, 0, starts + ranks)
+        quantile = ordered[positions] if ordered.size else np.zeros(group_count)
+        results.append(np.where(empty, np.nan, quantile))
+    return results
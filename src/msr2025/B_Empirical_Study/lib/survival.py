@@ -0,0 +1,230 @@
+"""
+Provides Kaplan-Meier survival estimation for time-to-update analysis.
+
+Includes:
+- SurvivalCurve: A Kaplan-Meier curve as parallel arrays over the distinct times.
+- kaplan_meier: Estimates the curve from durations and event indicators with a
+  single sort, without per-observation Python loops.
+- survival_at / median_survival: Read values off an estimated curve.
+- CumulativeIncidence: Aalen-Johansen cumulative incidence curves of competing
+  events.
+- cumulative_incidence / incidence_at: Estimate the curves, and read the share of
+  observations that had an event of a given kind by some time.
+- median_incidence: Reads the time by which half of the events of a given kind
+  had happened.
+
+With competing events (e.g., a package updates via a major, minor or patch
+change, but only once), 1 - Kaplan-Meier of one kind, with the other kinds
+counted as censored, estimates the cause-specific share in a world without the
+other kinds. It overstates the share that actually had an event of that kind,
+and the kinds can sum to more than 100%. The cumulative incidence curves instead
+sum to 1 - Kaplan-Meier of any event.
+"""
+
+from typing import TypedDict
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Survival probability that defines the median survival time
+MEDIAN_SURVIVAL = 0.5
+
+# Share of the final cumulative incidence that defines the median time of a kind
+MEDIAN_INCIDENCE = 0.5
+
+
+class SurvivalCurve(TypedDict):
+    """
+    A Kaplan-Meier survival curve.
+
+    Attributes:
+        times (NDArray[np.float64]): Distinct observed durations, ascending.
+        at_risk (NDArray[np.int64]): Observations still at risk just before each time.
+        events (NDArray[np.int64]): Events (non-censored observations) at each time.
+        survival (NDArray[np.float64]): Estimated probability that no event has
+            happened by each time (inclusive).
+
+    """
+
+    times: NDArray[np.float64]
+    at_risk: NDArray[np.int64]
+    events: NDArray[np.int64]
+    survival: NDArray[np.float64]
+
+
+def kaplan_meier(durations: ArrayLike, observed: ArrayLike) -> SurvivalCurve:
+    """
+    Estimate a Kaplan-Meier survival curve.
+
+    Args:
+        durations (ArrayLike): Time until the event, or until censoring.
+        observed (ArrayLike): True where the event happened, False where the
+            observation is right-censored.
+
+    Returns:
+        SurvivalCurve: The estimated curve.
+
+    """
+    times, inverse, counts = np.unique(
+        np.asarray(durations, dtype=np.float64),
+        return_inverse=True,
+        return_counts=True,
+    )
+    events = np.bincount(
+        inverse,
+        weights=np.asarray(observed, dtype=np.float64),
+        minlength=times.size,
+    ).astype(np.int64)
+
+    # Everything that ended before a time has left the risk set
+    at_risk = counts.sum() - np.concatenate([[0], np.cumsum(counts)[:-1]])
+    survival = np.cumprod(1 - events / at_risk)
+
+    return {
+        "times": times,
+        "at_risk": at_risk.astype(np.int64),
+        "events": events,
+        "survival": survival,
+    }
+
+
+class CumulativeIncidence(TypedDict):
+    """
+    Cumulative incidence curves of competing events.
+
+    Attributes:
+        times (NDArray[np.float64]): Distinct observed durations, ascending.
+        at_risk (NDArray[np.int64]): Observations still at risk just before each time.
+        events (NDArray[np.int64]): Events of each kind at each time, of shape
+            (kinds, times).
+        incidence (NDArray[np.float64]): Estimated probability that an event of
+            each kind has happened by each time (inclusive), of shape
+            (kinds, times).
+
+    """
+
+    times: NDArray[np.float64]
+    at_risk: NDArray[np.int64]
+    events: NDArray[np.int64]
+    incidence: NDArray[np.float64]
+
+
+def cumulative_incidence(
+    durations: ArrayLike,
+    kinds: ArrayLike,
+    kind_count: int,
+) -> CumulativeIncidence:
+    """
+    Estimate Aalen-Johansen cumulative incidence curves of competing events.
+
+    The incidence of kind k grows at each time by the probability of having had
+    no event just before it, times the share of the observations at risk that
+    had an event of kind k at that time.
+
+    Args:
+        durations (ArrayLike): Time until the event, or until censoring.
+        kinds (ArrayLike): Kind of each event in the range [0, kind_count), or -1
+            where the observation is right-censored.
+        kind_count (int): Number of kinds of events.
+
+    Returns:
+        CumulativeIncidence: The estimated curves.
+
+    """
+    times, inverse, counts = np.unique(
+        np.asarray(durations, dtype=np.float64),
+        return_inverse=True,
+        return_counts=True,
+    )
+    codes = np.asarray(kinds, dtype=np.int64)
+    observed = codes >= 0
+    events = np.zeros((kind_count, times.size), dtype=np.int64)
+    np.add.at(events, (codes[observed], inverse[observed]), 1)
+
+    # Everything that ended before a time has left the risk set
+    at_risk = counts[::-1].cumsum()[::-1]
+    survival = np.cumprod(1 - events.sum(axis=0) / at_risk)
+    survival_before = np.concatenate([[1.0], survival[:-1]])
+    incidence = np.cumsum(survival_before * events / at_risk, axis=1)
+
+    return {
+        "times": times,
+        "at_risk": at_risk.astype(np.int64),
+        "events": events,
+        "incidence": incidence,
+    }
+
+
+def incidence_at(curves: CumulativeIncidence, kind: int, time: float) -> float:
+    """
+    Read the cumulative incidence of one kind of event at a given time.
+
+    Args:
+        curves (CumulativeIncidence): Estimated curves.
+        kind (int): Kind of the event.
+        time (float): The time to read the curve at.
+
+    Returns:
+        float: Probability that an event of this kind has happened by `time`
+        (inclusive).
+
+    """
+    index = int(np.searchsorted(curves["times"], time, side="right")) - 1
+    return 0.0 if index < 0 else float(curves["incidence"][kind, index])
+
+
+def median_incidence(curves: CumulativeIncidence, kind: int) -> float:
+    """
+    Find the median time of one kind of event.
+
+    The cumulative incidence of a kind levels off at the share of observations
+    that end up with an event of that kind (as far as observed). The median time
+    is the first time at which it reaches half of that plateau, i.e., the median
+    time to the event among the observations that had it.
+
+    Args:
+        curves (CumulativeIncidence): Estimated curves.
+        kind (int): Kind of the event.
+
+    Returns:
+        float: The first time at which the incidence reaches half of its final
+        value, or NaN if no event of this kind happened.
+
+    """
+    incidence = curves["incidence"][kind]
+    if incidence.size == 0 or incidence[-1] <= 0:
+        return float("nan")
+    reached = np.flatnonzero(incidence >= MEDIAN_INCIDENCE * incidence[-1])
+    return float(curves["times"][reached[0]])
+
+
+def survival_at(curve: SurvivalCurve, time: float) -> float:
+    """
+    Read the survival probability at a given time.
+
+    Args:
+        curve (SurvivalCurve): An estimated curve.
+        time (float): The time to read the curve at.
+
+    Returns:
+        float: Probability that no event has happened by `time` (inclusive).
+
+    """
+    index = int(np.searchsorted(curve["times"], time, side="right")) - 1
+    return 1.0 if index < 0 else float(curve["survival"][index])
+
+
+def median_survival(curve: SurvivalCurve) -> float:
+    """
+    Find the median survival time of an estimated curve.
+
+    Args:
+        curve (SurvivalCurve): An estimated curve.
+
+    Returns:
+        float: The first time at which the survival probability drops to 0.5 or
+        below, or NaN if the curve never reaches it (too much censoring).
+
+    """
+    reached = np.flatnonzero(curve["survival"] <= MEDIAN_SURVIVAL)
+    return float(curve["times"][reached[0]]) if reached.size else float("nan")
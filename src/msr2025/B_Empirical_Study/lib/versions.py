@@ -0,0 +1,97 @@
+"""
+Classifies release transitions by the kind of version change.
+
+Includes:
+- version_change_type: Whether a transition changed the major, minor or patch part.
+- version_change_codes: The same classification for whole arrays of versions.
+- group_by_version_change: Splits release transitions into those three groups.
+"""
+
+from typing import Literal
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .type import Data
+
+type VersionChange = Literal["major", "minor", "patch"]
+
+# Version change types in the order they are reported
+VERSION_CHANGE_TYPES: tuple[VersionChange, ...] = ("major", "minor", "patch")
+
+
+def version_change_type(old_version: str, new_version: str) -> VersionChange:
+    """
+    Determine which part of a semantic version changed between two releases.
+
+    Args:
+        old_version (str): Version before the update (e.g., '1.2.3').
+        new_version (str): Version after the update.
+
+    Returns:
+        VersionChange: 'major' if the major part differs, otherwise 'minor' if the
+        minor part differs, otherwise 'patch'.
+
+    """
+    old_parts = old_version.split(".")
+    new_parts = new_version.split(".")
+
+    if old_parts[0] != new_parts[0]:
+        return "major"
+    if old_parts[1] != new_parts[1]:
+        return "minor"
+    return "patch"
+
+
+def version_change_codes(
+    old_versions: NDArray[np.str_],
+    new_versions: NDArray[np.str_],
+) -> NDArray[np.int64]:
+    """
+    Classify many version changes at once.
+
+    Args:
+        old_versions (NDArray[np.str_]): Versions before the update.
+        new_versions (NDArray[np.str_]): Versions after the update.
+
+    Returns:
+        NDArray[np.int64]: Index into `VERSION_CHANGE_TYPES` for every pair,
+        consistent with `version_change_type`.
+
+    """
+    # np.char.partition fails on empty arrays
+    if old_versions.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    old_major, _, old_rest = np.moveaxis(np.char.partition(old_versions, "."), -1, 0)
+    new_major, _, new_rest = np.moveaxis(np.char.partition(new_versions, "."), -1, 0)
+    old_minor = np.char.partition(old_rest, ".")[..., 0]
+    new_minor = np.char.partition(new_rest, ".")[..., 0]
+
+    return np.where(
+        old_major != new_major,
+        VERSION_CHANGE_TYPES.index("major"),
+        np.where(
+            old_minor != new_minor,
+            VERSION_CHANGE_TYPES.index("minor"),
+            VERSION_CHANGE_TYPES.index("patch"),
+        ),
+    )
+
+
+def group_by_version_change(results: list[Data]) -> dict[VersionChange, list[Data]]:
+    """
+    Split release transitions by the kind of version change.
+
+    Args:
+        results (list[Data]): Release transitions to classify.
+
+    Returns:
+        dict[VersionChange, list[Data]]: Transitions keyed by version change type,
+        each list preserving the input order.
+
+    """
+    groups: dict[VersionChange, list[Data]] = {t: [] for t in VERSION_CHANGE_TYPES}
+    for r in results:
+        groups[version_change_type(r.old_version, r.new_version)].append(r)
+    return groups
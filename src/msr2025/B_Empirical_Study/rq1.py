@@ -7,14 +7,37 @@ This script:
 - Loads the processed data of packages and their dependent release dates.
 - Plots a histogram of days packages took to update after log4j 2.17.0.
 - Calculates and prints the percentage of packages updated within 3 months and 1 year.
+- If only a sample of the packages was extracted, also estimates these percentages
+  for all packages, with standard errors and confidence intervals.
+
+With `--granularity organization`, every organization (groupId) counts once,
+represented by the module with the median delay (see `--representative`), and the
+delays of the first, median and last module of the organizations are summarized.
 """
+import argparse
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
+import numpy as np
 
+from .lib.analyses import (
+    DAYS_ONE_YEAR,
+    DAYS_THREE_MONTHS,
+    plot_rq1,
+    rq1_statistics,
+)
 from .lib.constants import ONE_DAY
-from .lib.files import load_source_file, save_plot
+from .lib.files import load_sample_design, load_source_file, save_plot
+from .lib.rollup import (
+    DEFAULT_ROLLUP_POSITION,
+    GRANULARITIES,
+    ROLLUP_POSITIONS,
+    rollup_organizations,
+    select_granularity,
+)
+from .lib.sampling import CONFIDENCE, sample_strata, stratified_proportion
+from .lib.stats import median
 
 if TYPE_CHECKING:
     from .lib.type import Data
@@ -22,45 +45,96 @@ if TYPE_CHECKING:
 SAVE_FILE_NAME="rq1.pdf"
 SAVE_FILE_PATH=Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
 
-def main() -> None:
-    """Run RQ2-1 analysis."""
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run RQ1 analysis.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(description="Run RQ1 analysis.")
+    parser.add_argument(
+        "--granularity",
+        choices=GRANULARITIES,
+        default=GRANULARITIES[0],
+        help="count every artifact, or every organization (groupId) once",
+    )
+    parser.add_argument(
+        "--representative",
+        choices=ROLLUP_POSITIONS,
+        default=DEFAULT_ROLLUP_POSITION,
+        help="module representing an organization, by the rank of its delay",
+    )
+    args = parser.parse_args(argv)
+
     # Clear any existing plots
     plt.clf()
 
     # Load the release transition data
     results: list[Data] = load_source_file()
+    if args.granularity == "organization":
+        # Summarize the delays of the first, median and last module to update
+        all_gaps = np.array([r.gap for r in results], dtype=np.float64) / ONE_DAY
+        rollup = rollup_organizations(
+            np.array([r.artifact_id for r in results], dtype=np.str_),
+            all_gaps,
+        )
+        print(f"Median modules per organization  : {median(rollup['modules']):.0f}")
+        for position in ROLLUP_POSITIONS:
+            label = f"Median delay of the {position} module"
+            print(f"{label:<33}: {median(all_gaps[rollup[position]]):.0f} days")
+    results = select_granularity(results, args.granularity, args.representative)
 
     # Create a histogram of update delays (in days)
-    gaps = [r["gap"] / ONE_DAY for r in results]
-    plt.hist(gaps, bins=100)
-    plt.xlabel(
-        "Number of days from publication until packages "
-        "using log4j 2.17.0 have been updated",
-    )
-    plt.ylabel("Number of packages")
+    gaps = np.array([r.gap for r in results]) / ONE_DAY
+    plot_rq1(plt.gca(), gaps)
 
     # Save the histogram plot
-    save_plot("rq1.pdf")
+    save_file_name = (
+        SAVE_FILE_NAME
+        if args.granularity == "artifact"
+        else f"rq1_{args.granularity}.pdf"
+    )
+    save_plot(save_file_name)
 
     # Calculate statistics
-    total_packages = len(gaps)
-    days_three_months = 90
-    days_one_year = 365
-    packages_updated_within_three_months = sum(
-        1 for gap in gaps if gap < days_three_months
-    )
-    packages_updated_within_a_year = sum(1 for gap in gaps if gap < days_one_year)
+    statistics = rq1_statistics(gaps)
 
     # Output results
-    print(f"Total packages                   : {total_packages}")
+    unit = "packages" if args.granularity == "artifact" else "organizations"
+    width = len(f"% of {unit} updated in 3 months")
+    print(f"{'Total ' + unit:<{width}}: {statistics['count']}")
     print(
-        f"% of packages updated in 3 months: "
-        f"{packages_updated_within_three_months / total_packages:.2%}\n"
-        f"% of packages updated in a year  : "
-        f"{packages_updated_within_a_year / total_packages:.2%}",
+        f"{f'% of {unit} updated in 3 months':<{width}}: "
+        f"{statistics['within_three_months']:.2%}\n"
+        f"{f'% of {unit} updated in a year':<{width}}: "
+        f"{statistics['within_one_year']:.2%}",
     )
 
-    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
+    # Estimate the percentages of all packages if only a sample was extracted
+    design = load_sample_design()
+    if design is not None and args.granularity != "artifact":
+        print(
+            "The data is a sample; estimates for all packages are only "
+            "available at artifact granularity, and the numbers above describe "
+            "the sample only.",
+        )
+    elif design is not None:
+        strata = sample_strata(design, [r.artifact_id for r in results])
+        print(
+            f"Sampled {design['fraction']:.0%} of each stratum "
+            f"(by {design['strata_by']}); {CONFIDENCE:.0%} confidence intervals:",
+        )
+        for label, days in (("3 months", DAYS_THREE_MONTHS), ("a year", DAYS_ONE_YEAR)):
+            share = stratified_proportion(gaps < days, strata)
+            print(
+                f"  Est. % updated in {label:<8}: {share['estimate']:.2%} "
+                f"(SE {share['standard_error']:.2%}, "
+                f"CI {share['low']:.2%} - {share['high']:.2%})",
+            )
+
+    print(f"Plot has been saved to: '{SAVE_FILE_PATH.with_name(save_file_name)}'")
 
 
 if __name__ == "__main__":
@@ -8,15 +8,31 @@ This script:
 - Loads the dataset of package updates.
 - Plots a scatter graph showing update delay vs. release frequency.
 - Computes the Pearson correlation coefficient between the two.
+
+With `--feature`, release frequency is replaced by one of the release cadence
+features computed from the full release histories (e.g., the median interval
+between releases, or burstiness).
+
+With `--granularity organization`, every organization (groupId) counts once,
+represented by the module with the median delay (see `--representative`).
 """
+import argparse
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-from .lib.constants import ONE_DAY
-from .lib.files import load_source_file, save_plot
+from .lib.analyses import plot_rq2_1, rq2_1_statistics
+from .lib.cadence import CADENCE_FEATURES, align_features, cadence_features
+from .lib.constants import LOG4SHELL_TIMESTAMP, ONE_DAY
+from .lib.files import load_release_columns, load_source_file, save_plot
+from .lib.rollup import (
+    DEFAULT_ROLLUP_POSITION,
+    GRANULARITIES,
+    ROLLUP_POSITIONS,
+    select_granularity,
+)
 
 if TYPE_CHECKING:
     from .lib.type import Data
@@ -24,36 +40,102 @@ if TYPE_CHECKING:
 SAVE_FILE_NAME="rq2_1.pdf"
 SAVE_FILE_PATH=Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
 
-def main() -> None:
-    """Run RQ2-1 analysis."""
+# Feature of 'data_updates.json' used by default
+RELEASE_FREQUENCY = "release_frequency"
+
+# Axis labels of the features (interval features are converted to days)
+FEATURE_LABELS = {
+    RELEASE_FREQUENCY: "Release frequency (days)",
+    "mean_interval": "Mean interval between releases (days)",
+    "median_interval": "Median interval between releases (days)",
+    "p25_interval": "25th percentile of intervals between releases (days)",
+    "p75_interval": "75th percentile of intervals between releases (days)",
+    "p90_interval": "90th percentile of intervals between releases (days)",
+    "pre_median_interval": "Median interval before Log4Shell (days)",
+    "post_median_interval": "Median interval after Log4Shell (days)",
+    "burstiness": "Burstiness of releases",
+}
+
+# Range of burstiness, the only feature not measured in days
+BURSTINESS_LIMITS = (-1.0, 1.0)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run RQ2-1 analysis.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(description="Run RQ2-1 analysis.")
+    parser.add_argument(
+        "--feature",
+        choices=[RELEASE_FREQUENCY, *CADENCE_FEATURES],
+        default=RELEASE_FREQUENCY,
+        help="release cadence feature to correlate with the update delay",
+    )
+    parser.add_argument(
+        "--granularity",
+        choices=GRANULARITIES,
+        default=GRANULARITIES[0],
+        help="count every artifact, or every organization (groupId) once",
+    )
+    parser.add_argument(
+        "--representative",
+        choices=ROLLUP_POSITIONS,
+        default=DEFAULT_ROLLUP_POSITION,
+        help="module representing an organization, by the rank of its delay",
+    )
+    args = parser.parse_args(argv)
+
     # Clear any existing plot
     plt.clf()
 
     # Load release data
-    results: list[Data] = load_source_file()
+    results: list[Data] = select_granularity(
+        load_source_file(),
+        args.granularity,
+        args.representative,
+    )
 
     # Extract update delays and release frequencies (converted to days)
-    gaps = [r["gap"] / ONE_DAY for r in results]
-    release_frequencies = [r["release_frequency"] / ONE_DAY for r in results]
+    gaps = np.array([r.gap for r in results]) / ONE_DAY
+    if args.feature == RELEASE_FREQUENCY:
+        save_file_name = SAVE_FILE_NAME
+        values = np.array([r.release_frequency for r in results]) / ONE_DAY
+    else:
+        save_file_name = f"rq2_1_{args.feature}.pdf"
+        features = cadence_features(load_release_columns(), LOG4SHELL_TIMESTAMP)
+        artifact_ids = np.array([r.artifact_id for r in results], dtype=np.str_)
+        values = align_features(features, args.feature, artifact_ids)
+        if args.feature != "burstiness":
+            values /= ONE_DAY
+
+    if args.granularity != "artifact":
+        save_file_name = save_file_name.replace(".pdf", f"_{args.granularity}.pdf")
 
     # Plot scatter plot
-    plt.scatter(gaps, release_frequencies)
-    plt.xlabel(
-        "Number of days from publication until "
-        "packages using log4j 2.17.0 have been updated",
+    plot_rq2_1(
+        plt.gca(),
+        gaps,
+        values,
+        ylabel=FEATURE_LABELS[args.feature],
+        ylim=BURSTINESS_LIMITS if args.feature == "burstiness" else (0, 100),
     )
-    plt.ylabel("Release frequency (days)")
-    plt.xlim(0, 50)
-    plt.ylim(0, 100)
 
     # Save the plot
-    save_plot(SAVE_FILE_NAME)
+    save_plot(save_file_name)
 
     # Calculate and print the Pearson correlation coefficient
-    correlation = np.corrcoef(gaps, release_frequencies)[0, 1]
-    print(f"Correlation: {correlation:.2f}")
+    statistics = rq2_1_statistics(gaps, values)
+    if args.feature == RELEASE_FREQUENCY:
+        print(f"Correlation: {statistics['correlation']:.2f}")
+    else:
+        print(f"Packages with a defined {args.feature}: {statistics['count']}")
+        print(f"Correlation with {args.feature}: {statistics['correlation']:.2f}")
 
-    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
+    print(f"Plot has been saved to: '{SAVE_FILE_PATH.with_name(save_file_name)}'")
 
 if __name__ == "__main__":
     main()
@@ -8,14 +8,30 @@ This script:
 - Classifies updates into major, minor, and patch version changes.
 - Draws box plots of update delays for each category (with and without outliers).
 - Computes and prints the median delay for each type of version update.
+- If only a sample of the packages was extracted, also estimates the medians of
+  all packages, with Woodruff confidence intervals.
+
+With `--granularity organization`, every organization (groupId) counts once,
+represented by the module with the median delay (see `--representative`).
 """
+import argparse
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import matplotlib.pyplot as plt
+import numpy as np
 
+from .lib.analyses import plot_rq2_2, rq2_2_statistics
 from .lib.constants import ONE_DAY
-from .lib.files import load_source_file, save_plot
+from .lib.files import load_sample_design, load_source_file, save_plot
+from .lib.rollup import (
+    DEFAULT_ROLLUP_POSITION,
+    GRANULARITIES,
+    ROLLUP_POSITIONS,
+    select_granularity,
+)
+from .lib.sampling import CONFIDENCE, sample_strata, stratified_quantile
+from .lib.versions import VERSION_CHANGE_TYPES, group_by_version_change
 
 if TYPE_CHECKING:
     from .lib.type import Data
@@ -26,94 +42,102 @@ SAVE_FILE_PATH=Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
 SAVE_fILE_NAME_NO_OUTLIER="rq2_2_no_outlier.pdf"
 SAVE_FILE_PATH_NO_OUTLIER=Path(f"output/B_Empirical_Study/{SAVE_fILE_NAME_NO_OUTLIER}")
 
-def main() -> None:
-    """Run RQ2-2 analysis."""
+# Probability of the median
+MEDIAN = 0.5
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run RQ2-2 analysis.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(description="Run RQ2-2 analysis.")
+    parser.add_argument(
+        "--granularity",
+        choices=GRANULARITIES,
+        default=GRANULARITIES[0],
+        help="count every artifact, or every organization (groupId) once",
+    )
+    parser.add_argument(
+        "--representative",
+        choices=ROLLUP_POSITIONS,
+        default=DEFAULT_ROLLUP_POSITION,
+        help="module representing an organization, by the rank of its delay",
+    )
+    args = parser.parse_args(argv)
+
+    # Plots of organizations are saved next to those of artifacts
+    suffix = "" if args.granularity == "artifact" else f"_{args.granularity}"
+    save_file_path = SAVE_FILE_PATH.with_stem(f"rq2_2{suffix}")
+    save_file_path_no_outlier = SAVE_FILE_PATH.with_stem(f"rq2_2{suffix}_no_outlier")
+
     # Clear any existing plot
     plt.clf()
 
     # Load release transition data
-    results: list[Data] = load_source_file()
-
-    # Extract data where the major version has been updated
-    major_version_updates = [
-        r
-        for r in results
-        if r["old_version"].split(".")[0] != r["new_version"].split(".")[0]
-    ]
-
-    # Extract data where the minor version has been updated
-    same_major_versions = [r for r in results if r not in major_version_updates]
-    minor_version_updates = [
-        r
-        for r in same_major_versions
-        if r["old_version"].split(".")[1] != r["new_version"].split(".")[1]
-    ]
-
-    # Extract data where the patch version has been updated
-    patch_version_updates = [
-        r for r in same_major_versions if r not in minor_version_updates
-    ]
-
-    # Convert gaps to days and sort
-    major_version_gaps = [r["gap"] / ONE_DAY for r in major_version_updates]
-    minor_version_gaps = [r["gap"] / ONE_DAY for r in minor_version_updates]
-    patch_version_gaps = [r["gap"] / ONE_DAY for r in patch_version_updates]
-
-    # Plot boxplot (with outliers)
-    major_version_gaps.sort()
-    minor_version_gaps.sort()
-    patch_version_gaps.sort()
+    results: list[Data] = select_granularity(
+        load_source_file(),
+        args.granularity,
+        args.representative,
+    )
+
+    # Split data by whether the major, minor or patch version has been updated
+    groups = group_by_version_change(results)
+
+    # Convert gaps to days
+    gaps = {
+        t: np.array([r.gap for r in groups[t]], dtype=np.int64) / ONE_DAY
+        for t in VERSION_CHANGE_TYPES
+    }
 
     # Create a box plot of the gaps (with outliers)
-    plt.boxplot(
-        [major_version_gaps, minor_version_gaps, patch_version_gaps],
-        showmeans=True,
-    )
-    plt.xticks([1, 2, 3], ["Major", "Minor", "Patch"])
-    plt.ylabel(
-        "Number of days from publication until packages\n"
-        "using log4j 2.17.0 have been updated",
-    )
-    save_plot(SAVE_FILE_NAME)
+    plot_rq2_2(plt.gca(), gaps)
+    save_plot(save_file_path.name)
 
     # Clear any existing plot
     plt.clf()
 
     # Create a box plot of the gaps (without outliers)
-    plt.boxplot(
-        [major_version_gaps, minor_version_gaps, patch_version_gaps],
-        showmeans=True,
-        sym="",
-    )
-    plt.xticks([1, 2, 3], ["Major", "Minor", "Patch"])
-    plt.ylabel(
-        "Number of days from publication until packages\n"
-        "using log4j 2.17.0 have been updated",
-    )
-    save_plot(SAVE_fILE_NAME_NO_OUTLIER)
+    plot_rq2_2(plt.gca(), gaps, outliers=False)
+    save_plot(save_file_path_no_outlier.name)
 
-    # Calculate medians (middle element from sorted list)
-    major_version_median = major_version_gaps[len(major_version_gaps) // 2]
-    minor_version_median = minor_version_gaps[len(minor_version_gaps) // 2]
-    patch_version_median = patch_version_gaps[len(patch_version_gaps) // 2]
+    # Calculate medians (upper middle element for even-sized groups)
+    statistics = rq2_2_statistics(gaps)
 
     # Output statistics
-    print(f"Total packages       : {len(results)}")
-    print(
-        f"Major version updated: {len(major_version_updates)} "
-        f"(Median: {major_version_median:.0f})",
-    )
-    print(
-        f"Minor version updated: {len(minor_version_updates)} "
-        f"(Median: {minor_version_median:.0f})",
-    )
-    print(
-        f"Patch version updated: {len(patch_version_updates)} "
-        f"(Median: {patch_version_median:.0f})",
-    )
-
-    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
-    print(f"Plot has been saved to: '{SAVE_FILE_PATH_NO_OUTLIER}'")
+    unit = "packages" if args.granularity == "artifact" else "organizations"
+    print(f"{'Total ' + unit:<21}: {len(results)}")
+    for t in VERSION_CHANGE_TYPES:
+        group = statistics["groups"][t]
+        label = f"{t.capitalize()} version updated"
+        print(f"{label}: {group['count']} (Median: {group['median']:.0f})")
+
+    # Estimate the medians of all packages if only a sample was extracted
+    design = load_sample_design()
+    if design is not None and args.granularity != "artifact":
+        print(
+            "The data is a sample; estimates for all packages are only "
+            "available at artifact granularity, and the medians above describe "
+            "the sample only.",
+        )
+    elif design is not None:
+        print(
+            f"Sampled {design['fraction']:.0%} of each stratum "
+            f"(by {design['strata_by']}); {CONFIDENCE:.0%} confidence intervals:",
+        )
+        for t in VERSION_CHANGE_TYPES:
+            strata = sample_strata(design, [r.artifact_id for r in groups[t]])
+            median = stratified_quantile(gaps[t], strata, MEDIAN)
+            print(
+                f"  Est. median ({t}): {median['estimate']:.0f} "
+                f"(SE {median['standard_error']:.1f}, "
+                f"CI {median['low']:.0f} - {median['high']:.0f})",
+            )
+
+    print(f"Plot has been saved to: '{save_file_path}'")
+    print(f"Plot has been saved to: '{save_file_path_no_outlier}'")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,541 @@
+"""
+Run a local analysis server that keeps the dataset in memory.
+
+This script:
+- Loads 'data_updates.json' and 'data_releases.json' once into NumPy columns, and
+  reloads them automatically when either file changes on disk.
+- Serves the RQ1, RQ2-1 and RQ2-2 statistics, the exposure timeline, the matching
+  release transitions and rendered figures over HTTP, for any subset of packages
+  selected by artifact id prefix, update date range and version change type.
+- Caches recent responses until the dataset is reloaded.
+
+Endpoints (GET):
+- /health: Size of the loaded dataset and when it was loaded.
+- /rq1, /rq2_1, /rq2_2, /exposure: Statistics as JSON.
+- /updates: The selected release transitions as JSON (at most `limit`).
+- /figures/<name>.<format>: A figure (rq1, rq2_1, rq2_2, rq2_2_no_outlier or
+  exposure) as png, svg or pdf.
+
+Query parameters: `prefix` (artifact id prefix), `since` and `until` (UTC dates,
+YYYY-MM-DD; `until` is exclusive), `change` (major, minor or patch) and `limit`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from traceback import print_exc
+from typing import TYPE_CHECKING, Any, TypedDict, cast
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from ..lib.columns import ReleaseColumns, select_artifacts
+from .lib.analyses import (
+    plot_rq1,
+    plot_rq2_1,
+    plot_rq2_2,
+    rq1_statistics,
+    rq2_1_statistics,
+    rq2_2_statistics,
+)
+from .lib.constants import (
+    LOG4J_TIMESTAMP_2_17_0,
+    ONE_DAY,
+    RELEASES_FILE_PATH,
+    SOURCE_FILE_PATH,
+)
+from .lib.dataset import (
+    UpdateColumns,
+    select_updates,
+    to_update_columns,
+    update_mask,
+)
+from .lib.exposure import Timeline, exposure_timeline
+from .lib.files import load_release_columns, load_source_file
+from .lib.versions import VERSION_CHANGE_TYPES, VersionChange
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Number of responses kept in the cache
+CACHE_SIZE = 256
+
+# Number of release transitions returned by /updates unless `limit` is given
+DEFAULT_LIMIT = 1000
+
+# First day of the exposure timeline unless `since` is given (2021-12-01 UTC)
+TIMELINE_START_TIMESTAMP = 1638316800000
+
+# Path prefix of the figures
+FIGURES_PATH = "/figures/"
+
+# Content types of the supported figure formats
+FIGURE_FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+
+class Query(TypedDict):
+    """
+    Selection of packages requested by a client.
+
+    Attributes:
+        prefix (str | None): Artifact id prefix.
+        since (int | None): Start of the update date range (in milliseconds).
+        until (int | None): End of the update date range, exclusive.
+        change (VersionChange | None): Version change type.
+        limit (int): Maximum number of release transitions to return.
+
+    """
+
+    prefix: str | None
+    since: int | None
+    until: int | None
+    change: VersionChange | None
+    limit: int
+
+
+class Dataset:
+    """An immutable snapshot of the loaded source files."""
+
+    def __init__(self) -> None:
+        """
+        Load the source files into columns.
+
+        Raises:
+            FileNotFoundError: If a source file is not found.
+
+        """
+        self.versions = _file_versions()
+        self.updates: UpdateColumns = to_update_columns(load_source_file())
+        self.releases: ReleaseColumns = load_release_columns()
+        self.loaded_at = datetime.now(tz=UTC)
+
+
+class AnalysisService:
+    """
+    Holds the current dataset and computes responses from it.
+
+    The dataset is replaced as a whole when a source file changes, so requests that
+    are already running keep using the snapshot they started with.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the service; the dataset is loaded on first use."""
+        self._lock = threading.Lock()
+        self._dataset: Dataset | None = None
+        self._cache: OrderedDict[tuple[str, str], tuple[str, bytes]] = OrderedDict()
+
+    def dataset(self) -> Dataset:
+        """
+        Return the current dataset, reloading it if a source file has changed.
+
+        Returns:
+            Dataset: The dataset.
+
+        """
+        dataset = self._dataset
+        if dataset is not None and dataset.versions == _file_versions():
+            return dataset
+
+        with self._lock:
+            # Another thread may have reloaded while this one was waiting
+            if self._dataset is None or self._dataset.versions != _file_versions():
+                self._dataset = Dataset()
+                self._cache.clear()
+            return self._dataset
+
+    def respond(self, path: str, query_string: str) -> tuple[str, bytes]:
+        """
+        Compute the response to a request, or return it from the cache.
+
+        Args:
+            path (str): The request path.
+            query_string (str): The request query string.
+
+        Returns:
+            tuple[str, bytes]: The content type and body of the response.
+
+        Raises:
+            KeyError: If the path is not an endpoint.
+            ValueError: If a query parameter is invalid.
+            FileNotFoundError: If a source file is not found.
+
+        """
+        dataset = self.dataset()
+        key = (path, query_string)
+        with self._lock:
+            if self._dataset is dataset and key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        response = _respond(dataset, path, _parse_query(query_string))
+
+        with self._lock:
+            if self._dataset is dataset:
+                self._cache[key] = response
+                if len(self._cache) > CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return response
+
+
+def _file_versions() -> tuple[int, int]:
+    """Return the modification times of the source files (0 if missing)."""
+    return (
+        SOURCE_FILE_PATH.stat().st_mtime_ns if SOURCE_FILE_PATH.exists() else 0,
+        RELEASES_FILE_PATH.stat().st_mtime_ns if RELEASES_FILE_PATH.exists() else 0,
+    )
+
+
+def _parse_timestamp(value: str) -> int:
+    """Convert a UTC date (YYYY-MM-DD) to a timestamp in milliseconds."""
+    day = date.fromisoformat(value)
+    midnight = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    return int(midnight.timestamp() * 1000)
+
+
+def _parse_query(query_string: str) -> Query:
+    """
+    Parse and validate the query parameters of a request.
+
+    Args:
+        query_string (str): The request query string.
+
+    Returns:
+        Query: The selection of packages.
+
+    Raises:
+        ValueError: If a query parameter is invalid.
+
+    """
+    parameters = {k: v[-1] for k, v in parse_qs(query_string).items()}
+
+    change = parameters.get("change")
+    if change is not None and change not in VERSION_CHANGE_TYPES:
+        error_message = f"'change' must be one of {', '.join(VERSION_CHANGE_TYPES)}."
+        raise ValueError(error_message)
+
+    since = parameters.get("since")
+    until = parameters.get("until")
+    return {
+        "prefix": parameters.get("prefix"),
+        "since": _parse_timestamp(since) if since else None,
+        "until": _parse_timestamp(until) if until else None,
+        "change": cast("VersionChange | None", change),
+        "limit": int(parameters.get("limit", DEFAULT_LIMIT)),
+    }
+
+
+def _finite(value: float) -> float | None:
+    """Map NaN, which JSON cannot represent, to null."""
+    return None if math.isnan(value) else value
+
+
+def _json(data: object) -> tuple[str, bytes]:
+    """Encode a JSON response."""
+    return "application/json", json.dumps(data).encode()
+
+
+def _selected_updates(dataset: Dataset, query: Query) -> UpdateColumns:
+    """Return the release transitions selected by a query."""
+    mask = update_mask(
+        dataset.updates,
+        prefix=query["prefix"],
+        since=query["since"],
+        until=query["until"],
+        change=query["change"],
+    )
+    return select_updates(dataset.updates, mask)
+
+
+def _gap_groups(updates: UpdateColumns) -> dict[VersionChange, NDArray[np.float64]]:
+    """Split update delays (in days) by version change type."""
+    gaps = updates["gap"] / ONE_DAY
+    return {t: gaps[updates["change"] == i] for i, t in enumerate(VERSION_CHANGE_TYPES)}
+
+
+def _timeline(dataset: Dataset, query: Query) -> Timeline:
+    """Compute the exposure timeline of the artifacts selected by a query."""
+    releases = dataset.releases
+    if query["prefix"]:
+        keep = np.char.startswith(releases["artifact_ids"], query["prefix"])
+        releases = select_artifacts(releases, keep)
+
+    start = query["since"] or TIMELINE_START_TIMESTAMP
+    end = query["until"] - ONE_DAY if query["until"] else None
+    if end is None:
+        times = releases["dependent_time"]
+        end = int(times.max()) if times.size else start
+
+    return exposure_timeline(
+        releases,
+        releases["log4j_time"] < LOG4J_TIMESTAMP_2_17_0,
+        start=start,
+        end=max(start, end),
+        step=ONE_DAY,
+    )
+
+
+def _figure(dataset: Dataset, name: str, query: Query) -> Figure:
+    """
+    Draw a figure for the packages selected by a query.
+
+    Figures are drawn with the object-oriented API rather than pyplot, so that
+    concurrent requests do not share any global figure state.
+
+    Raises:
+        KeyError: If there is no figure with this name.
+
+    """
+    figure = Figure()
+    ax = figure.subplots()
+    updates = _selected_updates(dataset, query)
+
+    if name == "rq1":
+        plot_rq1(ax, updates["gap"] / ONE_DAY)
+    elif name == "rq2_1":
+        plot_rq2_1(
+            ax,
+            updates["gap"] / ONE_DAY,
+            updates["release_frequency"] / ONE_DAY,
+        )
+    elif name in {"rq2_2", "rq2_2_no_outlier"}:
+        plot_rq2_2(ax, _gap_groups(updates), outliers=name == "rq2_2")
+    elif name == "exposure":
+        timeline = _timeline(dataset, query)
+        counts = timeline["counts"]
+        start = np.datetime64(timeline["start"], "ms").astype("datetime64[D]")
+        ax.plot(start + np.arange(counts.size), counts)
+        ax.set_xlabel("Date")
+        ax.set_ylabel(
+            "Number of packages whose latest release\ndepends on log4j < 2.17.0",
+        )
+        figure.autofmt_xdate()
+    else:
+        error_message = f"Unknown figure '{name}'."
+        raise KeyError(error_message)
+
+    return figure
+
+
+def _health(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """Describe the loaded dataset."""
+    del query
+    return _json(
+        {
+            "updates": int(dataset.updates["artifact_ids"].size),
+            "artifacts": int(dataset.releases["artifact_ids"].size),
+            "loaded_at": dataset.loaded_at.isoformat(timespec="seconds"),
+        },
+    )
+
+
+def _rq1(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """Compute the RQ1 statistics of the selected packages."""
+    updates = _selected_updates(dataset, query)
+    rq1 = rq1_statistics(updates["gap"] / ONE_DAY)
+    return _json(
+        {
+            "count": rq1["count"],
+            "within_three_months": _finite(rq1["within_three_months"]),
+            "within_one_year": _finite(rq1["within_one_year"]),
+        },
+    )
+
+
+def _rq2_1(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """Compute the RQ2-1 statistics of the selected packages."""
+    updates = _selected_updates(dataset, query)
+    rq2_1 = rq2_1_statistics(
+        updates["gap"] / ONE_DAY,
+        updates["release_frequency"] / ONE_DAY,
+    )
+    return _json(
+        {"count": rq2_1["count"], "correlation": _finite(rq2_1["correlation"])},
+    )
+
+
+def _rq2_2(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """Compute the RQ2-2 statistics of the selected packages."""
+    rq2_2 = rq2_2_statistics(_gap_groups(_selected_updates(dataset, query)))
+    return _json(
+        {
+            "count": rq2_2["count"],
+            "groups": {
+                t: {"count": g["count"], "median": _finite(g["median"])}
+                for t, g in rq2_2["groups"].items()
+            },
+        },
+    )
+
+
+def _exposure(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """Compute the exposure timeline of the selected packages."""
+    timeline = _timeline(dataset, query)
+    start = datetime.fromtimestamp(timeline["start"] / 1000, tz=UTC).date()
+    return _json(
+        {
+            "start": start.isoformat(),
+            "step_days": timeline["step"] // ONE_DAY,
+            "counts": timeline["counts"].tolist(),
+        },
+    )
+
+
+def _updates(dataset: Dataset, query: Query) -> tuple[str, bytes]:
+    """List the release transitions of the selected packages."""
+    updates = _selected_updates(dataset, query)
+    gaps = updates["gap"] / ONE_DAY
+    limit = slice(0, max(0, query["limit"]))
+    records: dict[str, Any] = {
+        "count": int(updates["artifact_ids"].size),
+        "updates": [
+            {
+                "artifact_id": artifact_id,
+                "old_version": old_version,
+                "new_version": new_version,
+                "new_time": new_time,
+                "gap_days": gap,
+                "change": VERSION_CHANGE_TYPES[change],
+            }
+            for artifact_id, old_version, new_version, new_time, gap, change in zip(
+                updates["artifact_ids"][limit].tolist(),
+                updates["old_version"][limit].tolist(),
+                updates["new_version"][limit].tolist(),
+                updates["new_time"][limit].tolist(),
+                gaps[limit].tolist(),
+                updates["change"][limit].tolist(),
+                strict=True,
+            )
+        ],
+    }
+    return _json(records)
+
+
+def _figure_file(dataset: Dataset, path: str, query: Query) -> tuple[str, bytes]:
+    """
+    Render a figure for the selected packages.
+
+    Raises:
+        KeyError: If there is no figure with this name.
+        ValueError: If the format is not supported.
+
+    """
+    name, _, extension = path.removeprefix(FIGURES_PATH).rpartition(".")
+    if extension not in FIGURE_FORMATS:
+        error_message = f"Figure format must be one of {', '.join(FIGURE_FORMATS)}."
+        raise ValueError(error_message)
+    buffer = io.BytesIO()
+    _figure(dataset, name, query).savefig(buffer, format=extension)
+    return FIGURE_FORMATS[extension], buffer.getvalue()
+
+
+# Type Alias: Computes the response of an endpoint to a query
+type Endpoint = Callable[[Dataset, Query], tuple[str, bytes]]
+
+# Endpoints by path, besides the figures
+ENDPOINTS: dict[str, Endpoint] = {
+    "/health": _health,
+    "/rq1": _rq1,
+    "/rq2_1": _rq2_1,
+    "/rq2_2": _rq2_2,
+    "/exposure": _exposure,
+    "/updates": _updates,
+}
+
+
+def _respond(dataset: Dataset, path: str, query: Query) -> tuple[str, bytes]:
+    """
+    Compute the response to a request.
+
+    Raises:
+        KeyError: If the path is not an endpoint.
+        ValueError: If a query parameter is invalid.
+
+    """
+    if path.startswith(FIGURES_PATH):
+        return _figure_file(dataset, path, query)
+
+    endpoint = ENDPOINTS.get(path)
+    if endpoint is None:
+        error_message = f"Unknown endpoint '{path}'."
+        raise KeyError(error_message)
+    return endpoint(dataset, query)
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """Answers GET requests from the analysis service."""
+
+    service: AnalysisService
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle a GET request."""
+        url = urlsplit(self.path)
+        try:
+            content_type, body = self.service.respond(url.path, url.query)
+            status = HTTPStatus.OK
+        except KeyError as e:
+            status = HTTPStatus.NOT_FOUND
+            content_type, body = _json({"error": e.args[0]})
+        except ValueError as e:
+            status = HTTPStatus.BAD_REQUEST
+            content_type, body = _json({"error": str(e)})
+        except FileNotFoundError as e:
+            status = HTTPStatus.SERVICE_UNAVAILABLE
+            content_type, body = _json({"error": str(e)})
+        except Exception:  # noqa: BLE001
+            # Answer every request, and keep the details in the server log
+            self.log_error("Failed to answer %s", self.path)
+            print_exc()
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            content_type, body = _json({"error": "Internal server error."})
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the analysis server until interrupted.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(description="Serve the empirical study.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    service = AnalysisService()
+    service.dataset()
+
+    AnalysisRequestHandler.service = service
+    with ThreadingHTTPServer((args.host, args.port), AnalysisRequestHandler) as server:
+        print(f"Serving the empirical study on http://{args.host}:{args.port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Server has been stopped.")
+
+
+if __name__ == "__main__":
+    main()
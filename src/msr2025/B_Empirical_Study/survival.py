@@ -0,0 +1,175 @@
+"""
+Run time-to-update survival analysis.
+
+Unlike RQ1, which only covers packages that eventually adopted log4j 2.17.0 or
+later, this analysis covers every package exposed to a vulnerable log4j version.
+Packages that have not updated yet are kept as right-censored observations,
+censored at the latest release in the dataset (a proxy for the snapshot date).
+
+This script:
+- Loads the release histories of all packages depending on log4j-core.
+- Builds a table with one row per exposed package (duration, update observed,
+  version change type) in a single vectorized pass.
+- Estimates the Kaplan-Meier curve of the time to update, and the cumulative
+  incidence (Aalen-Johansen) of updates of each version change type, which treats
+  the types as competing events.
+- Plots the cumulative share of updated packages, overall and by type (the types
+  sum to the overall share), and saves the curves as JSON.
+- Prints the median time to update and the share updated within 3 months and 1 year,
+  overall and by type. The median of a type is the time by which half of the
+  updates of that type had happened (half of the plateau of its cumulative
+  incidence), i.e., the median time to update among packages updating that way.
+"""
+
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from ..lib.columns import segment_arg_extreme
+from ..lib.files import save_json
+from .lib.constants import LOG4J_TIMESTAMP_2_17_0, ONE_DAY
+from .lib.files import load_release_columns, save_plot
+from .lib.survival import (
+    CumulativeIncidence,
+    SurvivalCurve,
+    cumulative_incidence,
+    incidence_at,
+    kaplan_meier,
+    median_incidence,
+    median_survival,
+    survival_at,
+)
+from .lib.versions import VERSION_CHANGE_TYPES, version_change_codes
+
+SAVE_FILE_NAME = "survival.pdf"
+SAVE_FILE_PATH = Path(f"output/B_Empirical_Study/{SAVE_FILE_NAME}")
+
+SAVE_CURVES_FILE_PATH = Path("output/B_Empirical_Study/survival.json")
+
+
+# Days within which the share of updated packages is reported
+DAYS_THREE_MONTHS = 90
+DAYS_ONE_YEAR = 365
+
+
+def _curve_to_dict(curve: SurvivalCurve) -> dict[str, list[float] | float]:
+    """Convert a survival curve and its median to JSON-serializable lists."""
+    return {
+        "median": median_survival(curve),
+        "times": curve["times"].tolist(),
+        "at_risk": curve["at_risk"].tolist(),
+        "events": curve["events"].tolist(),
+        "survival": curve["survival"].tolist(),
+    }
+
+
+def _incidence_to_dict(
+    curves: CumulativeIncidence,
+    kind: int,
+) -> dict[str, list[float] | float]:
+    """Convert the cumulative incidence of one kind and its median to lists."""
+    return {
+        "median": median_incidence(curves, kind),
+        "times": curves["times"].tolist(),
+        "at_risk": curves["at_risk"].tolist(),
+        "events": curves["events"][kind].tolist(),
+        "incidence": curves["incidence"][kind].tolist(),
+    }
+
+
+def main() -> None:
+    """Run time-to-update survival analysis."""
+    # Clear any existing plot
+    plt.clf()
+
+    # Load release histories in columnar form
+    columns = load_release_columns()
+    offsets = columns["offsets"]
+    vulnerable = columns["log4j_time"] < LOG4J_TIMESTAMP_2_17_0
+
+    # Latest release before 2.17.0 and earliest release after it, per package
+    previous = segment_arg_extreme(
+        columns["dependent_time"],
+        offsets,
+        vulnerable,
+        largest=True,
+    )
+    following = segment_arg_extreme(columns["dependent_time"], offsets, ~vulnerable)
+
+    # Keep packages that ever depended on a vulnerable version
+    exposed = previous >= 0
+    previous = previous[exposed]
+    following = following[exposed]
+    updated = following >= 0
+
+    # Updated packages contribute their gap, the others are censored at the end
+    observation_end = columns["dependent_time"].max()
+    update_time = np.where(
+        updated,
+        columns["dependent_time"][following],
+        observation_end,
+    )
+    durations = (update_time - LOG4J_TIMESTAMP_2_17_0) / ONE_DAY
+
+    # Version change type of each update (-1 for packages that have not updated)
+    changes = np.where(
+        updated,
+        version_change_codes(
+            columns["dependent_version"][previous],
+            columns["dependent_version"][following],
+        ),
+        -1,
+    )
+
+    # Estimate the curves; the version change types are competing events
+    overall = kaplan_meier(durations, updated)
+    incidence = cumulative_incidence(durations, changes, len(VERSION_CHANGE_TYPES))
+
+    # Plot the cumulative share of updated packages
+    plt.step(overall["times"], 1 - overall["survival"], where="post", label="overall")
+    for code, change in enumerate(VERSION_CHANGE_TYPES):
+        plt.step(
+            incidence["times"],
+            incidence["incidence"][code],
+            where="post",
+            label=change,
+        )
+    plt.xlabel("Number of days from publication of log4j 2.17.0")
+    plt.ylabel("Share of exposed packages updated")
+    plt.legend()
+    save_plot(SAVE_FILE_NAME)
+
+    curves: dict[str, dict[str, list[float] | float]] = {
+        "overall": _curve_to_dict(overall),
+        **{
+            change: _incidence_to_dict(incidence, code)
+            for code, change in enumerate(VERSION_CHANGE_TYPES)
+        },
+    }
+    save_json(curves, SAVE_CURVES_FILE_PATH)
+
+    # Output statistics
+    print(f"Exposed packages : {exposed.sum()}")
+    print(f"Updated packages : {updated.sum()}")
+    print(f"Censored packages: {(~updated).sum()}")
+    print(
+        f"Overall: median {median_survival(overall):.0f} days, "
+        f"{1 - survival_at(overall, DAYS_THREE_MONTHS):.2%} in 3 months, "
+        f"{1 - survival_at(overall, DAYS_ONE_YEAR):.2%} in a year",
+    )
+    for code, change in enumerate(VERSION_CHANGE_TYPES):
+        print(
+            f"{change.capitalize():<7}: "
+            f"median {median_incidence(incidence, code):.0f} days "
+            f"(half of the {change} updates), "
+            f"{incidence_at(incidence, code, DAYS_THREE_MONTHS):.2%} in 3 months, "
+            f"{incidence_at(incidence, code, DAYS_ONE_YEAR):.2%} in a year",
+        )
+
+    print(f"Plot has been saved to: '{SAVE_FILE_PATH}'")
+    print(f"Curves have been saved to: '{SAVE_CURVES_FILE_PATH}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Run uncertainty analysis for RQ2-1 and RQ2-2.
+
+This script:
+- Loads the dataset of package updates.
+- Computes bootstrap confidence intervals and permutation p-values for the Pearson,
+  Spearman and Kendall correlations between update delay and release frequency
+  (RQ2-1).
+- Computes bootstrap confidence intervals of the median update delay for each
+  version change type, and permutation p-values for their pairwise differences
+  (RQ2-2).
+
+Resampling is spread across a process pool; results depend only on the seed.
+"""
+
+import argparse
+from itertools import combinations
+
+import numpy as np
+
+from .lib.constants import ONE_DAY
+from .lib.files import load_source_file
+from .lib.resampling import (
+    CORRELATION_METHODS,
+    bootstrap_correlation,
+    bootstrap_median,
+    permutation_test_correlation,
+    permutation_test_median_difference,
+)
+from .lib.versions import VERSION_CHANGE_TYPES, group_by_version_change
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run uncertainty analysis for RQ2-1 and RQ2-2.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Bootstrap confidence intervals and permutation tests.",
+    )
+    parser.add_argument("--resamples", type=int, default=10_000)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: all CPUs)",
+    )
+    args = parser.parse_args(argv)
+
+    # Load release data
+    results = load_source_file()
+    gaps = np.array([r.gap for r in results]) / ONE_DAY
+    release_frequencies = np.array([r.release_frequency for r in results]) / ONE_DAY
+
+    # RQ2-1: Correlation between update delay and release frequency
+    print(f"RQ2-1 ({args.confidence:.0%} CI, {args.resamples} resamples)")
+    for method in CORRELATION_METHODS:
+        interval = bootstrap_correlation(
+            gaps,
+            release_frequencies,
+            method,
+            resamples=args.resamples,
+            confidence=args.confidence,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        test = permutation_test_correlation(
+            gaps,
+            release_frequencies,
+            method,
+            permutations=args.resamples,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        print(
+            f"{method.capitalize():<8} correlation: {interval['estimate']:.2f} "
+            f"[{interval['low']:.2f}, {interval['high']:.2f}] "
+            f"(p = {test['p_value']:.4f})",
+        )
+
+    # RQ2-2: Median update delay per version change type
+    groups = {
+        change: np.array([r.gap for r in updates]) / ONE_DAY
+        for change, updates in group_by_version_change(results).items()
+    }
+
+    print(f"\nRQ2-2 ({args.confidence:.0%} CI, {args.resamples} resamples)")
+    for change in VERSION_CHANGE_TYPES:
+        interval = bootstrap_median(
+            groups[change],
+            resamples=args.resamples,
+            confidence=args.confidence,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        print(
+            f"{change.capitalize():<5} median: {interval['estimate']:.0f} "
+            f"[{interval['low']:.0f}, {interval['high']:.0f}]",
+        )
+
+    for a, b in combinations(VERSION_CHANGE_TYPES, 2):
+        test = permutation_test_median_difference(
+            groups[a],
+            groups[b],
+            permutations=args.resamples,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        print(
+            f"{a.capitalize()} - {b.capitalize()}: {test['statistic']:+.0f} days "
+            f"(p = {test['p_value']:.4f})",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,27 +4,154 @@ Main launcher for the MSR 2025 Mining Challenge project.
 This script sequentially runs:
 1. A_Data_Preparation_and_Extraction: Prepares and labels data in Neo4j.
 2. B_Empirical_Study: Performs empirical analysis on the prepared data.
+
+Each script is a stage with declared inputs and outputs. A stage is skipped when
+its inputs (files, or the contents of the Neo4j database) are unchanged since it
+last ran, so a repeated run without changes finishes almost instantly.
+
+With `--sample`, only a stratified sample of the dependent artifacts is extracted
+and the RQ scripts report estimates with sampling errors (see `data_extraction`).
 """
 
-from . import A_Data_Preparation_and_Extraction, B_Empirical_Study
+import argparse
+
+from .A_Data_Preparation_and_Extraction import data_extraction, data_preparation
+from .B_Empirical_Study import adoption, exposure, rq1, rq2_1, rq2_2, survival
+from .B_Empirical_Study.lib.constants import RELEASES_FILE_PATH, SOURCE_FILE_PATH
+from .lib.history import HISTORY_FILE_PATH
+from .lib.pipeline import Stage, run_pipeline, source_files
+from .lib.sampling import DEFAULT_SEED, SAMPLE_FILE_PATH, STRATA_BY
+
+
+def stages(extraction_argv: list[str] | None = None) -> list[Stage]:
+    """
+    Describe the pipeline as stages.
+
+    Graph fingerprint -> 'data_releases.json' -> 'data_updates.json' -> PDFs.
+
+    The inputs of every stage include the source code of its script and of every
+    module of the project the script imports, so that editing a shared library
+    module reruns the stages that use it. The RQ scripts that weight their
+    estimates by the sample design also depend on 'data_updates_sample.json'.
 
+    Args:
+        extraction_argv (list[str] | None): Command line arguments of
+            `data_extraction` (e.g., its sampling options).
 
-def main() -> None:
+    Returns:
+        list[Stage]: The stages, in execution order.
+
+    """
+    extraction_argv = extraction_argv or []
+    return [
+        Stage(
+            name="data_preparation",
+            run=lambda: data_preparation.main([]),
+            inputs=source_files(data_preparation),
+            outputs=(data_preparation.SAVE_FILE_PATH, HISTORY_FILE_PATH),
+            fingerprint=data_preparation.graph_fingerprint,
+        ),
+        Stage(
+            name="data_extraction",
+            run=lambda: data_extraction.main(extraction_argv),
+            inputs=(*source_files(data_extraction), data_extraction.SOURCE_FILE_PATH),
+            outputs=(data_extraction.SAVE_FILE_PATH,),
+            fingerprint=lambda: " ".join(extraction_argv),
+        ),
+        Stage(
+            name="rq1",
+            run=lambda: rq1.main([]),
+            inputs=(*source_files(rq1), SOURCE_FILE_PATH, SAMPLE_FILE_PATH),
+            outputs=(rq1.SAVE_FILE_PATH,),
+        ),
+        Stage(
+            name="rq2_1",
+            run=lambda: rq2_1.main([]),
+            inputs=(*source_files(rq2_1), SOURCE_FILE_PATH),
+            outputs=(rq2_1.SAVE_FILE_PATH,),
+        ),
+        Stage(
+            name="rq2_2",
+            run=lambda: rq2_2.main([]),
+            inputs=(*source_files(rq2_2), SOURCE_FILE_PATH, SAMPLE_FILE_PATH),
+            outputs=(rq2_2.SAVE_FILE_PATH, rq2_2.SAVE_FILE_PATH_NO_OUTLIER),
+        ),
+        Stage(
+            name="survival",
+            run=survival.main,
+            inputs=(*source_files(survival), RELEASES_FILE_PATH),
+            outputs=(survival.SAVE_FILE_PATH, survival.SAVE_CURVES_FILE_PATH),
+        ),
+        Stage(
+            name="exposure",
+            run=exposure.main,
+            inputs=(*source_files(exposure), RELEASES_FILE_PATH),
+            outputs=(exposure.SAVE_FILE_PATH, exposure.SAVE_TIMELINE_FILE_PATH),
+        ),
+        Stage(
+            name="adoption",
+            run=adoption.main,
+            inputs=(*source_files(adoption), RELEASES_FILE_PATH),
+            outputs=(adoption.SAVE_FILE_PATH, adoption.SAVE_RESULTS_FILE_PATH),
+        ),
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Launch the MSR 2025 Mining Challenge pipeline.
 
     1. Prepare and extract data in Neo4j
     2. Perform empirical study on the prepared data
+
+    Stages whose inputs are unchanged since their last run are skipped.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
     """
-    print("\n========================================")
-    print(" Step 1: Data Preparation & Extraction ")
-    print("========================================")
-    A_Data_Preparation_and_Extraction.main()
-
-    print("\n========================================")
-    print(" Step 2: Empirical Study ")
-    print("========================================")
-    B_Empirical_Study.main()
+    parser = argparse.ArgumentParser(description="Run the whole pipeline.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run every stage, even if it is up to date",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=[stage.name for stage in stages()],
+        default=None,
+        help="run this stage and every later one, even if up to date",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        default=None,
+        metavar="FRACTION",
+        help="only extract this share of the artifacts of each stratum",
+    )
+    parser.add_argument(
+        "--strata",
+        choices=STRATA_BY,
+        default=STRATA_BY[0],
+        help="stratify the sample by groupId prefix or by number of releases",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help="seed of the sample",
+    )
+    args = parser.parse_args(argv)
+
+    extraction_argv: list[str] = []
+    if args.sample is not None:
+        extraction_argv = ["--sample", str(args.sample), "--strata", args.strata]
+        extraction_argv += ["--seed", str(args.seed)]
+    run_pipeline(
+        stages(extraction_argv),
+        force=args.force,
+        from_stage=args.from_stage,
+    )
 
 
 if __name__ == "__main__":
@@ -4,16 +4,66 @@ lib package for shared utility functions.
 This package provides reusable tools for:
 - loading environment variables from a .env file,
 - saving and loading JSON files with automatic directory handling,
-- running CLI tasks with spinner animations for visual feedback.
+- running CLI tasks with spinner animations for visual feedback,
+- flattening release histories into NumPy columns and caching them,
+- decoding the pipeline's JSON files into typed, slot-based records,
+- looking up the release history of one artifact in an indexed store,
+- drawing deterministic stratified samples of artifacts,
+- sorting and grouping release rows that do not fit in memory.
 """
 
+from .columns import (
+    COLUMNS_FILE_PATH,
+    ReleaseColumns,
+    from_release_columns,
+    map_release_columns,
+    read_release_columns,
+    save_release_columns,
+    select_artifacts,
+    to_release_columns,
+)
 from .envs import getenv
+from .external_sort import group_release_rows, sort_release_rows, version_key
 from .files import load_json, save_json
+from .history import HistoryStore, build_history_store
+from .records import (
+    Release,
+    ReleaseHistory,
+    ReleaseRow,
+    Update,
+    iter_release_rows,
+    load_release_histories,
+    load_updates,
+)
+from .sampling import SampleDesign, stratified_sample, stratum_of
 from .tasks import run_task
 
 __all__ = [
+    "COLUMNS_FILE_PATH",
+    "HistoryStore",
+    "Release",
+    "ReleaseColumns",
+    "ReleaseHistory",
+    "ReleaseRow",
+    "SampleDesign",
+    "Update",
+    "build_history_store",
+    "from_release_columns",
     "getenv",
+    "group_release_rows",
+    "iter_release_rows",
     "load_json",
+    "load_release_histories",
+    "load_updates",
+    "map_release_columns",
+    "read_release_columns",
     "run_task",
     "save_json",
+    "save_release_columns",
+    "select_artifacts",
+    "sort_release_rows",
+    "stratified_sample",
+    "stratum_of",
+    "to_release_columns",
+    "version_key",
 ]
@@ -0,0 +1,312 @@
+"""
+Provides a columnar representation of per-artifact release histories.
+
+Includes:
+- ReleaseColumns: Release histories flattened into NumPy arrays, with an offsets
+  array delimiting the releases of each artifact (artifact `i` owns the releases
+  `offsets[i]:offsets[i + 1]`).
+- to_release_columns: Builds the columns from the release histories of
+  'data_releases.json'.
+- from_release_columns: Turns the columns back into release histories.
+- Segment helpers that reduce the releases of every artifact at once, without
+  per-artifact Python loops.
+- select_artifacts: Keeps the release histories of a subset of artifacts.
+- save_release_columns / read_release_columns: Caches the columns in a NumPy
+  '.npz' file, which loads without parsing JSON or building records.
+- map_release_columns: Memory-maps the cached columns instead of loading them,
+  so that processes reading parts of them share the pages of the file.
+"""
+
+import math
+import struct
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, TypedDict
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .records import Release, ReleaseHistory
+
+# Path to the cached columns of the release histories
+COLUMNS_FILE_PATH = Path(
+    "./output/A_Data_Preparation_and_Extraction/data_releases.npz",
+)
+
+# Fixed part of a ZIP local file header, ending with the lengths of the file name
+# and of the extra field that precede the member's data
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+class ReleaseColumns(TypedDict):
+    """
+    Release histories of all artifacts in columnar form.
+
+    Attributes:
+        artifact_ids (NDArray[np.str_]): Artifact id of each history.
+        offsets (NDArray[np.int64]): Start of each history in the release columns,
+            followed by the total number of releases.
+        dependent_time (NDArray[np.int64]): Timestamp of each dependent release.
+        dependent_version (NDArray[np.str_]): Version of each dependent release.
+        log4j_time (NDArray[np.int64]): Timestamp of the log4j version depended on.
+        log4j_version (NDArray[np.str_]): Version of log4j depended on.
+
+    """
+
+    artifact_ids: NDArray[np.str_]
+    offsets: NDArray[np.int64]
+    dependent_time: NDArray[np.int64]
+    dependent_version: NDArray[np.str_]
+    log4j_time: NDArray[np.int64]
+    log4j_version: NDArray[np.str_]
+
+
+def to_release_columns(source: Iterable[ReleaseHistory]) -> ReleaseColumns:
+    """
+    Flatten release histories into columns.
+
+    Args:
+        source (Iterable[ReleaseHistory]): Release histories of all artifacts.
+
+    Returns:
+        ReleaseColumns: The release histories in columnar form.
+
+    """
+    artifact_ids: list[str] = []
+    lengths: list[int] = []
+    dependent_time: list[int] = []
+    dependent_version: list[str] = []
+    log4j_time: list[int] = []
+    log4j_version: list[str] = []
+
+    # Single pass, so that a streamed source is never held as records all at once
+    for artifact_id, releases in source:
+        artifact_ids.append(artifact_id)
+        lengths.append(len(releases))
+        for r in releases:
+            dependent_time.append(r.dependent_time)
+            dependent_version.append(r.dependent_version)
+            log4j_time.append(r.log4j_time)
+            log4j_version.append(r.log4j_version)
+
+    return {
+        "artifact_ids": np.array(artifact_ids, dtype=np.str_),
+        "offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        "dependent_time": np.array(dependent_time, dtype=np.int64),
+        "dependent_version": np.array(dependent_version, dtype=np.str_),
+        "log4j_time": np.array(log4j_time, dtype=np.int64),
+        "log4j_version": np.array(log4j_version, dtype=np.str_),
+    }
+
+
+def from_release_columns(columns: ReleaseColumns) -> Iterator[ReleaseHistory]:
+    """
+    Turn columns back into release histories.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+
+    Yields:
+        ReleaseHistory: The release history of each artifact, in order.
+
+    """
+    offsets = columns["offsets"].tolist()
+    releases = [
+        Release(*fields)
+        for fields in zip(
+            columns["dependent_time"].tolist(),
+            columns["dependent_version"].tolist(),
+            columns["log4j_time"].tolist(),
+            columns["log4j_version"].tolist(),
+            strict=True,
+        )
+    ]
+    for i, artifact_id in enumerate(columns["artifact_ids"].tolist()):
+        yield artifact_id, releases[offsets[i] : offsets[i + 1]]
+
+
+def segment_ids(offsets: NDArray[np.int64]) -> NDArray[np.int64]:
+    """
+    Return the index of the owning artifact for every release.
+
+    Args:
+        offsets (NDArray[np.int64]): Offsets array of a `ReleaseColumns`.
+
+    Returns:
+        NDArray[np.int64]: Artifact index of each release.
+
+    """
+    return np.repeat(np.arange(offsets.size - 1, dtype=np.int64), np.diff(offsets))
+
+
+def segment_arg_extreme(
+    values: NDArray[np.int64],
+    offsets: NDArray[np.int64],
+    mask: NDArray[np.bool_] | None = None,
+    *,
+    largest: bool = False,
+) -> NDArray[np.int64]:
+    """
+    Find the position of the smallest or largest value of every artifact.
+
+    Ties are resolved in favor of the earliest release, like Python's `min`/`max`.
+
+    Args:
+        values (NDArray[np.int64]): One value per release.
+        offsets (NDArray[np.int64]): Offsets array of a `ReleaseColumns`.
+        mask (NDArray[np.bool_] | None): Only releases where the mask is True
+            are considered (default: all releases).
+        largest (bool): Find the largest instead of the smallest value.
+
+    Returns:
+        NDArray[np.int64]: Release index per artifact, or -1 if an artifact has
+        no release that passes the mask.
+
+    """
+    candidates = np.arange(values.size) if mask is None else np.flatnonzero(mask)
+    segments = segment_ids(offsets)[candidates]
+    keys = -values[candidates] if largest else values[candidates]
+
+    # Sort by artifact, then value, then position, and keep the first of each artifact
+    order = np.lexsort((candidates, keys, segments))
+    ordered_segments = segments[order]
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = ordered_segments[1:] != ordered_segments[:-1]
+
+    result = np.full(offsets.size - 1, -1, dtype=np.int64)
+    result[ordered_segments[first]] = candidates[order][first]
+    return result
+
+
+def select_artifacts(
+    columns: ReleaseColumns,
+    keep: NDArray[np.bool_],
+) -> ReleaseColumns:
+    """
+    Keep the release histories of a subset of artifacts.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+        keep (NDArray[np.bool_]): Whether to keep each artifact.
+
+    Returns:
+        ReleaseColumns: The release histories of the kept artifacts, in order.
+
+    """
+    offsets = columns["offsets"]
+    kept_releases = keep[segment_ids(offsets)]
+    lengths = np.diff(offsets)[keep]
+
+    return {
+        "artifact_ids": columns["artifact_ids"][keep],
+        "offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        "dependent_time": columns["dependent_time"][kept_releases],
+        "dependent_version": columns["dependent_version"][kept_releases],
+        "log4j_time": columns["log4j_time"][kept_releases],
+        "log4j_version": columns["log4j_version"][kept_releases],
+    }
+
+
+def save_release_columns(columns: ReleaseColumns, path: Path) -> None:
+    """
+    Save release histories in columnar form to an '.npz' file.
+
+    Args:
+        columns (ReleaseColumns): Release histories of all artifacts.
+        path (Path): Path to save the columns to.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as file:
+        # Uncompressed, so that `map_release_columns` can map the members
+        np.savez(file, **columns)
+
+
+def read_release_columns(path: Path) -> ReleaseColumns:
+    """
+    Load release histories saved by `save_release_columns`.
+
+    Args:
+        path (Path): Path to the '.npz' file.
+
+    Returns:
+        ReleaseColumns: The release histories of all artifacts in columnar form.
+
+    """
+    with np.load(path, allow_pickle=False) as data:
+        return {
+            "artifact_ids": data["artifact_ids"],
+            "offsets": data["offsets"],
+            "dependent_time": data["dependent_time"],
+            "dependent_version": data["dependent_version"],
+            "log4j_time": data["log4j_time"],
+            "log4j_version": data["log4j_version"],
+        }
+
+
+def _map_member(path: Path, member: zipfile.ZipInfo) -> NDArray[Any]:
+    """Memory-map an array stored uncompressed in an '.npz' file."""
+    with path.open("rb") as file:
+        file.seek(member.header_offset)
+        header = _ZIP_LOCAL_HEADER.unpack(file.read(_ZIP_LOCAL_HEADER.size))
+        file.seek(sum(header[-2:]), 1)
+        # numpy's stubs leave the '.npy' header readers untyped
+        version = np.lib.format.read_magic(file)  # type: ignore[no-untyped-call]
+        read_header = (
+            np.lib.format.read_array_header_1_0
+            if version == (1, 0)
+            else np.lib.format.read_array_header_2_0
+        )
+        shape, fortran_order, dtype = read_header(file)  # type: ignore[no-untyped-call]
+        offset = file.tell()
+
+    if math.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def map_release_columns(path: Path) -> ReleaseColumns:
+    """
+    Memory-map release histories saved by `save_release_columns`.
+
+    Nothing is read until the arrays are accessed, and then only the accessed
+    pages, which the operating system shares between all processes mapping the
+    file. Compressed members, which cannot be mapped, are loaded instead.
+
+    Args:
+        path (Path): Path to the '.npz' file.
+
+    Returns:
+        ReleaseColumns: The release histories of all artifacts, as read-only
+        arrays backed by the file.
+
+    """
+    arrays: dict[str, NDArray[Any]] = {}
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+    for member in members:
+        if member.compress_type == zipfile.ZIP_STORED:
+            arrays[member.filename.removesuffix(".npy")] = _map_member(path, member)
+    if len(arrays) < len(members):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {
+                name: arrays[name] if name in arrays else data[name]
+                for name in data.files
+            }
+
+    return {
+        "artifact_ids": arrays["artifact_ids"],
+        "offsets": arrays["offsets"],
+        "dependent_time": arrays["dependent_time"],
+        "dependent_version": arrays["dependent_version"],
+        "log4j_time": arrays["log4j_time"],
+        "log4j_version": arrays["log4j_version"],
+    }
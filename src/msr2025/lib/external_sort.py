@@ -0,0 +1,255 @@
+"""
+Sorts and groups release rows that do not fit in memory.
+
+Includes:
+- version_key: The (major, minor, patch) sort key of a version, like the
+  `toInteger(split(version, '.'))` of the export query.
+- sort_release_rows: Orders release rows by artifact id and version within a
+  fixed memory budget.
+- group_release_rows: Groups ordered release rows into release histories.
+
+Rows are buffered until the budget is reached, sorted, and spilled to a
+temporary file as a run of compact binary records (a fixed `struct` header
+followed by the UTF-8 strings). The runs are then merged with a k-way heap merge.
+If there are more runs than `fan_in`, groups of runs are first merged into
+longer runs, so that only `fan_in` files are open at a time. Rows with equal keys
+keep their input order, so the result is deterministic.
+"""
+
+import heapq
+import itertools
+import struct
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from .records import Release, ReleaseHistory, ReleaseRow
+
+# Default memory budget of the row buffer (in bytes)
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Approximate size of a buffered row besides its strings: the tuple, the
+# integers and the string object headers (in bytes)
+ROW_OVERHEAD = 450
+
+# Maximum number of runs merged at once, and its lower bound
+MAX_FAN_IN = 64
+MIN_FAN_IN = 2
+
+# Buffer size of each run file (in bytes)
+RUN_BUFFER_SIZE = 1 << 20
+
+# Sort key of version parts that are not integers (sorted last, like null)
+NON_INTEGER_KEY = (1 << 63) - 1
+
+# Number of version parts in the sort key
+VERSION_KEY_PARTS = 3
+
+# major, minor, patch, sequence, dependent_time, log4j_time and the byte lengths
+# of the artifact id, the dependent version and the log4j version
+_HEADER = struct.Struct("<6q3H")
+
+# Largest string a record can hold
+_MAX_STRING_BYTES = (1 << 16) - 1
+
+# A buffered row: sort key (artifact id, major, minor, patch, input position),
+# then the release fields
+type _SortRecord = tuple[str, int, int, int, int, int, str, int, str]
+
+
+def version_key(version: str) -> tuple[int, int, int]:
+    """
+    Compute the sort key of a version.
+
+    Args:
+        version (str): A version such as '1.2.3'.
+
+    Returns:
+        tuple[int, int, int]: Its first three dot-separated parts as integers;
+        missing or non-integer parts sort last.
+
+    """
+    parts = version.split(".")[:VERSION_KEY_PARTS]
+    parts += [""] * (VERSION_KEY_PARTS - len(parts))
+    major, minor, patch = (
+        int(p) if p.isdecimal() and int(p) < NON_INTEGER_KEY else NON_INTEGER_KEY
+        for p in parts
+    )
+    return major, minor, patch
+
+
+def _encode(record: _SortRecord) -> bytes:
+    """Encode a sort record as a binary record."""
+    (
+        artifact_id,
+        major,
+        minor,
+        patch,
+        sequence,
+        dependent_time,
+        dependent_version,
+        log4j_time,
+        log4j_version,
+    ) = record
+    strings = [s.encode() for s in (artifact_id, dependent_version, log4j_version)]
+    if any(len(s) > _MAX_STRING_BYTES for s in strings):
+        error_message = f"Release of '{artifact_id}' has a string over 64 KiB."
+        raise ValueError(error_message)
+
+    header = _HEADER.pack(
+        major,
+        minor,
+        patch,
+        sequence,
+        dependent_time,
+        log4j_time,
+        *(len(s) for s in strings),
+    )
+    return header + b"".join(strings)
+
+
+def _write_run(path: Path, records: Iterable[_SortRecord]) -> None:
+    """Write sorted records to a run file."""
+    with path.open("wb", buffering=RUN_BUFFER_SIZE) as file:
+        for record in records:
+            file.write(_encode(record))
+
+
+def _read_run(path: Path) -> Iterator[_SortRecord]:
+    """Read the records of a run file, in order."""
+    with path.open("rb", buffering=RUN_BUFFER_SIZE) as file:
+        while header := file.read(_HEADER.size):
+            major, minor, patch, sequence, dependent_time, log4j_time, *lengths = (
+                _HEADER.unpack(header)
+            )
+            artifact_id, dependent_version, log4j_version = (
+                file.read(length).decode() for length in lengths
+            )
+            yield (
+                artifact_id,
+                major,
+                minor,
+                patch,
+                sequence,
+                dependent_time,
+                dependent_version,
+                log4j_time,
+                log4j_version,
+            )
+
+
+def _merge_runs(
+    runs: list[Path],
+    directory: Path,
+    fan_in: int,
+) -> Iterator[_SortRecord]:
+    """
+    Merge sorted runs, in several passes if there are more than `fan_in`.
+
+    Args:
+        runs (list[Path]): The run files, each sorted.
+        directory (Path): Directory for intermediate runs.
+        fan_in (int): Maximum number of runs merged at once.
+
+    Yields:
+        _SortRecord: The records of all runs, in order.
+
+    """
+    counter = itertools.count(len(runs))
+    while len(runs) > fan_in:
+        merged: list[Path] = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i : i + fan_in]
+            path = directory / f"run-{next(counter)}.bin"
+            _write_run(path, heapq.merge(*(_read_run(run) for run in group)))
+            for run in group:
+                run.unlink()
+            merged.append(path)
+        runs = merged
+
+    yield from heapq.merge(*(_read_run(run) for run in runs))
+
+
+def sort_release_rows(
+    rows: Iterable[ReleaseRow],
+    memory_limit: int = MEMORY_LIMIT,
+    fan_in: int = MAX_FAN_IN,
+    spill_dir: Path | None = None,
+) -> Iterator[ReleaseRow]:
+    """
+    Order release rows by artifact id and version, within a memory budget.
+
+    The order matches `ORDER BY artifactId, major, minor, patch` of the export
+    query. Spilled runs are deleted once the result has been consumed.
+
+    Args:
+        rows (Iterable[ReleaseRow]): Release rows in any order.
+        memory_limit (int): Approximate memory budget of the row buffer (in
+            bytes).
+        fan_in (int): Maximum number of runs merged at once (at least 2).
+        spill_dir (Path | None): Directory for the runs (default: the system's
+            temporary directory).
+
+    Yields:
+        ReleaseRow: The rows, ordered.
+
+    Raises:
+        ValueError: If `fan_in` is less than 2.
+
+    """
+    if fan_in < MIN_FAN_IN:
+        error_message = f"fan_in must be at least {MIN_FAN_IN}, got {fan_in}."
+        raise ValueError(error_message)
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        runs: list[Path] = []
+        buffer: list[_SortRecord] = []
+        size = 0
+        for sequence, (artifact_id, release) in enumerate(rows):
+            buffer.append(
+                (
+                    artifact_id,
+                    *version_key(release.dependent_version),
+                    sequence,
+                    release.dependent_time,
+                    release.dependent_version,
+                    release.log4j_time,
+                    release.log4j_version,
+                ),
+            )
+            size += ROW_OVERHEAD + len(artifact_id)
+            size += len(release.dependent_version) + len(release.log4j_version)
+            if size >= memory_limit:
+                buffer.sort()
+                runs.append(Path(directory) / f"run-{len(runs)}.bin")
+                _write_run(runs[-1], buffer)
+                buffer.clear()
+                size = 0
+
+        # Without any spill, the rows are sorted entirely in memory
+        buffer.sort()
+        if runs:
+            runs.append(Path(directory) / f"run-{len(runs)}.bin")
+            _write_run(runs[-1], buffer)
+            buffer.clear()
+            records: Iterator[_SortRecord] = _merge_runs(runs, Path(directory), fan_in)
+        else:
+            records = iter(buffer)
+
+        for record in records:
+            yield record[0], Release(record[5], record[6], record[7], record[8])
+
+
+def group_release_rows(rows: Iterable[ReleaseRow]) -> Iterator[ReleaseHistory]:
+    """
+    Group ordered release rows into the release history of each artifact.
+
+    Args:
+        rows (Iterable[ReleaseRow]): Release rows ordered by artifact id.
+
+    Yields:
+        ReleaseHistory: The release history of each artifact, in order.
+
+    """
+    for artifact_id, group in itertools.groupby(rows, key=lambda row: row[0]):
+        yield artifact_id, [release for _, release in group]
@@ -1,10 +1,133 @@
-"""Utility functions for file operations: saving and loading JSON data."""
+"""
+Utility functions for file operations: saving and loading JSON data.
+
+When `orjson` is installed (the `fast` extra) it is used as a faster drop-in JSON
+codec; otherwise the standard library `json` module is used. Both produce the same
+JSON documents: NaN and infinite floats, which JSON cannot represent, are written as
+null by both.
+
+Large JSON arrays can also be read and written one element at a time
+(`iter_json_records`, `JsonArrayWriter`), so that memory use does not grow with
+the number of elements.
+"""
+
+from __future__ import annotations
 
 import json
+import math
+import re
+import shutil
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from io import BufferedWriter
+    from types import TracebackType
+    from typing import TextIO
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Number of characters read at a time when streaming a JSON array
+CHUNK_SIZE = 1 << 16
+
+# Suffix of JSON Lines files (one JSON value per line)
+JSON_LINES_SUFFIX = ".jsonl"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that may follow a complete element of a JSON array
+_DELIMITERS = frozenset(" \t\n\r,]")
+
+
+def _finite(data: Any) -> Any:  # noqa: ANN401
+    """
+    Replace NaN and infinite floats with None, as `orjson` does.
+
+    Args:
+        data (Any): JSON-serializable data.
+
+    Returns:
+        Any: The data, with every non-finite float nested in it replaced.
+
+    """
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _finite(value) for key, value in data.items()}
+    if isinstance(data, list | tuple):
+        return [_finite(value) for value in data]
+    return data
+
+
+def _to_builtin(obj: object) -> Any:  # noqa: ANN401
+    """
+    Convert objects the standard library cannot serialize into JSON values.
+
+    Args:
+        obj (object): The object to convert (e.g., a record dataclass).
+
+    Returns:
+        Any: A JSON-serializable equivalent of the object, without non-finite
+        floats.
+
+    Raises:
+        TypeError: If the object has no JSON equivalent.
+
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return _finite(asdict(obj))
+    if hasattr(obj, "tolist"):
+        return _finite(obj.tolist())
 
+    error_message = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(error_message)
 
-def save_json(data: dict, path: Path) -> None:  # type: ignore[type-arg]
+
+def _dumps(data: object, *, indent: bool) -> bytes:
+    """
+    Serialize data to JSON with the fastest available codec.
+
+    Args:
+        data (object): The data to serialize.
+        indent (bool): Indent with 2 spaces, or write compact JSON.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+
+    Raises:
+        TypeError: If the data is not JSON serializable.
+
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        document: bytes = orjson.dumps(data, default=_to_builtin, option=option)
+        return document
+
+    options: dict[str, Any] = {"indent": 2} if indent else {"separators": (",", ":")}
+    try:
+        text = json.dumps(data, allow_nan=False, default=_to_builtin, **options)
+    except ValueError:
+        # Only data with non-finite floats is copied
+        data = _finite(data)
+        text = json.dumps(data, allow_nan=False, default=_to_builtin, **options)
+    return text.encode()
+
+
+def save_json(
+    data: object,
+    path: Path,
+    *,
+    indent: bool = True,
+) -> None:
     """
     Save data to a file in JSON format.
 
@@ -12,8 +135,10 @@ def save_json(data: dict, path: Path) -> None:  # type: ignore[type-arg]
     data to the specified path in JSON format with an indentation of 2 spaces.
 
     Args:
-        data (dict): The data to be serialized and saved as JSON.
+        data (object): The data to be serialized and saved as JSON.
         path (Path): The destination file path where the JSON will be saved.
+        indent (bool): Indent with 2 spaces (default). Pass False to write compact
+            JSON, which is faster to write and to parse.
 
     Raises:
         OSError: If the directory or file cannot be created or written.
@@ -22,8 +147,7 @@ def save_json(data: dict, path: Path) -> None:  # type: ignore[type-arg]
     """
     try:
         Path.mkdir(path.parent, parents=True, exist_ok=True)
-        with Path.open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        path.write_bytes(_dumps(data, indent=indent))
     except OSError as e:
         error_message = f"Failed to save JSON to '{path}': {e}"
         raise OSError(error_message) from e
@@ -32,14 +156,41 @@ def save_json(data: dict, path: Path) -> None:  # type: ignore[type-arg]
         raise TypeError(error_message) from e
 
 
-def load_json(path: Path) -> dict:  # type: ignore[type-arg]
+def _apply_object_hook(
+    data: Any,  # noqa: ANN401
+    object_hook: Callable[[dict[str, Any]], Any],
+) -> Any:  # noqa: ANN401
+    """Pass every JSON object nested in parsed data through a hook, innermost first."""
+    if isinstance(data, list):
+        for i, value in enumerate(data):
+            if isinstance(value, list | dict):
+                data[i] = _apply_object_hook(value, object_hook)
+        return data
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, list | dict):
+                data[key] = _apply_object_hook(value, object_hook)
+        return object_hook(data)
+    return data
+
+
+def load_json(
+    path: Path,
+    object_hook: Callable[[dict[str, Any]], Any] | None = None,
+) -> dict:  # type: ignore[type-arg]
     """
     Load data from a JSON file.
 
     Reads the specified JSON file and returns the parsed Python object.
 
+    With the standard library codec, `object_hook` replaces each JSON object while
+    it is parsed, so no tree of dicts is built first. `orjson` has no hooks but
+    parses much faster, so its result is passed through the hook afterwards.
+
     Args:
         path (Path): The path to the JSON file to read.
+        object_hook (Callable[[dict[str, Any]], Any] | None): Function called with
+            every decoded JSON object, innermost first, whose result replaces it.
 
     Returns:
         Any: The data parsed from the JSON file.
@@ -53,5 +204,365 @@ def load_json(path: Path) -> dict:  # type: ignore[type-arg]
         error_message = f"File not found: '{path}'"
         raise FileNotFoundError(error_message)
 
+    if HAS_ORJSON:
+        data = orjson.loads(path.read_bytes())
+        if object_hook is not None:
+            data = _apply_object_hook(data, object_hook)
+        return data  # type: ignore[no-any-return]
+
     with Path.open(path) as f:
-        return json.load(f)  # type: ignore[no-any-return]
+        return json.load(f, object_hook=object_hook)  # type: ignore[no-any-return]
+
+
+class _ArrayReader:
+    """
+    A buffered reader of the tokens of a JSON array in a text file.
+
+    Attributes:
+        file (TextIO): The file being read.
+        chunk_size (int): Number of characters read at a time.
+        buffer (str): Characters read but not consumed yet, from `offset` on.
+        position (int): Position of the next character in the buffer.
+        offset (int): Position of the buffer in the file.
+
+    """
+
+    __slots__ = ("buffer", "chunk_size", "file", "offset", "position")
+
+    def __init__(self, file: TextIO, chunk_size: int) -> None:
+        """
+        Initialize the reader at the start of the file.
+
+        Args:
+            file (TextIO): The file to read.
+            chunk_size (int): Number of characters read at a time.
+
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = file.read(chunk_size)
+        self.position = 0
+        self.offset = 0
+
+    def peek(self) -> str | None:
+        """
+        Skip whitespace and return the next character without consuming it.
+
+        Returns:
+            str | None: The next character, or None at the end of the file.
+
+        """
+        while True:
+            whitespace = _WHITESPACE.match(self.buffer, self.position)
+            self.position = whitespace.end() if whitespace else self.position
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            # Refill the buffer once it is exhausted
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                return None
+            self.buffer, self.position, self.offset = (
+                chunk,
+                0,
+                self.offset + len(self.buffer),
+            )
+
+    def decode(self, decoder: json.JSONDecoder) -> tuple[Any] | None:
+        """
+        Decode and consume the value at the current position.
+
+        Args:
+            decoder (json.JSONDecoder): The decoder of the value.
+
+        Returns:
+            tuple[Any] | None: The decoded value, or None if the file ends
+            before the value is complete.
+
+        """
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                end = -1
+            if end != -1 and self.buffer[end : end + 1] in _DELIMITERS:
+                break
+
+            # The element may continue in the next chunk (a number may even decode
+            # early): read at least as much as is buffered so that long elements
+            # are decoded in linear time
+            chunk = self.file.read(
+                max(self.chunk_size, len(self.buffer) - self.position),
+            )
+            if not chunk:
+                if end == -1:
+                    return None
+                break
+            self.buffer, self.position, self.offset = (
+                self.buffer[self.position :] + chunk,
+                0,
+                self.offset + self.position,
+            )
+
+        self.position = end
+        return (value,)
+
+
+# Next expected token of a JSON array, by the previous expected token and the
+# structural character read
+_ARRAY_TRANSITIONS = {
+    ("'['", "["): "a value or ']'",
+    ("a value or ']'", "]"): "end of file",
+    ("',' or ']'", "]"): "end of file",
+    ("',' or ']'", ","): "a value",
+}
+
+# Expected tokens at which an element starts
+_VALUE_TOKENS = frozenset({"a value or ']'", "a value"})
+
+
+def iter_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Iterate over the elements of a JSON array file without loading it whole.
+
+    The file is read in chunks and each element is decoded as soon as it is
+    complete, so only one element is held in memory at a time.
+
+    Args:
+        path (Path): The path to a file containing a single JSON array.
+        chunk_size (int): Number of characters read at a time.
+
+    Yields:
+        Any: The decoded elements, in order.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        ValueError: If the file content is not a valid JSON array.
+
+    """
+    if not path.exists():
+        error_message = f"File not found: '{path}'"
+        raise FileNotFoundError(error_message)
+
+    decoder = json.JSONDecoder()
+    expected = "'['"
+    with Path.open(path, encoding="utf-8") as f:
+        reader = _ArrayReader(f, chunk_size)
+
+        while (char := reader.peek()) is not None:
+            if (expected, char) in _ARRAY_TRANSITIONS:
+                expected = _ARRAY_TRANSITIONS[expected, char]
+                reader.position += 1
+            elif expected in _VALUE_TOKENS and (decoded := reader.decode(decoder)):
+                yield decoded[0]
+                expected = "',' or ']'"
+            else:
+                break
+
+    if expected != "end of file" or reader.position != len(reader.buffer):
+        error_message = (
+            f"'{path}': expected {expected} at character "
+            f"{reader.offset + reader.position}."
+        )
+        raise ValueError(error_message)
+
+
+def iter_json_lines(
+    path: Path,
+    start: int = 0,
+    stop: int | None = None,
+) -> Iterator[Any]:
+    """
+    Iterate over the values of a JSON Lines file (one JSON value per line).
+
+    A byte range of the file selects the lines that start within it, so that
+    adjacent ranges (e.g., read by different processes) split the file into
+    whole lines.
+
+    Args:
+        path (Path): The path to the JSON Lines file.
+        start (int): Only read the lines that start at or after this byte.
+        stop (int | None): Only read the lines that start before this byte
+            (default: the end of the file).
+
+    Yields:
+        Any: The decoded values, in order. Blank lines are skipped.
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        ValueError: If a line is not valid JSON.
+
+    """
+    if not path.exists():
+        error_message = f"File not found: '{path}'"
+        raise FileNotFoundError(error_message)
+
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    with Path.open(path, "rb") as f:
+        # Skip the line that started before the range
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+
+        for number, line in enumerate(f, start=1):
+            if stop is not None and position >= stop:
+                break
+            line_start, position = position, position + len(line)
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                location = f"byte {line_start}" if start else f"line {number}"
+                error_message = f"'{path}', {location}: {e}"
+                raise ValueError(error_message) from e
+
+
+def iter_json_records(path: Path) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON array file or a JSON Lines file.
+
+    Files with the '.jsonl' suffix are read as JSON Lines, any other file as a
+    single JSON array.
+
+    Args:
+        path (Path): The path to the file.
+
+    Returns:
+        Iterator[Any]: The decoded records, in order.
+
+    """
+    if path.suffix == JSON_LINES_SUFFIX:
+        return iter_json_lines(path)
+    return iter_json_array(path)
+
+
+class JsonArrayWriter:
+    """
+    A context manager that writes a JSON array one element at a time.
+
+    The output is identical to `save_json` applied to the list of all elements.
+    It is written to a temporary file that replaces the destination only when
+    the 'with' block completes without an exception, so an interrupted run never
+    leaves a truncated file behind.
+
+    Parts of an array can be written in parallel as fragments (elements without
+    the enclosing brackets), which are then appended to the array in order with
+    `write_fragment`, without decoding them.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        indent: bool = True,
+        fragment: bool = False,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            path (Path): The destination file path.
+            indent (bool): Indent with 2 spaces (default). Pass False to write
+                compact JSON.
+            fragment (bool): Write only the elements, to be appended to an array
+                written with the same indentation by `write_fragment`.
+
+        """
+        self.path = path
+        self.indent = indent
+        self.fragment = fragment
+        self.count = 0
+        self._temporary_path = path.with_name(f"{path.name}.tmp")
+        self._file: BufferedWriter | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Open the temporary file and start the array.
+
+        Returns:
+            JsonArrayWriter: The writer.
+
+        """
+        Path.mkdir(self.path.parent, parents=True, exist_ok=True)
+        self._file = Path.open(self._temporary_path, "wb")
+        if not self.fragment:
+            self._file.write(b"[")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Close the array and move it into place, or discard it on error."""
+        if self._file is None:
+            return
+
+        if exc_type is None:
+            if self.count and self.indent and not self.fragment:
+                self._file.write(b"\n")
+            if not self.fragment:
+                self._file.write(b"]")
+            self._file.close()
+            self._temporary_path.replace(self.path)
+        else:
+            self._file.close()
+            self._temporary_path.unlink(missing_ok=True)
+        self._file = None
+
+    def write(self, item: object) -> None:
+        """
+        Append an element to the array.
+
+        Args:
+            item (object): The element to serialize.
+
+        Raises:
+            TypeError: If the element is not JSON serializable.
+            ValueError: If the writer is not open.
+
+        """
+        if self._file is None:
+            error_message = "JsonArrayWriter must be used in a 'with' block."
+            raise ValueError(error_message)
+
+        try:
+            element = _dumps(item, indent=self.indent)
+        except TypeError as e:
+            error_message = f"Data is not JSON serializable: {e}"
+            raise TypeError(error_message) from e
+
+        separator = b"," if self.count else b""
+        if self.indent:
+            separator += b"\n  "
+            element = element.replace(b"\n", b"\n  ")
+        self._file.write(separator + element)
+        self.count += 1
+
+    def write_fragment(self, path: Path, count: int) -> None:
+        """
+        Append the elements of a fragment to the array.
+
+        Args:
+            path (Path): A fragment written by a `JsonArrayWriter` with
+                `fragment=True` and the same indentation.
+            count (int): Number of elements in the fragment.
+
+        Raises:
+            ValueError: If the writer is not open.
+
+        """
+        if self._file is None:
+            error_message = "JsonArrayWriter must be used in a 'with' block."
+            raise ValueError(error_message)
+        if not count:
+            return
+
+        if self.count:
+            self._file.write(b",")
+        with Path.open(path, "rb") as f:
+            shutil.copyfileobj(f, self._file)
+        self.count += count
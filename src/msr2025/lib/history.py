@@ -0,0 +1,216 @@
+"""
+Provides an indexed on-disk store of per-artifact release histories.
+
+Includes:
+- build_history_store: Writes release histories to an SQLite database whose table
+  is clustered on (artifact id, position), so the releases of one artifact are
+  stored together and found through the primary key index.
+- HistoryStore: Read-only access to the store; looks up the release timeline of a
+  single artifact without loading the others.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from .records import Release
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+    from .records import ReleaseHistory
+
+# Default location of the store, next to 'data_releases.json'
+HISTORY_FILE_PATH = Path(
+    "./output/A_Data_Preparation_and_Extraction/data_releases.sqlite",
+)
+
+# Without a rowid, rows are stored in primary key order: one artifact is one range
+_CREATE_TABLE = """
+CREATE TABLE releases (
+  artifact_id TEXT NOT NULL,
+  position INTEGER NOT NULL,
+  dependent_time INTEGER NOT NULL,
+  dependent_version TEXT NOT NULL,
+  log4j_time INTEGER NOT NULL,
+  log4j_version TEXT NOT NULL,
+  PRIMARY KEY (artifact_id, position)
+) WITHOUT ROWID
+"""
+
+_INSERT_RELEASE = "INSERT INTO releases VALUES (?, ?, ?, ?, ?, ?)"
+
+_SELECT_RELEASES = """
+SELECT dependent_time, dependent_version, log4j_time, log4j_version
+FROM releases
+WHERE artifact_id = ?
+ORDER BY position
+"""
+
+_SELECT_ARTIFACT_IDS = """
+SELECT DISTINCT artifact_id
+FROM releases
+WHERE artifact_id >= ? AND artifact_id < ?
+ORDER BY artifact_id
+LIMIT ?
+"""
+
+_COUNT_ARTIFACTS = "SELECT count(DISTINCT artifact_id) FROM releases"
+
+
+def _rows(
+    histories: Iterable[ReleaseHistory],
+) -> Iterator[tuple[str, int, int, str, int, str]]:
+    """
+    Flatten release histories into table rows.
+
+    Args:
+        histories (Iterable[ReleaseHistory]): Release histories of all artifacts.
+
+    Yields:
+        tuple[str, int, int, str, int, str]: One row per release.
+
+    """
+    for artifact_id, releases in histories:
+        for position, r in enumerate(releases):
+            yield (
+                artifact_id,
+                position,
+                r.dependent_time,
+                r.dependent_version,
+                r.log4j_time,
+                r.log4j_version,
+            )
+
+
+def build_history_store(
+    histories: Iterable[ReleaseHistory],
+    path: Path = HISTORY_FILE_PATH,
+) -> None:
+    """
+    Write release histories to an indexed store.
+
+    The histories are consumed one at a time, so a streamed source is never held
+    in memory. The store is built in a temporary file that replaces `path` only
+    once it is complete.
+
+    Args:
+        histories (Iterable[ReleaseHistory]): Release histories of all artifacts.
+        path (Path): Destination of the store.
+
+    Raises:
+        sqlite3.IntegrityError: If an artifact appears more than once.
+
+    """
+    Path.mkdir(path.parent, parents=True, exist_ok=True)
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    temporary_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(temporary_path)
+    try:
+        # The file is discarded on failure, so durability is not needed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        with connection:
+            connection.execute(_CREATE_TABLE)
+            connection.executemany(_INSERT_RELEASE, _rows(histories))
+    except BaseException:
+        connection.close()
+        temporary_path.unlink(missing_ok=True)
+        raise
+
+    connection.close()
+    temporary_path.replace(path)
+
+
+class HistoryStore:
+    """
+    A context-manager-enabled, read-only view of a release history store.
+
+    Provides methods to:
+    - Look up the release timeline of one artifact
+    - Find artifact ids by prefix
+    """
+
+    def __init__(self, path: Path = HISTORY_FILE_PATH) -> None:
+        """
+        Open a release history store.
+
+        Args:
+            path (Path): Location of the store.
+
+        Raises:
+            FileNotFoundError: If the store does not exist.
+
+        """
+        if not path.exists():
+            error_message = f"File not found: '{path}'"
+            raise FileNotFoundError(error_message)
+
+        self.connection = sqlite3.connect(
+            f"{path.resolve().as_uri()}?mode=ro",
+            uri=True,
+        )
+
+    def __enter__(self) -> Self:
+        """
+        Enter the runtime context for use with 'with' statements.
+
+        Returns:
+            HistoryStore: The opened store.
+
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Exit the runtime context and close the store."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the store."""
+        self.connection.close()
+
+    def __len__(self) -> int:
+        """Return the number of artifacts in the store."""
+        (count,) = self.connection.execute(_COUNT_ARTIFACTS).fetchone()
+        return int(count)
+
+    def releases(self, artifact_id: str) -> list[Release]:
+        """
+        Look up the release timeline of one artifact.
+
+        Args:
+            artifact_id (str): Unique identifier of the artifact.
+
+        Returns:
+            list[Release]: The releases of the artifact, in the order of
+            'data_releases.json' (empty if the artifact is unknown).
+
+        """
+        rows = self.connection.execute(_SELECT_RELEASES, (artifact_id,))
+        return [Release(*row) for row in rows]
+
+    def search(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Find artifact ids starting with a prefix.
+
+        Args:
+            prefix (str): Start of the artifact id (e.g., a groupId).
+            limit (int): Maximum number of ids to return.
+
+        Returns:
+            list[str]: Matching artifact ids, in sorted order.
+
+        """
+        # Upper bound of the prefix range, so that the primary key index is used
+        upper = prefix + "\U0010ffff"
+        rows = self.connection.execute(_SELECT_ARTIFACT_IDS, (prefix, upper, limit))
+        return [artifact_id for (artifact_id,) in rows]
@@ -0,0 +1,317 @@
+"""
+Provides Make-style memoization for the stages of the pipeline.
+
+Includes:
+- Stage: A step of the pipeline with its declared input and output files, and an
+  optional fingerprint of inputs that are not files (e.g., the Neo4j graph).
+- run_pipeline: Runs the stages in order and skips every stage whose inputs have
+  the same content hashes as when it last ran, provided its outputs are still
+  unchanged on disk.
+- source_files: The source code a script depends on, to declare as inputs of its
+  stage: the script and every module of its package that it imports, directly or
+  transitively.
+
+Content hashes are kept in a manifest file, together with the size and
+modification time of each hashed file, so unchanged files are not re-read.
+"""
+
+import ast
+import hashlib
+import importlib.util
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any, TypedDict
+
+from .files import load_json, save_json
+
+# Default location of the manifest
+MANIFEST_FILE_PATH = Path("./output/pipeline_manifest.json")
+
+# Manifest key under which the fingerprint of a stage is recorded
+FINGERPRINT_KEY = "<fingerprint>"
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """
+    A step of the pipeline.
+
+    Attributes:
+        name (str): Unique name of the stage.
+        run (Callable[[], None]): Runs the stage.
+        inputs (tuple[Path, ...]): Files read by the stage (including its own
+            source code, so that editing a script reruns it).
+        outputs (tuple[Path, ...]): Files written by the stage.
+        fingerprint (Callable[[], str] | None): Summarizes inputs that are not
+            files; the stage reruns when the summary changes.
+
+    """
+
+    name: str
+    run: Callable[[], None]
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    fingerprint: Callable[[], str] | None = None
+
+
+class FileState(TypedDict):
+    """
+    Hash of a file, valid as long as its size and modification time are unchanged.
+
+    Attributes:
+        size (int): Size of the file in bytes.
+        mtime_ns (int): Modification time of the file in nanoseconds.
+        sha256 (str): SHA-256 hash of the file content.
+
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class StageState(TypedDict):
+    """
+    Hashes of the inputs and outputs of a stage when it last completed.
+
+    Attributes:
+        inputs (dict[str, str | None]): Hash of each input (None if missing) and
+            the fingerprint, if any.
+        outputs (dict[str, str | None]): Hash of each output (None if missing).
+
+    """
+
+    inputs: dict[str, str | None]
+    outputs: dict[str, str | None]
+
+
+class Manifest(TypedDict):
+    """
+    Contents of the manifest file.
+
+    Attributes:
+        files (dict[str, FileState]): Cached hash of every file seen.
+        stages (dict[str, StageState]): Last completed state of every stage.
+
+    """
+
+    files: dict[str, FileState]
+    stages: dict[str, StageState]
+
+
+@cache
+def _module_source(name: str) -> tuple[Path, tuple[str, ...]] | None:
+    """
+    Find the source file of a module and the modules it imports.
+
+    Args:
+        name (str): Absolute name of the module.
+
+    Returns:
+        tuple[Path, tuple[str, ...]] | None: The source file and the absolute
+        names of every module (or module attribute) imported by it, or None if the
+        module has no Python source.
+
+    """
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        # An attribute of a module, imported with 'from module import attribute'
+        return None
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+
+    path = Path(spec.origin)
+    # Relative imports are resolved against the package of the module
+    is_package = spec.submodule_search_locations is not None
+    package = name if is_package else name.rpartition(".")[0]
+
+    imported: list[str] = []
+    for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+        if isinstance(node, ast.Import):
+            imported += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                module = importlib.util.resolve_name("." * node.level + module, package)
+            imported += [module, *(f"{module}.{alias.name}" for alias in node.names)]
+    return path, tuple(imported)
+
+
+def source_files(module: ModuleType) -> tuple[Path, ...]:
+    """
+    List the source code a script depends on.
+
+    Imports are read from the source without running it, and followed only within
+    the top-level package of the script, so that a stage reruns when a shared
+    module it uses changes, but not when a third-party library is upgraded. The
+    packages that merely contain the script (e.g., the launcher in the top-level
+    '__init__.py') are not followed.
+
+    Args:
+        module (ModuleType): The script module.
+
+    Returns:
+        tuple[Path, ...]: The source file of the script and of every module of
+        its package that it imports, directly or transitively, sorted.
+
+    """
+    root = module.__name__.partition(".")[0]
+    files: dict[str, Path] = {}
+    pending = [module.__name__]
+    while pending:
+        name = pending.pop()
+        if name in files or (name != root and not name.startswith(f"{root}.")):
+            continue
+        source = _module_source(name)
+        if source is None:
+            continue
+        files[name], imported = source
+        pending += imported
+    return tuple(sorted(files.values()))
+
+
+def _load_manifest(path: Path) -> Manifest:
+    """
+    Load the manifest, or start an empty one if it does not exist.
+
+    Args:
+        path (Path): Location of the manifest.
+
+    Returns:
+        Manifest: The manifest.
+
+    """
+    if not path.exists():
+        return {"files": {}, "stages": {}}
+
+    data: Any = load_json(path)
+    return {"files": data.get("files", {}), "stages": data.get("stages", {})}
+
+
+def _digest(path: Path, files: dict[str, FileState]) -> str | None:
+    """
+    Return the content hash of a file, reusing the cached hash when possible.
+
+    Args:
+        path (Path): The file to hash.
+        files (dict[str, FileState]): Cache of file hashes; updated in place.
+
+    Returns:
+        str | None: The SHA-256 hash of the file, or None if it does not exist.
+
+    """
+    key = path.as_posix()
+    if not path.is_file():
+        files.pop(key, None)
+        return None
+
+    stat = path.stat()
+    cached = files.get(key)
+    if (
+        cached is not None
+        and cached["size"] == stat.st_size
+        and cached["mtime_ns"] == stat.st_mtime_ns
+    ):
+        return cached["sha256"]
+
+    with Path.open(path, "rb") as f:
+        sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+    files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+    return sha256
+
+
+def _input_state(stage: Stage, files: dict[str, FileState]) -> dict[str, str | None]:
+    """
+    Hash the inputs of a stage.
+
+    Args:
+        stage (Stage): The stage.
+        files (dict[str, FileState]): Cache of file hashes; updated in place.
+
+    Returns:
+        dict[str, str | None]: Hash of each input, and the fingerprint if any.
+
+    """
+    state = {path.as_posix(): _digest(path, files) for path in stage.inputs}
+    if stage.fingerprint is not None:
+        state[FINGERPRINT_KEY] = stage.fingerprint()
+    return state
+
+
+def _output_state(stage: Stage, files: dict[str, FileState]) -> dict[str, str | None]:
+    """
+    Hash the outputs of a stage.
+
+    Args:
+        stage (Stage): The stage.
+        files (dict[str, FileState]): Cache of file hashes; updated in place.
+
+    Returns:
+        dict[str, str | None]: Hash of each output.
+
+    """
+    return {path.as_posix(): _digest(path, files) for path in stage.outputs}
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    manifest_path: Path = MANIFEST_FILE_PATH,
+    *,
+    force: bool = False,
+    from_stage: str | None = None,
+) -> None:
+    """
+    Run the stages in order, skipping those that are up to date.
+
+    A stage is up to date when its inputs hash to the same values as when it last
+    completed, and its outputs all exist with the content it wrote. Because the
+    outputs of a stage are the inputs of the next ones, rerunning a stage reruns
+    its dependents only if it actually changed their inputs.
+
+    Args:
+        stages (Sequence[Stage]): The stages, in execution order.
+        manifest_path (Path): Location of the manifest.
+        force (bool): Run every stage regardless of the manifest.
+        from_stage (str | None): Run this stage and every later one regardless of
+            the manifest.
+
+    Raises:
+        ValueError: If `from_stage` is not the name of a stage.
+
+    """
+    names = [stage.name for stage in stages]
+    if from_stage is not None and from_stage not in names:
+        error_message = f"Unknown stage '{from_stage}'. Stages: {', '.join(names)}"
+        raise ValueError(error_message)
+
+    manifest = _load_manifest(manifest_path)
+    forced = force
+
+    for stage in stages:
+        forced = forced or stage.name == from_stage
+        inputs = _input_state(stage, manifest["files"])
+        previous = manifest["stages"].get(stage.name)
+
+        if (
+            not forced
+            and previous is not None
+            and previous["inputs"] == inputs
+            and None not in previous["outputs"].values()
+            and previous["outputs"] == _output_state(stage, manifest["files"])
+        ):
+            print(f"\n**** {stage.name} (up to date, skipped) ****")
+            continue
+
+        print(f"\n**** {stage.name} ****")
+        stage.run()
+
+        # Record the stage as soon as it completes, so an interrupted run resumes
+        manifest["stages"][stage.name] = {
+            "inputs": inputs,
+            "outputs": _output_state(stage, manifest["files"]),
+        }
+        save_json(manifest, manifest_path)
@@ -0,0 +1,368 @@
+"""
+Typed, slot-based records for the JSON files exchanged between the pipeline steps.
+
+Includes:
+- Release: A single release of an artifact that depends on log4j-core
+  (elements of 'data_releases.json').
+- Update: A single release transition around log4j 2.17.0
+  (elements of 'data_updates.json').
+- Decoders that validate the fields of each JSON object while building the records,
+  and loaders that read whole files through the fastest available JSON codec,
+  decoding every JSON object into a record as it is parsed.
+- iter_release_histories: Streams release histories one artifact at a time, from
+  either a JSON array or a JSON Lines file (or a byte range of one).
+- iter_release_rows: Streams flat, unordered release rows (one release per
+  element), e.g., an export too large to be grouped by the database.
+
+Records use `__slots__`, so they carry no per-instance dictionary. Version strings
+repeat across many records and are interned to share a single copy.
+"""
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, fields
+from functools import cache, partial
+from pathlib import Path
+from typing import Any, cast
+
+from .files import HAS_ORJSON, iter_json_lines, iter_json_records, load_json
+
+
+@dataclass(slots=True)
+class Release:
+    """
+    Information about a single release.
+
+    Attributes:
+        dependent_time (int): Timestamp when the dependent package was released.
+        dependent_version (str): Version of the dependent package.
+        log4j_time (int): Timestamp when the corresponding log4j version was released.
+        log4j_version (str): Version of log4j depended on.
+
+    """
+
+    dependent_time: int
+    dependent_version: str
+    log4j_time: int
+    log4j_version: str
+
+
+@dataclass(slots=True)
+class Update:
+    """
+    A single release transition around log4j 2.17.0.
+
+    Attributes:
+        artifact_id (str): Unique identifier of the artifact.
+        old_version (str): Previous dependent version.
+        old_time (int): Timestamp of the previous release.
+        old_depend_version (str): Log4j version at the previous release.
+        new_version (str): Updated dependent version.
+        new_time (int): Timestamp of the new release.
+        new_depend_version (str): Log4j version at the new release.
+        gap (int): Time difference in milliseconds between the new release and baseline.
+        release_frequency (float): Frequency of releases.
+
+    """
+
+    artifact_id: str
+    old_version: str
+    old_time: int
+    old_depend_version: str
+    new_version: str
+    new_time: int
+    new_depend_version: str
+    gap: int
+    release_frequency: float
+
+
+# Type Alias: Release history of one artifact (artifact id, releases)
+type ReleaseHistory = tuple[str, list[Release]]
+
+# Type Alias: One release of an artifact (artifact id, release)
+type ReleaseRow = tuple[str, Release]
+
+# Fields whose values repeat across records and are worth interning
+_INTERNED_FIELDS = frozenset(
+    {"dependent_version", "log4j_version", "old_depend_version", "new_depend_version"},
+)
+
+
+@cache
+def _schema(cls: type) -> tuple[tuple[str, type, bool], ...]:
+    """
+    Return the name, type and interning flag of every field of a record class.
+
+    Args:
+        cls (type): The record class.
+
+    Returns:
+        tuple[tuple[str, type, bool], ...]: One entry per field, in field order.
+
+    """
+    return tuple(
+        (field.name, cast("type", field.type), field.name in _INTERNED_FIELDS)
+        for field in fields(cls)
+    )
+
+
+def _decode[T](cls: type[T], obj: object) -> T:
+    """
+    Validate a JSON object against the fields of a record class and build a record.
+
+    Args:
+        cls (type[T]): The record class.
+        obj (object): The decoded JSON value, or a record of the class decoded
+            while parsing, which is returned as is.
+
+    Returns:
+        T: The record.
+
+    Raises:
+        TypeError: If the value is not an object, or a field is missing or has
+            the wrong type.
+
+    """
+    if isinstance(obj, cls):
+        # Already decoded while parsing
+        return obj
+    if not isinstance(obj, dict):
+        error_message = f"expected an object, got {type(obj).__name__}"
+        raise TypeError(error_message)
+
+    values: list[Any] = []
+    for name, expected, interned in _schema(cast("type", cls)):
+        value: Any = obj.get(name)
+
+        if expected is float and type(value) is int:
+            value = float(value)
+        elif type(value) is not expected:
+            error_message = (
+                f"field '{name}' must be {expected.__name__}, "
+                f"got {type(value).__name__}"
+            )
+            raise TypeError(error_message)
+
+        values.append(sys.intern(value) if interned else value)
+
+    return cls(*values)
+
+
+def decode_release_history(obj: object) -> ReleaseHistory:
+    """
+    Build the release history of one artifact from an element of 'data_releases.json'.
+
+    Args:
+        obj (object): The decoded JSON value: `[artifactId, [release, ...]]`.
+
+    Returns:
+        ReleaseHistory: The artifact id and its validated releases.
+
+    Raises:
+        TypeError: If the value does not have the expected structure.
+
+    """
+    match obj:
+        case [str() as artifact_id, list() as releases]:
+            return artifact_id, [_decode(Release, release) for release in releases]
+        case _:
+            error_message = "expected [artifactId, [release, ...]]"
+            raise TypeError(error_message)
+
+
+def decode_release_row(obj: object) -> ReleaseRow:
+    """
+    Build one release of an artifact from an element of a flat release export.
+
+    Args:
+        obj (object): The decoded JSON value: `[artifactId, release]`.
+
+    Returns:
+        ReleaseRow: The artifact id and the validated release.
+
+    Raises:
+        TypeError: If the value does not have the expected structure.
+
+    """
+    match obj:
+        case [str() as artifact_id, dict() as release]:
+            return artifact_id, _decode(Release, release)
+        case _:
+            error_message = "expected [artifactId, release]"
+            raise TypeError(error_message)
+
+
+def decode_update(obj: object) -> Update:
+    """
+    Build a release transition from an element of 'data_updates.json'.
+
+    Args:
+        obj (object): The decoded JSON object.
+
+    Returns:
+        Update: The validated release transition.
+
+    Raises:
+        TypeError: If a field is missing or has the wrong type.
+
+    """
+    return _decode(Update, obj)
+
+
+def _decode_elements[T](
+    path: Path | str,
+    elements: Iterable[object],
+    decoder: Callable[[object], T],
+) -> Iterator[T]:
+    """
+    Decode the elements of a JSON file one by one.
+
+    Args:
+        path (Path | str): The JSON file (or part of it) the elements come from
+            (for error messages).
+        elements (Iterable[object]): The decoded JSON elements.
+        decoder (Callable[[object], T]): Decoder applied to each element.
+
+    Yields:
+        T: The decoded records.
+
+    Raises:
+        TypeError: If an element has the wrong structure.
+
+    """
+    for i, obj in enumerate(elements):
+        try:
+            yield decoder(obj)
+        except TypeError as err:
+            error_message = f"'{path}', record {i}: {err}."
+            raise TypeError(error_message) from err
+
+
+def _decode_file[T](
+    path: Path,
+    record: type,
+    decoder: Callable[[object], T],
+) -> list[T]:
+    """
+    Load a JSON array from a file and decode each of its elements.
+
+    With the standard library codec, every JSON object in the file is decoded into
+    a record while the file is parsed, so the file is never held as a tree of
+    dicts. `orjson` has no parse hooks, but parses several times faster than the
+    records are built, so its tree is decoded afterwards.
+
+    Args:
+        path (Path): The JSON file to read.
+        record (type): The record class of every JSON object in the file.
+        decoder (Callable[[object], T]): Decoder applied to each element.
+
+    Returns:
+        list[T]: The decoded records.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        TypeError: If the file or one of its elements has the wrong structure.
+
+    """
+    try:
+        object_hook = None if HAS_ORJSON else partial(_decode, record)
+        data = cast("object", load_json(path, object_hook))
+    except TypeError as err:
+        error_message = f"'{path}': {err}."
+        raise TypeError(error_message) from err
+
+    if not isinstance(data, list):
+        error_message = f"'{path}': expected a JSON array at the top level."
+        raise TypeError(error_message)
+
+    return list(_decode_elements(path, data, decoder))
+
+
+def load_release_histories(path: Path) -> list[ReleaseHistory]:
+    """
+    Load and validate 'data_releases.json'.
+
+    Args:
+        path (Path): Path to the release histories.
+
+    Returns:
+        list[ReleaseHistory]: The release history of every artifact.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        TypeError: If a record does not have the expected structure.
+
+    """
+    return _decode_file(path, Release, decode_release_history)
+
+
+def iter_release_histories(
+    path: Path,
+    byte_range: tuple[int, int] | None = None,
+) -> Iterator[ReleaseHistory]:
+    """
+    Stream release histories one artifact at a time.
+
+    Only the history being decoded is held in memory. Files with the '.jsonl'
+    suffix are read as JSON Lines (one `[artifactId, [release, ...]]` per line),
+    any other file as the JSON array written by `data_preparation`.
+
+    Args:
+        path (Path): Path to the release histories.
+        byte_range (tuple[int, int] | None): Only read the lines of a JSON Lines
+            file that start within this (start, stop) range of bytes.
+
+    Returns:
+        Iterator[ReleaseHistory]: The release history of every artifact, in order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    """
+    if byte_range is None:
+        return _decode_elements(path, iter_json_records(path), decode_release_history)
+
+    start, stop = byte_range
+    return _decode_elements(
+        f"{path} (bytes {start}-{stop})",
+        iter_json_lines(path, start, stop),
+        decode_release_history,
+    )
+
+
+def iter_release_rows(path: Path) -> Iterator[ReleaseRow]:
+    """
+    Stream flat release rows one release at a time.
+
+    Files with the '.jsonl' suffix are read as JSON Lines (one
+    `[artifactId, release]` per line), any other file as a JSON array of them.
+
+    Args:
+        path (Path): Path to the release rows.
+
+    Returns:
+        Iterator[ReleaseRow]: The release rows, in file order.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+
+    """
+    return _decode_elements(path, iter_json_records(path), decode_release_row)
+
+
+def load_updates(path: Path) -> list[Update]:
+    """
+    Load and validate 'data_updates.json'.
+
+    Args:
+        path (Path): Path to the release transitions.
+
+    Returns:
+        list[Update]: The release transition of every artifact.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        TypeError: If a record does not have the expected structure.
+
+    """
+    return _decode_file(path, Update, decode_update)
@@ -0,0 +1,182 @@
+"""
+Draws deterministic stratified samples of dependent artifacts.
+
+Includes:
+- SampleDesign: The strata of a sample, their population and sample sizes, and
+  the stratum of every sampled artifact; saved next to the sampled data so that
+  the empirical study can weight its estimates and report sampling errors.
+- stratum_of: Assigns an artifact to a stratum by groupId prefix or by release
+  count.
+- stratified_sample: Draws a stratified simple random sample without replacement.
+  Strata too small to be sampled at the requested fraction are pooled into one
+  `OTHER_STRATUM`.
+
+Every artifact gets a pseudo-random key from a hash of the seed and its id, and
+each stratum keeps the artifacts with the smallest keys. The sample depends only
+on the seed, the fraction and the strata, not on the order of the input, and a
+larger fraction always contains the artifacts of a smaller one.
+"""
+
+import hashlib
+import math
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Literal, TypedDict
+
+type StrataBy = Literal["group", "releases"]
+
+# Ways of stratifying artifacts, the first being the default
+STRATA_BY: tuple[StrataBy, ...] = ("group", "releases")
+
+# Path to the design of the last sampled extraction
+SAMPLE_FILE_PATH = Path(
+    "./output/A_Data_Preparation_and_Extraction/data_updates_sample.json",
+)
+
+# Seed of the sample keys
+DEFAULT_SEED = 0
+
+# Number of leading groupId components that identify a 'group' stratum
+GROUP_PREFIX_DEPTH = 2
+
+# Minimum number of artifacts sampled per stratum (needed for a variance)
+MIN_STRATUM_SAMPLE = 2
+
+# Stratum pooling the artifacts of the strata that are too small to sample
+OTHER_STRATUM = "(other)"
+
+# Number of bytes of the hash used as a sample key
+KEY_BYTES = 8
+
+
+class StratumSize(TypedDict):
+    """
+    Size of one stratum.
+
+    Attributes:
+        population (int): Number of artifacts in the stratum.
+        sample (int): Number of sampled artifacts.
+
+    """
+
+    population: int
+    sample: int
+
+
+class SampleDesign(TypedDict):
+    """
+    Design of a stratified sample of artifacts.
+
+    Attributes:
+        fraction (float): Share of each stratum that is sampled.
+        strata_by (StrataBy): How artifacts are stratified.
+        seed (int): Seed of the sample keys.
+        strata (dict[str, StratumSize]): Size of each stratum.
+        members (dict[str, str]): Stratum of each sampled artifact.
+
+    """
+
+    fraction: float
+    strata_by: StrataBy
+    seed: int
+    strata: dict[str, StratumSize]
+    members: dict[str, str]
+
+
+def stratum_of(artifact_id: str, release_count: int, by: StrataBy) -> str:
+    """
+    Assign an artifact to a stratum.
+
+    Args:
+        artifact_id (str): Artifact id ('groupId:artifactId').
+        release_count (int): Number of releases of the artifact.
+        by (StrataBy): 'group' for the leading components of the groupId (e.g.,
+            'org.apache'), or 'releases' for the power of two bucket of the
+            release count (e.g., '4-7 releases').
+
+    Returns:
+        str: Name of the stratum.
+
+    """
+    if by == "group":
+        group_id = artifact_id.partition(":")[0]
+        return ".".join(group_id.split(".")[:GROUP_PREFIX_DEPTH])
+
+    bucket = max(release_count, 1).bit_length()
+    if bucket == 1:
+        return "1 release"
+    return f"{2 ** (bucket - 1)}-{2**bucket - 1} releases"
+
+
+def _sample_key(artifact_id: str, seed: int) -> int:
+    """Derive the pseudo-random sample key of an artifact."""
+    digest = hashlib.blake2b(
+        artifact_id.encode(),
+        digest_size=KEY_BYTES,
+        key=str(seed).encode(),
+    ).digest()
+    return int.from_bytes(digest)
+
+
+def stratified_sample(
+    artifacts: Iterable[tuple[str, int]],
+    fraction: float,
+    by: StrataBy = "group",
+    seed: int = DEFAULT_SEED,
+) -> SampleDesign:
+    """
+    Draw a stratified sample of artifacts.
+
+    Each stratum of N artifacts contributes ceil(fraction * N) of them, but at
+    least `MIN_STRATUM_SAMPLE` (or all of them, if it is smaller). Strata with
+    fewer than `MIN_STRATUM_SAMPLE / fraction` artifacts would be sampled above
+    the fraction, so they are pooled into `OTHER_STRATUM` first; thousands of
+    tiny groupId prefixes thus do not inflate the sample.
+
+    Args:
+        artifacts (Iterable[tuple[str, int]]): Id and release count of every
+            artifact, e.g., streamed from the release histories.
+        fraction (float): Share of each stratum to sample, in (0, 1].
+        by (StrataBy): How to stratify the artifacts.
+        seed (int): Seed of the sample keys.
+
+    Returns:
+        SampleDesign: The strata and the sampled artifacts.
+
+    Raises:
+        ValueError: If the fraction is not in (0, 1].
+
+    """
+    if not 0 < fraction <= 1:
+        error_message = f"Sample fraction must be in (0, 1], got {fraction}."
+        raise ValueError(error_message)
+
+    keys: dict[str, list[tuple[int, str]]] = {}
+    for artifact_id, release_count in artifacts:
+        stratum = stratum_of(artifact_id, release_count, by)
+        key = _sample_key(artifact_id, seed)
+        keys.setdefault(stratum, []).append((key, artifact_id))
+
+    min_population = MIN_STRATUM_SAMPLE / fraction
+    for stratum in [name for name, k in keys.items() if len(k) < min_population]:
+        keys.setdefault(OTHER_STRATUM, []).extend(keys.pop(stratum))
+
+    strata: dict[str, StratumSize] = {}
+    members: dict[str, str] = {}
+    for stratum, stratum_keys in sorted(keys.items()):
+        population = len(stratum_keys)
+        sample = min(
+            population,
+            max(math.ceil(fraction * population), MIN_STRATUM_SAMPLE),
+        )
+        strata[stratum] = {"population": population, "sample": sample}
+        for _, artifact_id in sorted(stratum_keys)[:sample]:
+            members[artifact_id] = stratum
+
+    return {
+        "fraction": fraction,
+        "strata_by": by,
+        "seed": seed,
+        "strata": strata,
+        "members": members,
+    }
@@ -0,0 +1,294 @@
+"""
+Compares the RQ results across several snapshots of the Goblin graph.
+
+This script:
+- Extracts the release transitions of every snapshot at the same time, one
+  process per snapshot, each in its own output namespace
+  'output/snapshots/<name>/'. A snapshot is either a Neo4j database, given by its
+  URI (credentials are read from the environment as usual), or an offline
+  release history file like 'data_releases.json' ('.json' or '.jsonl').
+- Computes the RQ1, RQ2-1 and RQ2-2 statistics of every snapshot side by side.
+- Joins each snapshot with the previous one on artifact id, to find the packages
+  that newly updated, disappeared, or whose update delay changed.
+
+Snapshots are given as NAME=SOURCE in chronological order, e.g.
+`uv run snapshots 2024-06=neo4j://localhost:7687 2024-12=dumps/2024-12.jsonl`.
+"""
+
+import argparse
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+from .A_Data_Preparation_and_Extraction import data_extraction, data_preparation
+from .B_Empirical_Study.lib.dataset import UpdateColumns, to_update_columns
+from .B_Empirical_Study.lib.snapshots import (
+    DeltaSummary,
+    SnapshotStatistics,
+    snapshot_delta,
+    snapshot_statistics,
+    summarize_delta,
+)
+from .B_Empirical_Study.lib.versions import VERSION_CHANGE_TYPES
+from .lib.files import save_json
+from .lib.records import load_updates
+
+# Root of the per-snapshot output namespaces
+SNAPSHOTS_DIR = Path("output/snapshots")
+
+# Side-by-side statistics and delta summaries of all snapshots
+SAVE_FILE_PATH = SNAPSHOTS_DIR / "comparison.json"
+
+# Output of the extraction of each snapshot, inside its namespace
+LOG_FILE_NAME = "log.txt"
+
+# Minimum width of a snapshot's column in the side-by-side table
+COLUMN_WIDTH = 10
+
+# Valid snapshot names (used as directory names)
+NAME_PATTERN = re.compile(r"[\w.-]+")
+
+# Separates the scheme of a Neo4j URI from the rest
+URI_SEPARATOR = "://"
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """
+    A snapshot of the Goblin graph.
+
+    Attributes:
+        name (str): Name of the snapshot and of its output namespace.
+        source (str): URI of a Neo4j database, or path to release histories.
+
+    """
+
+    name: str
+    source: str
+
+    @property
+    def is_database(self) -> bool:
+        """Whether the snapshot is a Neo4j database rather than a file."""
+        return URI_SEPARATOR in self.source
+
+    @property
+    def directory(self) -> Path:
+        """Output namespace of the snapshot."""
+        return SNAPSHOTS_DIR / self.name
+
+    @property
+    def updates_path(self) -> Path:
+        """Release transitions extracted from the snapshot."""
+        return self.directory / data_extraction.SAVE_FILE_PATH
+
+
+def _parse_snapshot(value: str) -> Snapshot:
+    """Parse a NAME=SOURCE command line argument."""
+    name, separator, source = value.partition("=")
+    if not separator or not source or not NAME_PATTERN.fullmatch(name):
+        error_message = (
+            f"Invalid snapshot '{value}'. Expected NAME=SOURCE, where NAME consists "
+            "of letters, digits, '.', '_' and '-'."
+        )
+        raise argparse.ArgumentTypeError(error_message)
+    return Snapshot(name, source)
+
+
+def _extract(snapshot: Snapshot, root: Path) -> None:
+    """
+    Extract the release transitions of one snapshot, in a worker process.
+
+    The process changes to the output namespace of the snapshot, so that every
+    script writes its usual relative output paths there, and points the Neo4j
+    client at the snapshot's database.
+
+    Args:
+        snapshot (Snapshot): The snapshot to extract.
+        root (Path): Working directory of the main process.
+
+    """
+    directory = root / snapshot.directory
+    directory.mkdir(parents=True, exist_ok=True)
+    os.chdir(directory)
+
+    with (directory / LOG_FILE_NAME).open("w") as log, redirect_stdout(log):
+        if snapshot.is_database:
+            os.environ["NEO4J_URI"] = snapshot.source
+            data_preparation.main([])
+            data_extraction.main([])
+        else:
+            data_extraction.main(["--input", str(root / snapshot.source)])
+
+
+def extract_snapshots(snapshots: list[Snapshot], workers: int | None) -> None:
+    """
+    Extract the release transitions of all snapshots concurrently.
+
+    Args:
+        snapshots (list[Snapshot]): The snapshots to extract.
+        workers (int | None): Number of worker processes (`None`: one per
+            snapshot).
+
+    """
+    root = Path.cwd()
+    # A fresh process per snapshot, as each changes its directory and environment
+    with ProcessPoolExecutor(
+        max_workers=workers or len(snapshots),
+        max_tasks_per_child=1,
+    ) as executor:
+        futures = [executor.submit(_extract, s, root) for s in snapshots]
+        for snapshot, future in zip(snapshots, futures, strict=True):
+            future.result()
+            print(f"Extracted '{snapshot.name}' to: '{snapshot.directory}'")
+
+
+def compare_snapshots(
+    before: UpdateColumns,
+    after: UpdateColumns,
+) -> tuple[DeltaSummary, list[dict[str, str | float]]]:
+    """
+    Summarize the differences between two snapshots and list the artifacts.
+
+    Args:
+        before (UpdateColumns): Release transitions of the earlier snapshot.
+        after (UpdateColumns): Release transitions of the later snapshot.
+
+    Returns:
+        tuple[DeltaSummary, list[dict[str, str | float]]]: The summary, and one
+        record per artifact that differs between the snapshots.
+
+    """
+    delta = snapshot_delta(before, after)
+    status = np.where(
+        delta["before"] < 0,
+        "newly_updated",
+        np.where(delta["after"] < 0, "disappeared", "gap_changed"),
+    )
+    differs = np.isnan(delta["gap_change"]) | (delta["gap_change"] != 0)
+    records: list[dict[str, str | float]] = [
+        {"artifact_id": artifact_id, "status": kind, "gap_change_days": change}
+        for artifact_id, kind, change in zip(
+            delta["artifact_ids"][differs].tolist(),
+            status[differs].tolist(),
+            delta["gap_change"][differs].tolist(),
+            strict=True,
+        )
+    ]
+    return summarize_delta(delta), records
+
+
+def _print_statistics(statistics: dict[str, SnapshotStatistics]) -> None:
+    """Print the statistics of all snapshots side by side."""
+    rows: list[tuple[str, list[str]]] = [
+        ("Packages", [str(s["rq1"]["count"]) for s in statistics.values()]),
+        (
+            "% updated in 3 months",
+            [f"{s['rq1']['within_three_months']:.2%}" for s in statistics.values()],
+        ),
+        (
+            "% updated in a year",
+            [f"{s['rq1']['within_one_year']:.2%}" for s in statistics.values()],
+        ),
+        (
+            "Delay/frequency corr.",
+            [f"{s['rq2_1']['correlation']:.3f}" for s in statistics.values()],
+        ),
+    ]
+    rows.extend(
+        (
+            f"Median delay ({t})",
+            [f"{s['rq2_2']['groups'][t]['median']:.0f}" for s in statistics.values()],
+        )
+        for t in VERSION_CHANGE_TYPES
+    )
+
+    width = max(COLUMN_WIDTH, *(len(name) for name in statistics)) + 2
+    print(f"{'':<24}" + "".join(f"{name:>{width}}" for name in statistics))
+    for label, values in rows:
+        print(f"{label:<24}" + "".join(f"{value:>{width}}" for value in values))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Extract several snapshots concurrently and compare their results.
+
+    Args:
+        argv (list[str] | None): Command line arguments (default: `sys.argv[1:]`).
+
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare the RQ results across snapshots of the Goblin graph.",
+    )
+    parser.add_argument(
+        "snapshots",
+        nargs="+",
+        type=_parse_snapshot,
+        metavar="NAME=SOURCE",
+        help="snapshot name and Neo4j URI or release history file, oldest first",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of snapshots extracted at the same time (default: all)",
+    )
+    parser.add_argument(
+        "--compare-only",
+        action="store_true",
+        help="compare previously extracted snapshots without extracting them",
+    )
+    args = parser.parse_args(argv)
+    snapshots: list[Snapshot] = args.snapshots
+
+    names = [s.name for s in snapshots]
+    if len(set(names)) != len(names):
+        parser.error("snapshot names must be unique")
+
+    if not args.compare_only:
+        extract_snapshots(snapshots, args.workers)
+
+    columns = {
+        s.name: to_update_columns(load_updates(s.updates_path)) for s in snapshots
+    }
+    statistics = {name: snapshot_statistics(c) for name, c in columns.items()}
+    _print_statistics(statistics)
+
+    # Join each snapshot with the previous one
+    deltas: list[dict[str, str | DeltaSummary]] = []
+    for before, after in pairwise(snapshots):
+        summary, records = compare_snapshots(columns[before.name], columns[after.name])
+        delta_path = SNAPSHOTS_DIR / f"delta_{before.name}_{after.name}.json"
+        save_json(records, delta_path)
+        deltas.append(
+            {"before": before.name, "after": after.name, "summary": summary},
+        )
+        median_change = summary["median_gap_change"]
+        change_text = "n/a" if np.isnan(median_change) else f"{median_change:.0f} days"
+        print(
+            f"{before.name} -> {after.name}: "
+            f"{summary['newly_updated']} newly updated, "
+            f"{summary['disappeared']} disappeared, "
+            f"{summary['gap_changed']} changed delay "
+            f"(median change {change_text}); "
+            f"saved to '{delta_path}'",
+        )
+
+    save_json(
+        {
+            "snapshots": [{"name": s.name, "source": s.source} for s in snapshots],
+            "statistics": statistics,
+            "deltas": deltas,
+        },
+        SAVE_FILE_PATH,
+    )
+    print(f"Comparison has been saved to: '{SAVE_FILE_PATH}'")
+
+
+if __name__ == "__main__":
+    main()